@@ -0,0 +1,353 @@
+"""
+Hot-path benchmarks: neuron input handling, PatternWatcher monitoring, adoption updates and
+dispatcher throughput, with stored baselines and a regression check.
+
+Usage (from the repository root):
+    python benchmarks/bench_hot_paths.py [--quick] [--only SUBSTRING] [--output PATH]
+                                         [--check] [--tolerance 0.25] [--save-baseline]
+
+Every case reports a rate (work done per second, best of several repeats) and the whole run
+is written as JSON to --output (default benchmarks/results/latest.json). --check compares
+each rate with benchmarks/baseline.json and exits with status 1 if any case is slower than
+the baseline by more than --tolerance; --save-baseline replaces the baseline with this run.
+Baselines are only comparable on the machine that recorded them, so the baseline is not kept
+in git (like results/): record one with --save-baseline on the machine you compare on.
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import numpy as np  # noqa: E402
+import log_config  # noqa: E402
+from clock import SimulationClock  # noqa: E402
+from dispatcher import Dispatcher  # noqa: E402
+from log_export import LogExporter  # noqa: E402
+from neuron import Neuron  # noqa: E402
+from neuron_pattern_interface import NeuronPatternInterface  # noqa: E402
+from pattern_watcher import PatternWatcher  # noqa: E402
+from population import NeuronPopulation  # noqa: E402
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+RESULTS_PATH = os.path.join(ROOT, "benchmarks", "results", "latest.json")
+
+BENCHMARKS = []
+
+
+def benchmark(function):
+    BENCHMARKS.append(function)
+    return function
+
+
+def measure(setup, run, repeats, min_time=0.2):
+    """
+    Best wall time of `run(state)` on fresh `setup()` states: at least `repeats` runs, and more
+    until `min_time` seconds were spent timing. The garbage collector is paused while timing,
+    as timeit does, so a collection triggered by earlier cases does not land in this one.
+    """
+    best = float("inf")
+    spent = 0.0
+    runs = 0
+    while runs < repeats or spent < min_time:
+        state = setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run(state)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = min(best, elapsed)
+        spent += elapsed
+        runs += 1
+    return best
+
+
+def case(name, unit, work, setup, run, **params):
+    """
+    One measurement: `work` units of `unit` done by each run(setup()). Cases are measured as
+    soon as they are yielded, so setup and run may close over the benchmark's loop variables.
+    """
+    return name, unit, work, setup, run, params
+
+
+@contextlib.contextmanager
+def log_mode(mode):
+    # LOG_MODE is read when a neuron is built, so it only has to hold during setup
+    previous = log_config.LOG_MODE
+    log_config.LOG_MODE = mode
+    try:
+        yield
+    finally:
+        log_config.LOG_MODE = previous
+
+
+def stimulus(count, seed=0):
+    rng = random.Random(seed)
+    return [rng.uniform(0.0, 1.5) for _ in range(count)]
+
+
+@benchmark
+def receive_input(size):
+    neurons, inputs = size(1000), 20
+    values = stimulus(inputs)
+    for sink, mode in (("memory", "diagnostic"), ("memory", "concise"), ("null", "diagnostic")):
+        def setup():
+            with log_mode(mode):
+                return [Neuron(log_sink=sink) for _ in range(neurons)]
+
+        def run(population):
+            for value in values:
+                for neuron in population:
+                    neuron.receive_input(value)
+
+        yield case(f"neuron.receive_input[{mode},{sink}]", "inputs/s", neurons * inputs, setup, run, neurons=neurons, inputs=inputs, log_mode=mode, sink=sink)
+
+    for mode in ("diagnostic", "concise"):
+        def setup():
+            with log_mode(mode):
+                population = [Neuron(log_sink="memory") for _ in range(neurons)]
+            for value in values:
+                for neuron in population:
+                    neuron.receive_input(value)
+            return population
+
+        def run(population):
+            with LogExporter(os.devnull, log_mode=mode) as exporter:
+                exporter.write_neurons(population)
+
+        yield case(f"neuron.export_log[{mode}]", "neurons/s", neurons, setup, run, neurons=neurons, inputs=inputs, log_mode=mode)
+
+
+@benchmark
+def population_step(size):
+    steps = 10
+    for count in (size(100000), size(1000000)):
+        inputs = np.random.default_rng(0).uniform(0.0, 0.6, count)
+        half = np.arange(count) % 2 == 0
+
+        def setup():
+            population = NeuronPopulation(count)
+            for _ in range(steps):
+                population.step(inputs)  # past the first refractory periods, into a steady firing rate
+            return population
+
+        def run(population):
+            for _ in range(steps):
+                population.step(inputs)
+
+        def run_half(population):
+            for _ in range(steps):
+                population.idle(~half)
+                population.step(inputs, half)
+
+        yield case(f"population.step[n={count}]", "neuron updates/s", count * steps, setup, run, neurons=count, steps=steps)
+        yield case(f"population.step[n={count},active=half]", "neuron updates/s", count * steps, setup, run_half, neurons=count, steps=steps)
+
+
+def _watched(count, history_length):
+    neurons = [Neuron(history_length=history_length, log_sink="null") for _ in range(count)]
+    watcher = PatternWatcher(NeuronPatternInterface(log_sink="null"), log_sink="null")
+    watcher.watch_neurons(neurons)
+    return neurons, watcher
+
+
+@benchmark
+def monitor_neurons(size):
+    values = stimulus(8)
+    for count in (size(1000), size(10000)):
+        for history_length in (5, 50):
+            def setup():
+                neurons, watcher = _watched(count, history_length)
+                for value in values:
+                    for neuron in neurons:
+                        neuron.receive_input(value)
+                return watcher
+
+            def run(watcher):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    watcher.monitor_neurons()
+
+            yield case(f"watcher.monitor_neurons[n={count},history={history_length}]", "neurons/s", count, setup, run, neurons=count, history_length=history_length)
+
+
+@benchmark
+def monitor_bounds(size):
+    for count in (size(1000), size(10000)):
+        def setup():
+            neurons, watcher = _watched(count, 5)
+            for i, neuron in enumerate(neurons):
+                # The default decay factor sits near its safe limit; keep the rest in range so the
+                # cases time the checks, not one notification per neuron
+                neuron.decay_factor = 0.8
+                if i % 10 == 0:
+                    neuron.threshold = 10.0  # every tenth neuron far out of range
+            return neurons, watcher
+
+        def setup_population():
+            neurons, watcher = setup()
+            return NeuronPopulation.from_neurons(neurons), watcher
+
+        def run(state):
+            neurons, watcher = state
+            for neuron in neurons:
+                watcher.monitor_bounds(neuron)
+
+        def run_batch(state):
+            neurons, watcher = state
+            watcher.monitor_bounds_batch(neurons)
+
+        def run_population(state):
+            population, watcher = state
+            watcher.monitor_bounds_batch(population=population)
+
+        yield case(f"watcher.monitor_bounds[n={count}]", "neurons/s", count, setup, run, neurons=count)
+        yield case(f"watcher.monitor_bounds_batch[n={count}]", "neurons/s", count, setup, run_batch, neurons=count)
+        yield case(f"watcher.monitor_bounds_batch[n={count},population]", "neurons/s", count, setup_population, run_population, neurons=count)
+
+
+@benchmark
+def update_adoption(size):
+    patterns = [f"pattern_{i}" for i in range(10)]
+    statuses = ("monitoring", "adopted", "revised")
+    for count in (size(1000), size(10000)):
+        def setup():
+            return NeuronPatternInterface(log_sink="null"), [Neuron(log_sink="null") for _ in range(count)]
+
+        def run(state):
+            interface, neurons = state
+            for status in statuses:
+                for i, neuron in enumerate(neurons):
+                    interface.update_adoption(neuron, patterns[i % len(patterns)], status)
+
+        yield case(f"interface.update_adoption[n={count}]", "updates/s", count * len(statuses), setup, run, neurons=count)
+
+
+@benchmark
+def dispatcher_throughput(size):
+    neurons, events = size(1000), size(20000)
+    sources = [f"sensor_{i}" for i in range(20)]
+
+    def setup(clock=None):
+        dispatcher = Dispatcher(clock=clock)
+        for i in range(neurons):
+            # Each neuron hears one source; a few hear everything
+            if i % 100 == 0:
+                dispatcher.register(Neuron(log_sink="null"))
+            else:
+                dispatcher.register(Neuron(log_sink="null"), sources=[sources[i % len(sources)]])
+        return dispatcher
+
+    async def drive(dispatcher):
+        consumer = asyncio.ensure_future(dispatcher.dispatch())
+        for i in range(events):
+            await dispatcher.emit(0.4, source=sources[i % len(sources)])
+        await dispatcher.drain()
+        consumer.cancel()
+
+    def run(dispatcher):
+        asyncio.run(drive(dispatcher))
+
+    yield case("dispatcher.events", "events/s", events, setup, run, neurons=neurons, events=events)
+    yield case("dispatcher.events[clock]", "events/s", events, lambda: setup(SimulationClock()), run, neurons=neurons, events=events, clock=True)
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def run_suite(quick=False, only=None, repeats=None):
+    size = (lambda n: max(1, n // 10)) if quick else (lambda n: n)
+    repeats = repeats or (2 if quick else 5)
+    results = {}
+    for bench in BENCHMARKS:
+        for name, unit, work, setup, run, params in bench(size):
+            if only and only not in name:
+                continue
+            seconds = measure(setup, run, repeats)
+            entry = {"unit": unit, "rate": work / seconds, "seconds": seconds, "work": work, "params": params}
+            results[name] = entry
+            print(f"{name:55s} {entry['rate']:>14,.0f} {entry['unit']}", flush=True)
+    return {"environment": environment(), "quick": quick, "results": results}
+
+
+def check(run, baseline, tolerance):
+    """Names of cases whose rate fell more than `tolerance` below the baseline."""
+    regressions = []
+    for name, entry in run["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        ratio = entry["rate"] / reference["rate"]
+        marker = "REGRESSION" if ratio < 1.0 - tolerance else "ok"
+        print(f"{name:55s} {ratio:6.2f}x baseline  {marker}")
+        if ratio < 1.0 - tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--quick", action="store_true", help="a tenth of the work, for a fast sanity run")
+    parser.add_argument("--only", help="only run cases whose name contains this")
+    parser.add_argument("--repeats", type=int, help="repeats per case (best one counts)")
+    parser.add_argument("--output", default=RESULTS_PATH, help="where to write this run's JSON")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--check", action="store_true", help="compare with the baseline; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="slowdown allowed before --check fails (fraction)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    args = parser.parse_args(argv)
+
+    run = run_suite(args.quick, args.only, args.repeats)
+    write_json(args.output, run)
+    if args.save_baseline:
+        write_json(args.baseline, run)
+        print(f"Baseline saved to {args.baseline}")
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}; record one on this machine with --save-baseline.")
+            return 2
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("quick") != run["quick"]:
+            print("Baseline and this run differ in --quick; rates are not comparable.")
+            return 2
+        regressions = check(run, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
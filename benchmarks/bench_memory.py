@@ -0,0 +1,34 @@
+"""
+Memory benchmark: how many bytes does an idle Neuron cost?
+
+Usage (from the repository root):
+    python benchmarks/bench_memory.py [count] [sink]
+
+Builds `count` neurons (default 100000) with the given log sink (default 'null') and reports
+the traced allocation per neuron, plus what that extrapolates to for one million neurons.
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from neuron import Neuron  # noqa: E402
+
+
+def bytes_per_neuron(count=100_000, log_sink="null"):
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    neurons = [Neuron(log_sink=log_sink) for _ in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del neurons
+    return (after - before) / count
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    sink = sys.argv[2] if len(sys.argv) > 2 else "null"
+    per_neuron = bytes_per_neuron(count, sink)
+    print(f"{count} idle neurons with '{sink}' narration: {per_neuron:.0f} bytes per neuron")
+    print(f"Extrapolated to 1,000,000 neurons: {per_neuron * 1_000_000 / 2**20:.0f} MiB")
@@ -0,0 +1,341 @@
+"""
+ActivityTrace: Compact binary record of neuron activity, narrated only when someone asks.
+
+A trace is a directory of append-only segments (segment-000000.bin, ...) holding fixed-size
+rows of TRACE_DTYPE, plus trace.json with the neuron table, the interned strings and each
+segment's row count and tick range. Segments are raw rows with no header, so np.memmap can
+open them directly and a reader touches only the pages it needs. trace.json is rewritten when
+a segment fills up and on close(), not on every flush, so a reader opened while the trace is
+still being written sees the segments completed so far.
+
+One row per event:
+- decision: a neuron received `input` and weighed `potential` against `threshold`; `fired` says how it went
+- asleep_ignore, sleep, wake: lifecycle events
+- passive_decay, refractory_end, frustrated: state changes; `input` holds the value before (old
+  potential or old threshold), `potential`/`threshold` the value after, and for passive_decay
+  `source` holds the number of cycles the decay covers
+- refractory_enter: `threshold` holds the raised threshold
+
+The replay tells each neuron's decisions and state changes. Sentences built from values the
+trace does not keep (the potential before an input, history summaries, pattern talk and
+free-form log_event text) are left out.
+"""
+import json
+import os
+import numpy as np
+from narration import render_message, format_stamp
+
+TRACE_DTYPE = np.dtype([
+    ("tick", "<i8"),
+    ("neuron", "<i4"),
+    ("event", "u1"),
+    ("fired", "?"),
+    ("input", "<f8"),
+    ("potential", "<f8"),
+    ("threshold", "<f8"),
+    ("source", "<i4"),  # index into the string table, -1 for none (cycle count for passive_decay)
+    ("input_type", "<i4"),
+])
+
+EVENTS = ("decision", "asleep_ignore", "sleep", "wake", "passive_decay", "refractory_end", "refractory_enter", "frustrated")
+EVENT_CODES = {name: code for code, name in enumerate(EVENTS)}
+DECISION, ASLEEP_IGNORE, SLEEP, WAKE, PASSIVE_DECAY, REFRACTORY_END, REFRACTORY_ENTER, FRUSTRATED = range(len(EVENTS))
+
+TRACE_META = "trace.json"
+
+
+class TraceWriter:
+    """
+    Appends rows to a trace directory. Rows are gathered in a NumPy buffer and written
+    `buffer_rows` at a time; a new segment starts every `segment_rows` rows. Call close() when
+    done: it writes the final trace.json.
+    """
+
+    def __init__(self, directory, segment_rows=1 << 20, buffer_rows=4096):
+        self.directory = directory
+        self.segment_rows = segment_rows
+        os.makedirs(directory, exist_ok=True)
+        self.neuron_ids = []
+        self.task_contexts = []
+        self.baseline_potentials = []
+        self._neuron_index = {}  # neuron id -> row index in the neuron table
+        self.strings = []
+        self._string_index = {}
+        self.segments = []  # [{"file", "rows", "first_tick", "last_tick"}]
+        self._buffer = np.zeros(buffer_rows, dtype=TRACE_DTYPE)
+        self._buffered = 0
+        self._file = None
+
+    def add_neuron(self, neuron_id, task_context="Generic Task", baseline_potential=0.0):
+        """Index of a neuron in this trace, registering it on first sight."""
+        index = self._neuron_index.get(neuron_id)
+        if index is None:
+            index = self._neuron_index[neuron_id] = len(self.neuron_ids)
+            self.neuron_ids.append(neuron_id)
+            self.task_contexts.append(self.string(task_context))
+            self.baseline_potentials.append(baseline_potential)
+        return index
+
+    def add_neurons(self, neurons):
+        """Register Neuron objects (e.g. a population's, in order) and return their indices."""
+        return [self.add_neuron(neuron.id, neuron.task_context, neuron.baseline_potential) for neuron in neurons]
+
+    def string(self, value):
+        if value is None:
+            return -1
+        index = self._string_index.get(value)
+        if index is None:
+            index = self._string_index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def append(self, tick, neuron, event, input_value=np.nan, potential=np.nan, threshold=np.nan, fired=False, source=None, input_type=None):
+        if self._buffered == len(self._buffer):
+            self.flush()
+        source = source if event == PASSIVE_DECAY else self.string(source)
+        self._buffer[self._buffered] = (tick, neuron, event, fired, input_value, potential, threshold, source, self.string(input_type))
+        self._buffered += 1
+
+    def append_many(self, ticks, neurons, inputs, potentials, thresholds, fired, event=DECISION):
+        """
+        Append a batch of rows from arrays, e.g. one NeuronPopulation step. `neurons` are indices
+        into this trace's neuron table (see add_neurons).
+        """
+        neurons = np.asarray(neurons)
+        rows = np.zeros(neurons.size, dtype=TRACE_DTYPE)
+        rows["tick"] = ticks
+        rows["neuron"] = neurons
+        rows["event"] = event
+        rows["fired"] = fired
+        rows["input"] = inputs
+        rows["potential"] = potentials
+        rows["threshold"] = thresholds
+        rows["source"] = -1
+        rows["input_type"] = self.string("generic")
+        self.flush()
+        self._write(rows)
+
+    def flush(self):
+        if self._buffered:
+            self._write(self._buffer[:self._buffered])
+            self._buffered = 0
+        if self._file is not None:
+            self._file.flush()
+
+    def _write(self, rows):
+        while len(rows):
+            segment = self.segments[-1] if self.segments else None
+            if segment is None or segment["rows"] >= self.segment_rows:
+                if self._file is not None:
+                    self._file.close()
+                    self._save_meta()  # the full segment's rows and ticks are final now
+                segment = {"file": f"segment-{len(self.segments):06d}.bin", "rows": 0, "first_tick": None, "last_tick": None}
+                self.segments.append(segment)
+                self._file = open(os.path.join(self.directory, segment["file"]), "ab")
+            chunk = rows[:self.segment_rows - segment["rows"]]
+            self._file.write(chunk.tobytes())
+            ticks = chunk["tick"]
+            first, last = int(ticks.min()), int(ticks.max())
+            segment["first_tick"] = first if segment["first_tick"] is None else min(first, segment["first_tick"])
+            segment["last_tick"] = last if segment["last_tick"] is None else max(last, segment["last_tick"])
+            segment["rows"] += len(chunk)
+            rows = rows[len(chunk):]
+
+    def _save_meta(self):
+        # Only segments with rows in them; one just opened has no tick range yet
+        meta = {
+            "dtype": TRACE_DTYPE.descr,
+            "events": EVENTS,
+            "neuron_ids": self.neuron_ids,
+            "task_contexts": self.task_contexts,
+            "baseline_potentials": self.baseline_potentials,
+            "strings": self.strings,
+            "segments": [segment for segment in self.segments if segment["rows"]],
+        }
+        path = os.path.join(self.directory, TRACE_META)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(path + ".tmp", path)
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._save_meta()
+
+
+_TRACED = frozenset(("fire", "no_fire", "asleep_ignore", "sleep", "wake", "passive_decay", "passive_decay_span",
+                     "refractory_end", "refractory_enter", "frustrated"))
+
+
+class TraceSink:
+    """
+    Log sink that turns Neuron narration into trace rows instead of keeping or printing text.
+    Attach it like any other sink: Neuron(log_sink=TraceSink(writer)).
+
+    The input, potential and threshold records of one receive_input() are folded into the
+    decision row written when the neuron decides whether to fire. Records the trace has no row
+    for (history summaries, pattern talk, free-form log_event text) are not kept.
+    """
+    enabled = True
+    records = ()
+
+    def __init__(self, writer):
+        self.writer = writer
+        self._pending_input = {}  # id(owner) -> (input value, input type, source)
+
+    def emit(self, record, owner):
+        template, args = record[2], record[3]
+        if template is None:
+            return
+        if template == "input":
+            self._pending_input[id(owner)] = (args[0], args[1], args[2])
+            return
+        if template not in _TRACED:
+            return
+        writer = self.writer
+        neuron = writer.add_neuron(owner.id, owner.task_context, owner.baseline_potential)
+        tick = record[0]  # narration is stamped with the tick it happened in
+        if template in ("fire", "no_fire"):
+            input_value, input_type, source = self._pending_input.pop(id(owner), (np.nan, None, None))
+            writer.append(tick, neuron, DECISION, input_value, args[0], args[1], template == "fire", source, input_type)
+        elif template == "asleep_ignore":
+            writer.append(tick, neuron, ASLEEP_IGNORE)
+        elif template == "sleep":
+            writer.append(tick, neuron, SLEEP)
+        elif template == "wake":
+            writer.append(tick, neuron, WAKE)
+        elif template == "refractory_end":
+            writer.append(tick, neuron, REFRACTORY_END, args[0], threshold=args[1])
+        elif template == "refractory_enter":
+            writer.append(tick, neuron, REFRACTORY_ENTER, threshold=args[0])
+        elif template == "frustrated":
+            writer.append(tick, neuron, FRUSTRATED, args[0], threshold=args[1])
+        else:  # passive decay; passive_decay_span carries the number of cycles first
+            writer.append(tick, neuron, PASSIVE_DECAY, args[-2], args[-1], source=args[0] if template == "passive_decay_span" else 1)
+
+    def flush(self):
+        self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+
+
+class TraceReader:
+    """Opens a trace directory and replays it as rows or as the Markdown narrative neurons tell."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, TRACE_META), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.neuron_ids = meta["neuron_ids"]
+        self.task_contexts = meta["task_contexts"]
+        self.baseline_potentials = meta["baseline_potentials"]
+        self.strings = meta["strings"]
+        self.segments = meta["segments"]
+        self._neuron_index = {neuron_id: index for index, neuron_id in enumerate(self.neuron_ids)}
+        self._maps = {}
+
+    def _segment(self, segment):
+        rows = self._maps.get(segment["file"])
+        if rows is None:
+            path = os.path.join(self.directory, segment["file"])
+            rows = self._maps[segment["file"]] = np.memmap(path, dtype=TRACE_DTYPE, mode="r", shape=(segment["rows"],))
+        return rows
+
+    def __len__(self):
+        return sum(segment["rows"] for segment in self.segments)
+
+    def neuron_index(self, neuron):
+        """Accepts a neuron index, a neuron id, or a Neuron."""
+        if isinstance(neuron, (int, np.integer)):
+            return int(neuron)
+        return self._neuron_index[getattr(neuron, "id", neuron)]
+
+    def rows(self, neuron=None, start=None, stop=None):
+        """Rows for one neuron (or all) with start <= tick < stop, in the order they were written."""
+        index = None if neuron is None else self.neuron_index(neuron)
+        found = []
+        for segment in self.segments:
+            if not segment["rows"]:
+                continue
+            if (start is not None and segment["last_tick"] < start) or (stop is not None and segment["first_tick"] >= stop):
+                continue
+            rows = self._segment(segment)
+            mask = np.ones(len(rows), dtype=bool) if index is None else rows["neuron"] == index
+            if start is not None:
+                mask &= rows["tick"] >= start
+            if stop is not None:
+                mask &= rows["tick"] < stop
+            found.append(rows[mask])
+        return np.concatenate(found) if found else np.zeros(0, dtype=TRACE_DTYPE)
+
+    def _string(self, index):
+        return None if index < 0 else self.strings[index]
+
+    def narrate(self, neuron, start=None, stop=None, clock=None):
+        """
+        Diagnostic-style lines for one neuron's decisions, lifecycle and state changes, rebuilt
+        from its rows; the live log's potential and history lines are not in the trace. Stamps
+        read "tick N", or "HH:MM:SS tick N" as in the live log given the SimulationClock that
+        counted the ticks.
+        """
+        index = self.neuron_index(neuron)
+        task = self._string(self.task_contexts[index])
+        baseline = self.baseline_potentials[index]
+        lines = []
+        pending_reset = None  # a firing's reset is told after the refractory_enter row that follows it
+        for row in self.rows(index, start, stop).tolist():
+            tick, _, event, fired, input_value, potential, threshold, source, input_type = row
+            records = []
+            if pending_reset is not None and event != REFRACTORY_ENTER:
+                self._tell(lines, *pending_reset, clock)
+                pending_reset = None
+            if event == DECISION:
+                if input_value == input_value:  # not NaN: the decision followed an input
+                    records.append(("input", "input", (input_value, self._string(input_type), self._string(source), task)))
+                    records.append(("threshold", "threshold", (threshold,)))
+                if fired:
+                    records.append(("fire", "fire", (potential, threshold, task)))
+                    pending_reset = (tick, [(None, "reset", (potential, baseline))])
+                else:
+                    records.append((None, "no_fire", (potential, threshold)))
+            elif event == ASLEEP_IGNORE:
+                records.append(("state", "asleep_ignore", (task,)))
+            elif event == SLEEP:
+                records.append((None, "sleep", ()))
+            elif event == WAKE:
+                records.append((None, "wake", ()))
+            elif event == PASSIVE_DECAY:
+                if source > 1:
+                    records.append((None, "passive_decay_span", (source, input_value, potential)))
+                else:
+                    records.append((None, "passive_decay", (input_value, potential)))
+            elif event == REFRACTORY_END:
+                records.append((None, "refractory_end", (input_value, threshold)))
+            elif event == REFRACTORY_ENTER:
+                records.append((None, "refractory_enter", (threshold,)))
+            elif event == FRUSTRATED:
+                records.append((None, "frustrated", (input_value, threshold)))
+            self._tell(lines, tick, records, clock)
+            if event == REFRACTORY_ENTER and pending_reset is not None:
+                self._tell(lines, *pending_reset, clock)
+                pending_reset = None
+        if pending_reset is not None:
+            self._tell(lines, *pending_reset, clock)
+        return lines
+
+    @staticmethod
+    def _tell(lines, tick, records, clock):
+        for event_type, template, args in records:
+            entry = f"- [{format_stamp(tick, clock)}] "
+            if event_type:
+                entry += f"**{event_type}**: "
+            lines.append(entry + render_message((tick, event_type, template, args, None, None)))
+
+    def markdown_log(self, neuron, start=None, stop=None, clock=None):
+        """The neuron's fold, as Neuron.markdown_log() wraps it, of the narrate() lines for the chosen tick range."""
+        index = self.neuron_index(neuron)
+        content = "\n".join(self.narrate(index, start, stop, clock))
+        return f"<details><summary>Neuron {self.neuron_ids[index]}</summary>\n{content}\n</details>"
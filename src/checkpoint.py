@@ -0,0 +1,441 @@
+"""
+Checkpoint: Snapshots of a whole simulation that restore quickly and stay cheap to take often.
+
+A checkpoint directory holds numbered checkpoints (000000/, 000001/, ...). Each one is either
+full or a delta against the checkpoint last saved or restored (usually the one before it;
+after restoring an older one, that one), and contains:
+- manifest.json: kind, base checkpoint, row counts and the history capacity
+- neurons.npy: one NEURON row per neuron (parameters, lazy-decay state and the firing-history
+  ring), or in a delta only the rows that changed, numbered by neurons_index.npy
+- population.npy (+ population_index.npy): the same for a NeuronPopulation's columns
+- state.pickle: everything that is not a number per neuron (ids, weights, pattern sets, trust
+  and confidence maps, the adoption registry, watcher settings and histories, dispatcher
+  subscriptions and queued events), as sections of key -> value of which a delta keeps only
+  the keys that changed or disappeared
+
+The .npy files are plain NumPy arrays, so a restore maps them (copy-on-write) rather than
+parsing them. A checkpoint is written under a temporary name and renamed once complete, so a
+run that dies while saving still leaves the previous checkpoint intact.
+"""
+import json
+import os
+import pickle
+import shutil
+from array import array
+from collections import deque, namedtuple
+from operator import attrgetter
+import numpy as np
+import log_config
+from clock import SimulationClock
+from config import CHECKPOINT_FULL_EVERY
+from dispatcher import Dispatcher
+from firing_history import FiringHistory
+from log_sinks import resolve_sink
+from neuron import Neuron
+from neuron_pattern_interface import NeuronPatternInterface
+from pattern_store import open_store
+from pattern_watcher import PatternWatcher
+from population import NeuronPopulation
+
+# (slot, dtype) of every numeric Neuron slot; a leading underscore is dropped from the column name
+NEURON_SLOTS = (
+    ("baseline_threshold", np.float64),
+    ("_threshold", np.float64),
+    ("refractory_offset", np.float64),
+    ("refractory_events", np.int32),
+    ("_refractory_counter", np.int32),
+    ("_in_refractory", np.bool_),
+    ("_potential", np.float64),
+    ("baseline_potential", np.float64),
+    ("decay_factor", np.float64),
+    ("tick", np.int64),
+    ("_updated_at", np.int64),
+    ("asleep", np.bool_),
+    ("history_length", np.int32),
+    ("passive_decay_log_threshold", np.float64),
+    ("last_input_received", np.bool_),
+    ("trust_score", np.float64),
+)
+# (FiringHistory attribute, column) of the history counters; capacity 0 marks a neuron that never allocated one
+HISTORY_COUNTERS = (
+    ("capacity", "history_capacity"),
+    ("_next", "history_next"),
+    ("_size", "history_size"),
+    ("fire_count", "history_fire_count"),
+    ("quiet_streak", "history_quiet_streak"),
+)
+
+SECTIONS = ("neurons", "trust", "confidence", "adoption", "state")
+MANIFEST = "manifest.json"
+
+Snapshot = namedtuple("Snapshot", "neurons clock interface watcher dispatcher population")
+
+
+def neuron_dtype(history_capacity):
+    """Row layout of neurons.npy for histories of up to `history_capacity` entries."""
+    fields = [(slot.lstrip("_"), dtype) for slot, dtype in NEURON_SLOTS]
+    fields += [(column, np.int32) for _, column in HISTORY_COUNTERS]
+    fields += [
+        ("history_ticks", np.int64, (history_capacity,)),
+        ("history_inputs", np.float64, (history_capacity,)),
+        ("history_fired", np.int8, (history_capacity,)),
+    ]
+    return np.dtype(fields)
+
+
+POPULATION_DTYPE = np.dtype(list(NeuronPopulation.FIELDS) + [("fired", np.bool_)])
+
+
+class Checkpointer:
+    """
+    Saves and restores Neuron objects, a PatternWatcher, its NeuronPatternInterface, a
+    Dispatcher (subscriptions and queued events), a NeuronPopulation and the SimulationClock.
+
+    After the first save(), each save writes a delta holding only the neuron rows and map
+    entries that differ from the previous checkpoint, found by comparing raw rows in bulk, so a
+    checkpoint of a large, mostly quiet network costs little. Every `full_every` checkpoints
+    (and whenever the neuron set shrinks or its history capacity changes) a full one is written
+    instead, which bounds how many deltas a restore has to replay.
+    """
+
+    def __init__(self, directory, full_every=CHECKPOINT_FULL_EVERY):
+        self.directory = directory
+        self.full_every = full_every
+        os.makedirs(directory, exist_ok=True)
+        self._previous = None  # (neuron rows, population rows, sections) the last save wrote, for the next delta
+        self._previous_number = None  # the checkpoint _previous holds, which the next delta is based on
+        self._since_full = 0
+
+    def checkpoints(self):
+        """Numbers of the complete checkpoints in the directory, oldest first."""
+        return sorted(int(name) for name in os.listdir(self.directory) if name.isdigit())
+
+    def _path(self, number):
+        return os.path.join(self.directory, f"{number:06d}")
+
+    def save(self, neurons=(), watcher=None, interface=None, dispatcher=None, population=None, clock=None, full=False):
+        """Write a checkpoint of whatever is given and return its number."""
+        neurons = list(neurons)
+        if interface is None and watcher is not None:
+            interface = watcher.interface
+        if clock is None:
+            # The simulation's clock, from whoever shares it; a watcher's own cycle counter is not it
+            shared = [neuron._clock for neuron in neurons]
+            shared += [getattr(dispatcher, "clock", None), getattr(population, "clock", None)]
+            if watcher is not None and not watcher._owns_clock:
+                shared.append(watcher.clock)
+            clock = next((candidate for candidate in shared if candidate is not None), None)
+        neuron_rows = _gather_neurons(neurons)
+        population_rows = _gather_population(population)
+        sections = _gather_sections(neurons, watcher, interface, dispatcher, population, clock)
+
+        existing = self.checkpoints()
+        number = existing[-1] + 1 if existing else 0
+        previous = self._previous
+        if (full or previous is None or self._since_full + 1 >= self.full_every
+                or not _extends(previous[0], neuron_rows) or not _extends(previous[1], population_rows)):
+            previous = (None, None, {name: {} for name in SECTIONS})
+        manifest = {
+            "kind": "full" if previous[0] is None else "delta",
+            "base": None if previous[0] is None else self._previous_number,
+            "neurons": len(neuron_rows),
+            "history_capacity": neuron_rows.dtype["history_ticks"].shape[0],
+            "population": None if population_rows is None else len(population_rows),
+        }
+
+        staging = self._path(number) + ".tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        _save_rows(staging, "neurons", neuron_rows, previous[0])
+        if population_rows is not None:
+            _save_rows(staging, "population", population_rows, previous[1])
+        with open(os.path.join(staging, "state.pickle"), "wb") as f:
+            pickle.dump({name: _section_delta(previous[2][name], sections[name]) for name in SECTIONS}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(os.path.join(staging, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(staging, self._path(number))
+
+        self._previous = (neuron_rows, population_rows, sections)
+        self._previous_number = number
+        self._since_full = 0 if manifest["kind"] == "full" else self._since_full + 1
+        return number
+
+    def _manifest(self, number):
+        with open(os.path.join(self._path(number), MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+
+    def restore(self, number=None, log_sink=None, store=None):
+        """
+        Rebuild the simulation saved as checkpoint `number` (the latest by default) as a Snapshot
+        of fresh objects. Restored neurons narrate to `log_sink` from here on; a watcher that used
+        a PatternStore reopens it by path unless `store` is given.
+        """
+        if number is None:
+            number = self.checkpoints()[-1]
+        chain = [number]
+        while self._manifest(chain[-1])["base"] is not None:
+            chain.append(self._manifest(chain[-1])["base"])
+        chain.reverse()
+
+        neuron_rows = population_rows = None
+        sections = {name: {} for name in SECTIONS}
+        for link in chain:
+            path = self._path(link)
+            neuron_rows = _load_rows(path, "neurons", neuron_rows)
+            population_rows = _load_rows(path, "population", population_rows)
+            with open(os.path.join(path, "state.pickle"), "rb") as f:
+                for name, (changed, removed) in pickle.load(f).items():
+                    for key in removed:
+                        sections[name].pop(key, None)
+                    sections[name].update(changed)
+        snapshot = _rebuild(neuron_rows, population_rows, sections, log_sink, store)
+        # Carry on from here: the next save() is a delta against this checkpoint, even if later ones exist
+        self._previous = (neuron_rows, population_rows, sections)
+        self._previous_number = number
+        self._since_full = len(chain) - 1
+        return snapshot
+
+
+def _extends(previous, current):
+    # A delta can only describe rows that changed or were appended, in the same layout
+    if previous is None or current is None:
+        return previous is None and current is None
+    return previous.dtype == current.dtype and len(current) >= len(previous)
+
+
+def _gather_neurons(neurons):
+    capacity = max((neuron._history.capacity for neuron in neurons if neuron._history is not None), default=0)
+    rows = np.zeros(len(neurons), dtype=neuron_dtype(capacity))
+    if not neurons:
+        return rows
+    for slot, _ in NEURON_SLOTS:
+        rows[slot.lstrip("_")] = list(map(attrgetter(slot), neurons))
+    for i, neuron in enumerate(neurons):
+        history = neuron._history
+        if history is None:
+            continue
+        row = rows[i]
+        for attribute, column in HISTORY_COUNTERS:
+            row[column] = getattr(history, attribute)
+        row["history_ticks"][:history.capacity] = np.frombuffer(history.ticks, dtype=np.int64)
+        row["history_inputs"][:history.capacity] = np.frombuffer(history.inputs, dtype=np.float64)
+        row["history_fired"][:history.capacity] = np.frombuffer(history.fired, dtype=np.int8)
+    return rows
+
+
+def _gather_population(population):
+    if population is None:
+        return None
+    rows = np.zeros(population.size, dtype=POPULATION_DTYPE)
+    for name in POPULATION_DTYPE.names:
+        rows[name] = getattr(population, name)
+    return rows
+
+
+def _gather_sections(neurons, watcher, interface, dispatcher, population, clock):
+    """The non-numeric state as SECTIONS dicts, copied so later changes show up as differences."""
+    sections = {
+        "neurons": {
+            i: (neuron._id, neuron.task_context, tuple(neuron.weights), neuron._clock is not None, neuron.interface is not None,
+                None if neuron._patterns_monitored is None else frozenset(neuron._patterns_monitored),
+                None if neuron._patterns_adopted is None else frozenset(neuron._patterns_adopted))
+            for i, neuron in enumerate(neurons)
+        },
+        "trust": {},
+        "confidence": {},
+        "adoption": {},
+        "state": {"clock": None if clock is None else clock.now},
+    }
+    if watcher is not None:
+        table = watcher.pattern_confidence
+        sections["trust"] = dict(watcher.trust_scores)
+        sections["confidence"] = dict(table._stored)
+        sections["state"]["watcher"] = {
+            "id": watcher.id,
+            "task_context": watcher.task_context,
+            "clock": watcher.clock.now if watcher._owns_clock else None,  # None: the shared clock
+            "store": None if watcher.store is None else watcher.store.path,
+            "confidence_transform": (table.low, table.high, table._offset, table._floor, table._ceiling),
+            "safe_bounds": dict(watcher.safe_bounds),
+            "settings": (watcher.sensitivity, watcher.learning_rate, watcher.memory_window, watcher.notification_threshold),
+            "histories": {
+                history.kind: (list(history._recent), history.total, history._persisted)
+                for history in (watcher.learning_history, watcher.successful_recognitions, watcher.failed_recognitions)
+            },
+            "fire_windows": {neuron_id: tuple(window) for neuron_id, window in watcher._fire_windows.items()},
+            "recent_firers": tuple(watcher._recent_firers),
+            "rapid_firing": tuple(watcher._rapid_firing),
+        }
+    if interface is not None:
+        sections["adoption"] = {neuron_id: dict(statuses) for neuron_id, statuses in interface.neuron_adoption.items()}
+        sections["state"]["interface"] = {
+            pattern: sum(registered is watcher for registered in watchers)
+            for pattern, watchers in interface.pattern_registry.items()
+        }
+    if dispatcher is not None:
+        index = {id(neuron): i for i, neuron in enumerate(neurons)}
+        subscribers = lambda group: tuple(index[id(neuron)] for neuron in group if id(neuron) in index)
+        sections["state"]["dispatcher"] = {
+            "settings": (dispatcher.event_queue.maxsize, dispatcher.batch_size, dispatcher.batch_window),
+            "clock": dispatcher.clock is not None,
+            "neurons": subscribers(dispatcher.neurons),
+            "by_source": {source: subscribers(group) for source, group in dispatcher.by_source.items()},
+            "by_input_type": {input_type: subscribers(group) for input_type, group in dispatcher.by_input_type.items()},
+            "listen_to_all": subscribers(dispatcher.listen_to_all),
+            "queued": dispatcher.queued_events(),
+        }
+    if population is not None:
+        sections["state"]["population_steps"] = population.steps
+        sections["state"]["population_clock"] = population.clock is not None
+    return sections
+
+
+def _section_delta(previous, current):
+    changed = {key: value for key, value in current.items() if key not in previous or previous[key] != value}
+    removed = [key for key in previous if key not in current]
+    return changed, removed
+
+
+def _save_rows(directory, name, rows, previous):
+    if previous is None:
+        np.save(os.path.join(directory, name + ".npy"), rows)
+        return
+    # Compare rows as raw bytes: one vectorised pass, and exact for every field
+    width = rows.dtype.itemsize
+    changed = np.flatnonzero((rows[:len(previous)].view(np.uint8).reshape(-1, width) != previous.view(np.uint8).reshape(-1, width)).any(axis=1))
+    changed = np.concatenate((changed, np.arange(len(previous), len(rows))))
+    np.save(os.path.join(directory, name + ".npy"), rows[changed])
+    np.save(os.path.join(directory, name + "_index.npy"), changed)
+
+
+def _load_rows(directory, name, rows):
+    path = os.path.join(directory, name + ".npy")
+    if not os.path.exists(path):
+        return rows
+    index_path = os.path.join(directory, name + "_index.npy")
+    if not os.path.exists(index_path):
+        return np.load(path, mmap_mode="c")  # full checkpoint: pages are read as they are touched
+    index = np.load(index_path)
+    changed = np.load(path)
+    if len(index) and index[-1] >= len(rows):
+        grown = np.zeros(index[-1] + 1, dtype=rows.dtype)
+        grown[:len(rows)] = rows
+        rows = grown
+    rows[index] = changed
+    return rows
+
+
+def _rebuild(neuron_rows, population_rows, sections, log_sink, store):
+    state = sections["state"]
+    clock = None if state.get("clock") is None else SimulationClock(state["clock"])
+    interface = NeuronPatternInterface(log_sink=log_sink, clock=clock) if "interface" in state else None
+    neurons = _rebuild_neurons(neuron_rows, sections["neurons"], clock, interface, log_sink)
+    by_id = {neuron._id: neuron for neuron in neurons if neuron._id is not None}
+
+    watcher = None
+    if "watcher" in state:
+        watcher = _rebuild_watcher(state["watcher"], sections, interface, by_id, log_sink, store, clock)
+    if interface is not None:
+        for pattern, count in state["interface"].items():
+            interface.pattern_registry[pattern] = [watcher] * count if watcher is not None else []
+        for neuron_id, statuses in sections["adoption"].items():
+            interface.neuron_adoption[neuron_id] = dict(statuses)
+            for pattern, status in statuses.items():
+                interface.adoption_index.setdefault(pattern, {}).setdefault(status, {})[neuron_id] = by_id.get(neuron_id)
+
+    dispatcher = None
+    if "dispatcher" in state:
+        dispatcher = _rebuild_dispatcher(state["dispatcher"], neurons, clock)
+
+    population = None
+    if population_rows is not None:
+        population = NeuronPopulation(len(population_rows), buffers={name: np.ascontiguousarray(population_rows[name]) for name, _ in NeuronPopulation.FIELDS})
+        population.fired[:] = population_rows["fired"]
+        population.steps = state.get("population_steps", 0)
+        if state.get("population_clock"):
+            population.clock = clock
+    return Snapshot(neurons, clock, interface, watcher, dispatcher, population)
+
+
+def _rebuild_neurons(rows, details, clock, interface, log_sink):
+    neurons = []
+    if rows is None or not len(rows):
+        return neurons
+    # Whole columns as Python values at once; per-row NumPy access would dominate the restore
+    columns = [(slot, rows[slot.lstrip("_")].tolist()) for slot, _ in NEURON_SLOTS]
+    capacities = rows["history_capacity"].tolist()
+    for i, capacity in enumerate(capacities):
+        neuron_id, task_context, weights, has_clock, has_interface, monitored, adopted = details[i]
+        # Built without __init__, which would narrate a second birth
+        neuron = Neuron.__new__(Neuron)
+        for slot, values in columns:
+            setattr(neuron, slot, values[i])
+        neuron._id = neuron_id
+        neuron.task_context = task_context
+        neuron.weights = list(weights)
+        neuron._clock = clock if has_clock else None
+        neuron._at = None
+        neuron.interface = interface if has_interface else None
+        neuron._patterns_monitored = None if monitored is None else set(monitored)
+        neuron._patterns_adopted = None if adopted is None else set(adopted)
+        neuron._fire_listeners = None
+        neuron.log_mode = log_config.LOG_MODE
+        neuron.log_sink = resolve_sink(log_sink)  # per neuron: a memory sink must not be shared
+        neuron._narrating = neuron.log_sink.enabled
+        neuron._rendered = None
+        neuron._history = None
+        if capacity:
+            row = rows[i]
+            history = FiringHistory(capacity)
+            for attribute, column in HISTORY_COUNTERS[1:]:
+                setattr(history, attribute, int(row[column]))
+            history.ticks = array('q', row["history_ticks"][:capacity].tobytes())
+            history.inputs = array('d', row["history_inputs"][:capacity].tobytes())
+            history.fired = array('b', row["history_fired"][:capacity].tobytes())
+            neuron._history = history
+        neurons.append(neuron)
+    return neurons
+
+
+def _rebuild_watcher(saved, sections, interface, by_id, log_sink, store, clock):
+    if store is None and saved["store"] is not None:
+        store = open_store(saved["store"])
+    own_clock = saved.get("clock")
+    watcher = PatternWatcher(interface, task_context=saved["task_context"], log_sink=log_sink, store=store,
+                             clock=clock if own_clock is None else None)
+    if own_clock is not None:
+        watcher.clock = SimulationClock(own_clock)
+    watcher.id = saved["id"]
+    watcher.trust_scores = dict(sections["trust"])
+    table = watcher.pattern_confidence
+    table.low, table.high, table._offset, table._floor, table._ceiling = saved["confidence_transform"]
+    table._stored = dict(sections["confidence"])
+    watcher.safe_bounds = dict(saved["safe_bounds"])
+    watcher.sensitivity, watcher.learning_rate, watcher.memory_window, watcher.notification_threshold = saved["settings"]
+    for history in (watcher.learning_history, watcher.successful_recognitions, watcher.failed_recognitions):
+        recent, history.total, history._persisted = saved["histories"][history.kind]
+        history.watcher_id = watcher.id
+        history.capacity = max(1, watcher.memory_window)
+        history._recent = deque(recent)
+    # Fire windows only make sense for neurons that came back with the watcher
+    for neuron_id, ticks in saved["fire_windows"].items():
+        neuron = by_id.get(neuron_id)
+        if neuron is not None:
+            watcher._fire_windows[neuron_id] = deque(ticks, maxlen=watcher.memory_window)
+            neuron.fire_listeners.append(watcher._on_fire)
+    watcher._recent_firers = {neuron_id: by_id[neuron_id] for neuron_id in saved["recent_firers"] if neuron_id in by_id}
+    watcher._rapid_firing = {neuron_id: by_id[neuron_id] for neuron_id in saved["rapid_firing"] if neuron_id in by_id}
+    return watcher
+
+
+def _rebuild_dispatcher(saved, neurons, clock):
+    max_queue, batch_size, batch_window = saved["settings"]
+    dispatcher = Dispatcher(max_queue=max_queue, batch_size=batch_size, batch_window_us=batch_window * 1_000_000,
+                            clock=clock if saved.get("clock") else None)
+    dispatcher.neurons = [neurons[i] for i in saved["neurons"]]
+    dispatcher.by_source = {source: [neurons[i] for i in group] for source, group in saved["by_source"].items()}
+    dispatcher.by_input_type = {input_type: [neurons[i] for i in group] for input_type, group in saved["by_input_type"].items()}
+    dispatcher.listen_to_all = [neurons[i] for i in saved["listen_to_all"]]
+    for event in saved["queued"]:
+        dispatcher.event_queue.put_nowait(event)
+    return dispatcher
@@ -0,0 +1,37 @@
+"""
+SimulationClock: Integer ticks shared by everything taking part in one simulation.
+"""
+import time
+from array import array
+from bisect import bisect_right
+from config import CLOCK_WALL_RESOLUTION
+
+
+class SimulationClock:
+    """
+    Counts simulation ticks. Neurons holding a clock only do work when something happens to
+    them and work out how many ticks passed in between from `now`.
+
+    Narration records are stamped with the tick, not the time of day. So that an export can still
+    say when a tick happened (wall_time), the clock notes the wall-clock time as it advances, at
+    most once per CLOCK_WALL_RESOLUTION seconds, which is as fine as the exported stamps go.
+    """
+    __slots__ = ("now", "_sample_ticks", "_sample_times")
+
+    def __init__(self, start=0):
+        self.now = start
+        # Parallel arrays of samples: a tick the clock reached and the wall-clock time it did
+        self._sample_ticks = array('q', [start])
+        self._sample_times = array('d', [time.time()])
+
+    def advance(self, ticks=1):
+        self.now += ticks
+        wall = time.time()
+        if wall - self._sample_times[-1] >= CLOCK_WALL_RESOLUTION:
+            self._sample_ticks.append(self.now)
+            self._sample_times.append(wall)
+        return self.now
+
+    def wall_time(self, tick):
+        """Wall-clock time (as time.time()) of the last sample taken at or before `tick`."""
+        return self._sample_times[max(0, bisect_right(self._sample_ticks, tick) - 1)]
@@ -2,20 +2,216 @@
 Cluster: Emergent formation and higher-order controller logic.
 """
 import multiprocessing
-import uuid
-from utils import narrative_log
+import os
+import queue
+from multiprocessing import shared_memory
+import numpy as np
+from utils import new_id
+from clock import SimulationClock
+from config import CLUSTER_SHARD_TIMEOUT, CLUSTER_SHARD_POLL
+from narration import format_stamp
+from population import NeuronPopulation
+
+
+def _shard_worker(layout, stimulus_name, stimulus_shape, start, stop, barrier, results):
+    """
+    Step neurons [start, stop) of a shared population through every tick of the shared stimulus.
+    All shards meet at the barrier after each tick, so tick t+1 never starts anywhere before
+    tick t has finished everywhere. Only firings travel back to the parent. A shard left waiting
+    longer than CLUSTER_SHARD_TIMEOUT (or released by the parent giving up) exits with an error.
+    """
+    population, blocks = NeuronPopulation.attach(layout, start, stop)
+    stimulus_block = shared_memory.SharedMemory(name=stimulus_name)
+    stimulus = np.ndarray(stimulus_shape, dtype=np.float64, buffer=stimulus_block.buf)
+    fire_ticks, fire_indices, fire_potentials, fire_thresholds = [], [], [], []
+    try:
+        for tick in range(stimulus_shape[0]):
+            inputs = stimulus[tick, start:stop]
+            # Remember what each neuron saw so firings can be narrated with the values that caused them
+            potential_before = population.potential * population.decay_factor + inputs * population.weight
+            threshold_before = population.threshold.copy()
+            fired = np.flatnonzero(population.step(inputs))
+            if fired.size:
+                fire_ticks.append(np.full(fired.size, tick, dtype=np.int64))
+                fire_indices.append(fired + start)
+                fire_potentials.append(potential_before[fired])
+                fire_thresholds.append(threshold_before[fired])
+            barrier.wait(CLUSTER_SHARD_TIMEOUT)
+    finally:
+        # Views into shared memory must be gone before the blocks can close
+        inputs = population = stimulus = None
+        for block in blocks + [stimulus_block]:
+            block.close()
+    if fire_ticks:
+        results.put((np.concatenate(fire_ticks), np.concatenate(fire_indices),
+                     np.concatenate(fire_potentials), np.concatenate(fire_thresholds)))
+    else:
+        results.put(None)
+
 
 class Cluster:
-    def __init__(self, neurons):
-        self.id = str(uuid.uuid4())
+    def __init__(self, neurons, clock=None):
+        self.id = new_id()
         self.neurons = neurons
-        self.log = []
-        narrative_log(self.log, f"Cluster {self.id} formed with neurons {[n.id for n in neurons]}.")
+        # Share the clock of the simulation the neurons live in; only a clock of its own is
+        # advanced by run(), one tick per event
+        if clock is None:
+            clock = next((neuron.clock for neuron in neurons if neuron.clock is not None), None)
+        self._owns_clock = clock is None
+        self.clock = SimulationClock() if clock is None else clock
+        self.records = []  # (tick, message), rendered with a time of day only by get_log()
+        self._note(f"Cluster {self.id} formed with neurons {[n.id for n in neurons]}.")
+
+    def _note(self, message, tick=None):
+        self.records.append((self.clock.now if tick is None else tick, message))
+
+    def add_neurons(self, neurons):
+        """Take in more members, e.g. when the co-firing group this cluster grew from gains neurons."""
+        neurons = [neuron for neuron in neurons if all(neuron is not member for member in self.neurons)]
+        if neurons:
+            self.neurons.extend(neurons)
+            self._note(f"Cluster {self.id} grew to include neurons {[n.id for n in neurons]}.")
+
+    def absorb(self, other):
+        """Merge another cluster's members into this one, when their groups turn out to be one."""
+        self.add_neurons(other.neurons)
+        self._note(f"Cluster {self.id} absorbed Cluster {other.id}.")
 
     def run(self, event):
         for neuron in self.neurons:
-            neuron.state += event['value']
-            narrative_log(self.log, f"Cluster {self.id} dispatched event to Neuron {neuron.id}.")
+            neuron.receive_input(event['value'], source=event.get('source'))
+            self._note(f"Cluster {self.id} dispatched event to Neuron {neuron.id}.")
+        if self._owns_clock:
+            self.clock.advance()
+
+    def run_sharded(self, stimulus, workers=None):
+        """
+        Run the cluster's neurons over many ticks on several cores.
+
+        `stimulus` is an array of shape (ticks, len(neurons)) or (ticks,) for one input shared by
+        every neuron. The neurons are packed into a NeuronPopulation living in shared memory and
+        partitioned across worker processes, which advance in lockstep one tick at a time. Only
+        firing events come back. Returns (ticks, neuron_indices) of all firings, counted from the
+        first tick of this run.
+
+        The Neuron objects come out as if each had received its inputs one by one: state, quiet
+        streak, history entries and input count (`tick`) are all brought up to date. Firings are
+        narrated and fire listeners called afterwards, in firing order, with `neuron.tick` at the
+        firing's tick; anything else a listener reads is already the state at the end of the run.
+        Narration other than firings is not produced.
+
+        The stimulus takes up the next `ticks` ticks of the cluster's clock, which is advanced
+        past them; neurons on that clock narrate each firing at the tick it happened.
+        """
+        stimulus = np.asarray(stimulus, dtype=np.float64)
+        if stimulus.ndim == 1:
+            stimulus = np.repeat(stimulus[:, None], len(self.neurons), axis=1)
+        workers = max(1, min(workers or os.cpu_count() or 1, len(self.neurons)))
+        population = NeuronPopulation.from_neurons(self.neurons)
+        blocks, processes = [], []
+        try:
+            blocks, layout = population.share()
+            stimulus_block = shared_memory.SharedMemory(create=True, size=max(stimulus.nbytes, 1))
+            blocks.append(stimulus_block)
+            np.ndarray(stimulus.shape, dtype=np.float64, buffer=stimulus_block.buf)[:] = stimulus
+            bounds = np.linspace(0, len(self.neurons), workers + 1).astype(int)
+            barrier = multiprocessing.Barrier(workers)
+            results = multiprocessing.Queue()
+            for i in range(workers):
+                process = multiprocessing.Process(target=_shard_worker, args=(layout, stimulus_block.name, stimulus.shape, int(bounds[i]), int(bounds[i + 1]), barrier, results))
+                process.start()
+                processes.append(process)
+            shard_results = self._await_shards(processes, results, barrier)
+            for process in processes:
+                process.join()
+            firings = self._collect_firings([result for result in shard_results if result is not None])
+            base_ticks = [neuron.tick for neuron in self.neurons]
+            self._replay_history(stimulus, firings[0], firings[1])
+            population.write_back(self.neurons)  # after the replay, so the quiet streaks are the population's
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+            population = None
+            for block in blocks:
+                block.close()
+                block.unlink()
+        start = self.clock.now
+        self.clock.advance(stimulus.shape[0])
+        for neuron in self.neurons:
+            if neuron.clock is self.clock:
+                neuron._updated_at = self.clock.now - 1  # the run accounted for every one of its ticks
+        self._narrate_firings(firings, start, base_ticks)
+        ticks = stimulus.shape[0]
+        for neuron, base_tick in zip(self.neurons, base_ticks):
+            if ticks:
+                neuron.last_input_received = True
+                if not neuron.asleep:
+                    neuron.tick = base_tick + ticks
+        self._note(f"Cluster {self.id} ran {ticks} ticks across {workers} worker processes; {firings[0].size} firings came back.")
+        return firings[0], firings[1]
+
+    @staticmethod
+    def _await_shards(processes, results, barrier):
+        """One result per worker. Raises instead of waiting forever if a worker dies without one."""
+        shard_results = []
+        while len(shard_results) < len(processes):
+            # Checked before waiting: a worker that exits right after reporting is not a failure
+            all_exited = all(process.exitcode is not None for process in processes)
+            try:
+                shard_results.append(results.get(timeout=CLUSTER_SHARD_POLL))
+                continue
+            except queue.Empty:
+                pass
+            failed = [process.exitcode for process in processes if process.exitcode not in (None, 0)]
+            if failed or all_exited:
+                barrier.abort()  # wake the shards still waiting for the lost one
+                reason = f"exit code {failed[0]}" if failed else "no result"
+                raise RuntimeError(f"A shard worker ended with {reason}; the sharded run was abandoned.")
+        return shard_results
+
+    @staticmethod
+    def _collect_firings(shard_results):
+        # (ticks, neuron indices, potentials, thresholds) of every firing, by tick, then neuron
+        if not shard_results:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0)
+        fire_ticks, fire_indices, potentials, thresholds = (np.concatenate(column) for column in zip(*shard_results))
+        order = np.lexsort((fire_indices, fire_ticks))
+        return fire_ticks[order], fire_indices[order], potentials[order], thresholds[order]
+
+    def _replay_history(self, stimulus, fire_ticks, fire_indices):
+        """Append the run's inputs and firing decisions to each neuron's history, as receive_input would."""
+        ticks = stimulus.shape[0]
+        fired = np.zeros(stimulus.shape, dtype=np.bool_)
+        fired[fire_ticks, fire_indices] = True
+        for i, neuron in enumerate(self.neurons):
+            if neuron.asleep or not ticks:
+                continue  # asleep neurons ignore their input and remember nothing
+            history = neuron.history
+            first = max(0, ticks - history.capacity)  # anything older would be overwritten within the run
+            for tick, value, did_fire in zip(range(first, ticks), stimulus[first:, i].tolist(), fired[first:, i].tolist()):
+                history.append(neuron.tick + tick + 1, value, did_fire)
+
+    def _narrate_firings(self, firings, start, base_ticks):
+        for tick, index, potential, threshold in zip(*(column.tolist() for column in firings)):
+            neuron = self.neurons[index]
+            neuron.tick = base_ticks[index] + tick + 1
+            if neuron.clock is not self.clock:
+                neuron.narrate("fire", potential, threshold, neuron.task_context, event_type="fire")
+            elif neuron._narrating:
+                # narrate() would stamp the clock's current tick, which is past the whole run
+                neuron._record((start + tick, "fire", "fire", (potential, threshold, neuron.task_context), None, None))
+            if neuron._fire_listeners:
+                if neuron.clock is self.clock:
+                    neuron._at = start + tick  # listeners read the tick it fired at, not the clock's
+                for listener in neuron._fire_listeners:
+                    listener(neuron)
+                neuron._at = None
+
+    @property
+    def log(self):
+        return [f"- [{format_stamp(tick, self.clock)}] {message}" for tick, message in self.records]
 
     def get_log(self):
         return self.log
@@ -0,0 +1,297 @@
+"""
+CoFiringTracker: Lets Clusters emerge from neurons that repeatedly fire together.
+"""
+from collections import deque
+from itertools import chain
+import numpy as np
+from cluster import Cluster
+from config import COFIRING_WINDOW, COFIRING_DECAY, COFIRING_THRESHOLD, COFIRING_MIN_OVERLAP, COFIRING_MIN_FIRES
+
+_MERSENNE_PRIME = (1 << 31) - 1
+# Stored scores are divided by decay ** (ticks since the epoch); past this, fold the decay into them
+_RESCALE_BELOW = 1e-100
+
+
+class CoFiringTracker:
+    """
+    Watches fire events over a sliding window of `window` ticks and forms a Cluster whenever a
+    group of neurons keeps firing together.
+
+    A dense neuron-by-neuron matrix is out of the question at scale, so candidate pairs come from
+    MinHash signatures of each neuron's recent firing ticks, bucketed with locality-sensitive
+    hashing: only neurons whose firing sets look alike ever meet. Each candidate pair then gets
+    an exact decayed co-firing score, sum(decay ** (now - tick)) over the ticks both fired in,
+    kept in the sparse `pair_scores` dict. Pairs at or above `threshold` whose firings also mostly
+    coincide (at least `min_overlap` of the ticks either fired in) are joined into groups. A group
+    of at least `min_cluster_size` neurons becomes a Cluster, or grows (and merges) the Clusters
+    its members already belong to. The overlap test keeps busy neurons from joining every group
+    just by firing often.
+
+    Everything is kept up to date incrementally: detect() only rehashes, rebuckets and rescores
+    neurons that fired or had firings leave the window since the last call. Scores of the other
+    pairs are not touched: they are stored as of a common epoch tick, so their decay is one factor
+    shared by all of them.
+    """
+
+    def __init__(self, window=COFIRING_WINDOW, decay=COFIRING_DECAY, threshold=COFIRING_THRESHOLD,
+                 min_overlap=COFIRING_MIN_OVERLAP, min_cluster_size=2, min_fires=COFIRING_MIN_FIRES, num_perm=32, bands=8, seed=0):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.window = window
+        self.decay = decay
+        self.threshold = threshold
+        self.min_overlap = min_overlap
+        self.min_cluster_size = min_cluster_size
+        self.min_fires = min_fires
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        self._hash_a = rng.integers(1, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.int64)
+        self._hash_b = rng.integers(0, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.int64)
+        self._band_mix = rng.integers(1, 1 << 62, size=self.rows, dtype=np.int64)
+        self._fires = {}  # neuron id -> deque of recent fire ticks
+        self._neurons = {}  # neuron id -> Neuron
+        self._arrivals = deque()  # (tick, neuron id) in the order firings were observed, for expiry
+        self._new_ticks = {}  # neuron id -> fire ticks observed since the last detect()
+        self._expired = set()  # neuron ids that lost ticks since their signature was computed
+        self._signatures = {}  # neuron id -> MinHash signature, for neurons with at least min_fires
+        self._band_keys = {}  # neuron id -> its bucket key in every band
+        self._buckets = [{} for _ in range(bands)]  # per band: key -> {neuron id: None}, oldest member first
+        self._partners = {}  # neuron id -> ids it shares a scored pair with
+        self.pair_scores = {}  # (neuron id, neuron id) -> decayed co-firing score, as of tick `_epoch`
+        self._overlaps = {}  # same pairs -> share of their firing ticks that coincide
+        self._unscored = set()  # pairs that met since the last detect()
+        self._linked = {}  # pairs at or above threshold and min_overlap at the last detect(), as dict keys
+        self.scored_at = 0
+        self._epoch = 0
+        self.clusters = []
+        self._cluster_of = {}  # neuron id -> the Cluster it belongs to
+        self.latest_tick = 0
+
+    def observe(self, tick, fired_neurons):
+        """Record that `fired_neurons` (Neuron objects) fired at `tick`."""
+        self.latest_tick = max(self.latest_tick, tick)
+        for neuron in fired_neurons:
+            ticks = self._fires.get(neuron.id)
+            if ticks is None:
+                ticks = self._fires[neuron.id] = deque(maxlen=self.window)
+                self._neurons[neuron.id] = neuron
+            if len(ticks) == ticks.maxlen:
+                self._expired.add(neuron.id)  # the append pushes the oldest tick out
+            ticks.append(tick)
+            self._arrivals.append((tick, neuron.id))
+            self._new_ticks.setdefault(neuron.id, []).append(tick)
+
+    def observe_firings(self, ticks, indices, neurons):
+        """Record firings given as parallel arrays, e.g. from Cluster.run_sharded or a NeuronPopulation."""
+        for tick, index in zip(np.asarray(ticks).tolist(), np.asarray(indices).tolist()):
+            self.observe(tick, (neurons[index],))
+
+    def _min_hashes(self, tick_lists):
+        # MinHash: for each hash function, the smallest hash over each list of ticks.
+        # All lists are hashed in one pass and reduced per list with reduceat.
+        lengths = np.fromiter((len(ticks) for ticks in tick_lists), dtype=np.int64, count=len(tick_lists))
+        values = np.fromiter(chain.from_iterable(tick_lists), dtype=np.int64, count=int(lengths.sum()))
+        hashed = (self._hash_a * (values % _MERSENNE_PRIME) + self._hash_b) % _MERSENNE_PRIME
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        return np.minimum.reduceat(hashed, offsets, axis=1).T  # (lists, num_perm)
+
+    def _expire(self, oldest):
+        # Firings leave the window in the order they arrived
+        arrivals = self._arrivals
+        while arrivals and arrivals[0][0] <= oldest:
+            _, neuron_id = arrivals.popleft()
+            ticks = self._fires.get(neuron_id)
+            if ticks and ticks[0] <= oldest:
+                while ticks and ticks[0] <= oldest:
+                    ticks.popleft()
+                self._expired.add(neuron_id)
+
+    def _update_signatures(self, changed):
+        """Bring signatures of `changed` neurons up to date; returns those whose band keys moved."""
+        rebuild, extend = [], []
+        for neuron_id in changed:
+            ticks = self._fires.get(neuron_id)
+            if not ticks or len(ticks) < self.min_fires:
+                self._forget(neuron_id)
+            elif neuron_id in self._expired or neuron_id not in self._signatures:
+                rebuild.append(neuron_id)
+            else:
+                extend.append(neuron_id)
+        if rebuild:
+            for neuron_id, signature in zip(rebuild, self._min_hashes([self._fires[neuron_id] for neuron_id in rebuild])):
+                self._signatures[neuron_id] = signature
+        if extend:
+            # A signature over a growing set only ever gets smaller: fold in the new ticks' hashes
+            for neuron_id, hashes in zip(extend, self._min_hashes([self._new_ticks[neuron_id] for neuron_id in extend])):
+                np.minimum(self._signatures[neuron_id], hashes, out=self._signatures[neuron_id])
+        moved = []
+        for neuron_id in rebuild + extend:
+            keys = tuple((self._signatures[neuron_id].reshape(self.bands, self.rows) @ self._band_mix).tolist())  # wraps, still a fine hash
+            if keys != self._band_keys.get(neuron_id):
+                self._unbucket(neuron_id)
+                self._band_keys[neuron_id] = keys
+                moved.append(neuron_id)
+        return moved
+
+    def _unbucket(self, neuron_id):
+        keys = self._band_keys.pop(neuron_id, None)
+        if keys is None:
+            return
+        for band, key in enumerate(keys):
+            bucket = self._buckets[band][key]
+            was_head = next(iter(bucket)) == neuron_id
+            del bucket[neuron_id]
+            if not bucket:
+                del self._buckets[band][key]
+            elif was_head:
+                # The bucket's members were paired through the old head; pair them with the new one
+                members = iter(bucket)
+                head = next(members)
+                for member in members:
+                    self._pair(head, member)
+
+    def _forget(self, neuron_id):
+        # Too few firings left in the window to be considered: out of the buckets and every pair
+        self._unbucket(neuron_id)
+        self._signatures.pop(neuron_id, None)
+        for partner in self._partners.pop(neuron_id, ()):
+            self._drop_pair(neuron_id, partner)
+        if not self._fires.get(neuron_id, True):
+            del self._fires[neuron_id]
+            del self._neurons[neuron_id]
+
+    def _pair(self, first, second):
+        # Only meeting matters here; the score is computed once per detect() for changed pairs
+        pair = (first, second) if first < second else (second, first)
+        if pair not in self.pair_scores:
+            self.pair_scores[pair] = None
+            self._unscored.add(pair)
+            self._partners.setdefault(first, set()).add(second)
+            self._partners.setdefault(second, set()).add(first)
+
+    def _drop_pair(self, first, second):
+        pair = (first, second) if first < second else (second, first)
+        self.pair_scores.pop(pair, None)
+        self._overlaps.pop(pair, None)
+        self._linked.pop(pair, None)
+        self._unscored.discard(pair)
+        self._partners.get(first, set()).discard(second)
+        self._partners.get(second, set()).discard(first)
+
+    def _bucket(self, neuron_id):
+        # Locality-sensitive hashing: neurons whose signatures agree on a whole band share a bucket.
+        # A newcomer is paired with the bucket's oldest member, which is linear in bucket size and
+        # enough to connect a group whose members all fire alike.
+        for band, key in enumerate(self._band_keys[neuron_id]):
+            bucket = self._buckets[band].setdefault(key, {})
+            if bucket:
+                self._pair(next(iter(bucket)), neuron_id)
+            bucket[neuron_id] = None
+
+    def pair_score(self, first, second):
+        """Decayed co-firing score of two neurons (by id) as of the last detect(); None if they never met."""
+        score = self.pair_scores.get((first, second) if first < second else (second, first))
+        return None if score is None else score * self.decay ** (self.scored_at - self._epoch)
+
+    def _score(self, first, second, now):
+        # (decayed co-firing count, fraction of their firing ticks that coincide)
+        first_ticks, second_ticks = set(self._fires[first]), set(self._fires[second])
+        common = first_ticks & second_ticks
+        score = sum(self.decay ** (now - tick) for tick in common)
+        return score, len(common) / len(first_ticks | second_ticks)
+
+    def detect(self, now=None):
+        """
+        Update pair scores for this moment and return the Clusters formed or grown by this call.
+        Cost grows with the number of neurons whose firings changed since the last call and the
+        number of linked pairs, not with all the pairs scored, so it can run every tick or every few.
+        """
+        now = self.latest_tick if now is None else now
+        self._expire(now - self.window)
+        changed = set(self._new_ticks) | self._expired
+        for neuron_id in self._update_signatures(changed):
+            self._bucket(neuron_id)
+        self._new_ticks.clear()
+        self._expired.clear()
+
+        # Pairs of unchanged neurons kept their common ticks, so their scores only decay; stored as
+        # of the epoch, they decay together without being touched. Once in a long while the
+        # epoch is moved up to now, which does touch every pair.
+        scale = self.decay ** (now - self._epoch)
+        if scale < _RESCALE_BELOW:
+            for pair, score in self.pair_scores.items():
+                if score is not None:
+                    self.pair_scores[pair] = score * scale
+            self._epoch, scale = now, 1.0
+        rescore = set()
+        for neuron_id in changed:
+            for partner in self._partners.get(neuron_id, ()):
+                rescore.add((neuron_id, partner) if neuron_id < partner else (partner, neuron_id))
+        rescore |= self._unscored
+        self._unscored.clear()
+        for pair in rescore:
+            if pair not in self.pair_scores:
+                continue  # dropped along with a neuron that fell below min_fires
+            score, overlap = self._score(pair[0], pair[1], now)
+            if not score:
+                self._drop_pair(*pair)  # nothing in common any more
+                continue
+            self.pair_scores[pair] = score / scale
+            self._overlaps[pair] = overlap
+            if score >= self.threshold and overlap >= self.min_overlap:
+                self._linked[pair] = None
+            else:
+                self._linked.pop(pair, None)
+        self.scored_at = now
+
+        # Decay alone can only unlink a pair
+        cutoff = self.threshold / scale
+        for pair in [pair for pair in self._linked if self.pair_scores[pair] < cutoff]:
+            del self._linked[pair]
+        return self._form_clusters(list(self._linked))
+
+    def _form_clusters(self, linked):
+        parent = {}
+
+        def find(neuron_id):
+            while parent.setdefault(neuron_id, neuron_id) != neuron_id:
+                parent[neuron_id] = parent[parent[neuron_id]]
+                neuron_id = parent[neuron_id]
+            return neuron_id
+
+        for first, second in linked:
+            parent[find(first)] = find(second)
+        groups = {}
+        for neuron_id in parent:
+            groups.setdefault(find(neuron_id), []).append(neuron_id)
+        touched = []
+        for members in groups.values():
+            if len(members) < self.min_cluster_size:
+                continue
+            members.sort()
+            existing = []
+            for neuron_id in members:
+                cluster = self._cluster_of.get(neuron_id)
+                if cluster is not None and all(cluster is not other for other in existing):
+                    existing.append(cluster)
+            if not existing:
+                cluster = Cluster([self._neurons[neuron_id] for neuron_id in members])
+                self.clusters.append(cluster)
+            else:
+                # Grow the oldest cluster the group touches; any others it bridges are merged into it
+                cluster = min(existing, key=lambda cluster: self.clusters.index(cluster))
+                size = len(cluster.neurons)
+                for other in existing:
+                    if other is not cluster:
+                        cluster.absorb(other)
+                        self.clusters.remove(other)
+                        for neuron in other.neurons:
+                            self._cluster_of[neuron.id] = cluster
+                cluster.add_neurons([self._neurons[neuron_id] for neuron_id in members if self._cluster_of.get(neuron_id) is not cluster])
+                if len(cluster.neurons) == size:
+                    continue  # the group was already this cluster
+            for neuron in cluster.neurons:
+                self._cluster_of[neuron.id] = cluster
+            touched.append(cluster)
+        return touched
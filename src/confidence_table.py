@@ -0,0 +1,75 @@
+"""
+ConfidenceTable: Pattern confidences that can all be shifted at once in constant time.
+"""
+from collections.abc import MutableMapping
+
+
+class ConfidenceTable(MutableMapping):
+    """
+    A dict of pattern -> confidence in [low, high] with one extra operation, shift_all(delta),
+    which moves every confidence by delta and clamps it back into range, as PatternWatcher does
+    when its trust in a neuron changes.
+
+    Rather than touching every entry, a shift only updates one global transform,
+    value = min(ceiling, max(floor, stored + offset)). Clamped shifts compose into a transform of
+    the same shape, so any sequence of them is still three numbers; entries are resolved on read.
+    A confidence is stored so that the current transform reproduces it. Once shifts have
+    squeezed [floor, ceiling] too narrow to represent a new value, the table is settled into
+    plain values and starts again from the identity transform.
+
+    `fallback(pattern)`, if given, is asked for patterns the table does not hold yet (e.g. a
+    PatternStore lookup); whatever it returns joins the table as a value of the present moment.
+    """
+
+    def __init__(self, low=0.0, high=1.0, fallback=None):
+        self.low = low
+        self.high = high
+        self.fallback = fallback
+        self._stored = {}
+        self._offset = 0.0
+        self._floor = low
+        self._ceiling = high
+
+    def __getitem__(self, pattern):
+        if pattern not in self._stored and not self._load(pattern):
+            raise KeyError(pattern)
+        return min(self._ceiling, max(self._floor, self._stored[pattern] + self._offset))
+
+    def _load(self, pattern):
+        confidence = self.fallback(pattern) if self.fallback is not None else None
+        if confidence is None:
+            return False
+        self[pattern] = confidence
+        return True
+
+    def __setitem__(self, pattern, confidence):
+        if not self._floor <= confidence <= self._ceiling:
+            self._settle()
+        self._stored[pattern] = confidence - self._offset
+
+    def __delitem__(self, pattern):
+        del self._stored[pattern]
+
+    def __iter__(self):
+        return iter(self._stored)
+
+    def __len__(self):
+        return len(self._stored)
+
+    def __contains__(self, pattern):
+        return pattern in self._stored or self._load(pattern)
+
+    def shift_all(self, delta):
+        """Move every confidence by `delta`, clamped to [low, high]."""
+        self._offset += delta
+        self._floor = min(self.high, max(self.low, self._floor + delta))
+        self._ceiling = min(self.high, max(self.low, self._ceiling + delta))
+
+    def _settle(self):
+        self._stored = {pattern: self[pattern] for pattern in self._stored}
+        self._offset = 0.0
+        self._floor = self.low
+        self._ceiling = self.high
+
+    def __repr__(self):
+        return f"ConfidenceTable({dict(self.items())})"
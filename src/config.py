@@ -16,3 +16,18 @@ TRUST_ADOPT_THRESHOLD = 0.8  # Trust threshold for adoption
 ADOPTION_THRESHOLD = 3  # Number of encounters before independent recognition
 MENTORING_TRUST_BOOST = 0.1  # Trust boost for mentoring
 PATTERNWATCHER_CONFIDENCE_STEP = 0.2  # Confidence step for PatternWatcher adaptation
+DISPATCHER_MAX_QUEUE = 10000  # Pending events before emit() makes producers wait (backpressure)
+DISPATCHER_BATCH_SIZE = 256  # Most events the dispatcher delivers per wakeup
+DISPATCHER_BATCH_WINDOW_US = 500  # Longest time (microseconds) spent gathering one batch
+COFIRING_WINDOW = 50  # Ticks of firing history the co-firing tracker considers
+COFIRING_DECAY = 0.95  # Per-tick decay applied to past co-firings when scoring a pair
+COFIRING_THRESHOLD = 3.0  # Decayed co-firing score at which two neurons count as firing together
+COFIRING_MIN_OVERLAP = 0.5  # Share of a pair's firing ticks that must coincide for them to count as a group
+COFIRING_MIN_FIRES = 2  # Firings within the window before a neuron is considered for clustering
+SYNAPSE_DEFAULT_WEIGHT = 0.5  # Input a postsynaptic neuron receives per presynaptic spike
+SYNAPSE_DEFAULT_DELAY = 1  # Ticks a spike takes to cross a synapse
+CHECKPOINT_FULL_EVERY = 10  # Checkpoints between full ones; those in between only store what changed
+SWEEP_RATE_WINDOW = 10  # Ticks averaged into each point of a parameter sweep's firing-rate curve
+CLOCK_WALL_RESOLUTION = 1.0  # Seconds between the wall-clock samples a SimulationClock keeps for exports
+CLUSTER_SHARD_TIMEOUT = 30.0  # Seconds a shard waits for the others at a tick before run_sharded gives up
+CLUSTER_SHARD_POLL = 0.5  # Seconds between checks on the workers while run_sharded waits for their results
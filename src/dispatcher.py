@@ -1,21 +1,207 @@
 """
 Dispatcher: Event loop and callback system for neurons.
+
+Neurons subscribe to the sources or input types they care about, and each event is routed
+only to its subscribers through an index keyed by source and input type. This keeps the cost
+of an event proportional to its audience, not to the size of the network.
+
+The queue is bounded: when consumers fall behind, emit() waits instead of letting memory grow.
+Each wakeup of the consumer drains up to `batch_size` events (or `batch_window_us` microseconds
+worth) and hands every neuron its share of the batch in one go.
+
+If delivering a batch raises, the dispatcher fails: dispatch() re-raises the error, the events
+still queued are dropped, and emit() and drain() raise it too instead of waiting forever.
+
+A dispatcher given a SimulationClock owns it: every delivered event is one tick. Batches are cut
+by timing, so ticking per event rather than per batch keeps the ticks the same from run to run.
+A batch is stamped with the tick it starts at and its events with the ticks after that; each
+neuron still gets its share in one go, handling each event at that event's tick, while the shared
+clock stays at the batch's start until the whole batch is delivered and then moves past it. Neurons registered without a clock of their own join it.
 """
 import asyncio
+import time
+from config import DISPATCHER_MAX_QUEUE, DISPATCHER_BATCH_SIZE, DISPATCHER_BATCH_WINDOW_US
+
 
 class Dispatcher:
-    def __init__(self):
+    def __init__(self, max_queue=DISPATCHER_MAX_QUEUE, batch_size=DISPATCHER_BATCH_SIZE, batch_window_us=DISPATCHER_BATCH_WINDOW_US, clock=None):
+        self.clock = clock
         self.neurons = []
-        self.event_queue = asyncio.Queue()
+        self.by_source = {}  # source -> [neuron]
+        self.by_input_type = {}  # input_type -> [neuron]
+        self.listen_to_all = []  # neurons registered without any subscription
+        self.batch_size = batch_size
+        self.batch_window = batch_window_us / 1_000_000
+        self.event_queue = asyncio.Queue(maxsize=max_queue)
+        self.failure = None  # the exception that stopped dispatch(), if any
 
-    def register(self, neuron):
+    def register(self, neuron, sources=None, input_types=None):
+        """
+        Register a neuron and subscribe it to the given sources and/or input types.
+        A neuron registered with neither hears every event, like the old broadcast behaviour.
+        """
         self.neurons.append(neuron)
+        if self.clock is not None and neuron.clock is None:
+            neuron.clock = self.clock
+        for source in sources or ():
+            self.subscribe(neuron, source=source)
+        for input_type in input_types or ():
+            self.subscribe(neuron, input_type=input_type)
+        if not sources and not input_types:
+            self.listen_to_all.append(neuron)
+
+    def subscribe(self, neuron, source=None, input_type=None):
+        if source is not None:
+            self.by_source.setdefault(source, []).append(neuron)
+        if input_type is not None:
+            self.by_input_type.setdefault(input_type, []).append(neuron)
+
+    def unsubscribe(self, neuron, source=None, input_type=None):
+        """
+        Stop delivering events from `source` and/or of `input_type` to the neuron. Given neither,
+        the neuron stops hearing anything: it leaves listen_to_all and every subscription.
+        """
+        if source is None and input_type is None:
+            if neuron in self.listen_to_all:
+                self.listen_to_all.remove(neuron)
+            for index in (self.by_source, self.by_input_type):
+                for key in [key for key, subscribers in index.items() if neuron in subscribers]:
+                    self._remove(index, key, neuron)
+            return
+        for index, key in ((self.by_source, source), (self.by_input_type, input_type)):
+            if key is not None:
+                self._remove(index, key, neuron)
+
+    @staticmethod
+    def _remove(index, key, neuron):
+        subscribers = index.get(key)
+        if subscribers and neuron in subscribers:
+            subscribers.remove(neuron)
+            if not subscribers:
+                del index[key]
+
+    def subscribers(self, source, input_type):
+        """Neurons that should hear an event from `source` of `input_type`, each at most once."""
+        groups = [group for group in (self.by_source.get(source), self.by_input_type.get(input_type), self.listen_to_all) if group]
+        if len(groups) == 1:
+            return groups[0]
+        seen = set()
+        targets = []
+        for group in groups:
+            for neuron in group:
+                if id(neuron) not in seen:
+                    seen.add(id(neuron))
+                    targets.append(neuron)
+        return targets
+
+    def deliver(self, event):
+        source = event.get('source')
+        input_type = event.get('input_type', "generic")
+        for neuron in self.subscribers(source, input_type):
+            neuron.receive_input(event['value'], source=source, input_type=input_type, metadata=event.get('metadata'))
+        if self.clock is not None:
+            self.clock.advance()
+
+    def deliver_batch(self, events):
+        """Route a batch of events, then give each neuron all of its events in order."""
+        if len(events) == 1:
+            self.deliver(events[0])
+            return
+        # Group the batch by (source, input_type): subscribers are looked up once per group, each
+        # event is unpacked once for all its subscribers, and a neuron hearing a single group gets
+        # that group's list as its inbox without copying
+        groups = {}  # (source, input_type) -> ([(value, source, input_type, metadata)], [position in the batch])
+        for position, event in enumerate(events):
+            source = event.get('source')
+            input_type = event.get('input_type', "generic")
+            group = groups.get((source, input_type))
+            if group is None:
+                group = groups[source, input_type] = ([], [])
+            group[0].append((event['value'], source, input_type, event.get('metadata')))
+            group[1].append(position)
+        heard = {}  # id(neuron) -> (neuron, [group])
+        for key, group in groups.items():
+            for neuron in self.subscribers(*key):
+                entry = heard.get(id(neuron))
+                if entry is None:
+                    heard[id(neuron)] = (neuron, [group])
+                else:
+                    entry[1].append(group)
+        clock = self.clock
+        start = None if clock is None else clock.now
+        for neuron, neuron_groups in heard.values():
+            if len(neuron_groups) == 1:
+                inbox, positions = neuron_groups[0]
+            else:
+                # Several groups: interleave them back into batch order
+                merged = sorted(pair for inbox, positions in neuron_groups for pair in zip(positions, inbox))
+                positions = [position for position, _ in merged]
+                inbox = [inputs for _, inputs in merged]
+            if clock is not None and neuron.clock is clock:
+                neuron.receive_batch(inbox, [start + position for position in positions])
+            else:
+                neuron.receive_batch(inbox)
+        if clock is not None:
+            clock.advance(len(events))
+
+    def _gather_batch(self, first_event):
+        # Take whatever is already queued, up to batch_size events or the batch window
+        batch = [first_event]
+        deadline = time.perf_counter() + self.batch_window
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.event_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+            if time.perf_counter() >= deadline:
+                break
+        return batch
 
     async def dispatch(self):
         while True:
-            event = await self.event_queue.get()
-            for neuron in self.neurons:
-                await neuron.on_event(event['value'], event.get('source'))
+            batch = self._gather_batch(await self.event_queue.get())
+            try:
+                self.deliver_batch(batch)
+            except Exception as error:
+                self.failure = error
+                self._discard_queued()
+                raise
+            finally:
+                for _ in batch:
+                    self.event_queue.task_done()
+
+    def queued_events(self):
+        """Copies of the events waiting to be delivered, oldest first. The queue is left as it was."""
+        events = []
+        while True:
+            try:
+                events.append(self.event_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        for event in events:
+            self.event_queue.put_nowait(event)
+            self.event_queue.task_done()  # the put counted it again; it is still the same pending event
+        return [dict(event) for event in events]
+
+    def _discard_queued(self):
+        # Nobody will deliver these any more; mark them done so join() does not wait on them
+        while True:
+            try:
+                self.event_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            self.event_queue.task_done()
+
+    async def emit(self, value, source=None, input_type="generic", metadata=None):
+        # Waits while the queue is full, so a fast producer cannot outrun the neurons
+        if self.failure is not None:
+            raise self.failure
+        await self.event_queue.put({'value': value, 'source': source, 'input_type': input_type, 'metadata': metadata})
 
-    async def emit(self, value, source=None):
-        await self.event_queue.put({'value': value, 'source': source})
+    async def drain(self):
+        """Wait until every emitted event has been delivered; raises the error if dispatch() failed."""
+        if self.failure is None:
+            await self.event_queue.join()
+        if self.failure is not None:
+            self._discard_queued()
+            raise self.failure
@@ -0,0 +1,77 @@
+"""
+FiringHistory: Fixed-capacity ring buffer of a neuron's recent inputs and firing decisions.
+"""
+from array import array
+
+
+class FiringHistory:
+    """
+    Remembers the last `capacity` inputs as typed columns (tick, input value, fired flag)
+    instead of an ever-growing list of tuples. Running counters make the questions neurons
+    and PatternWatcher ask most often ("how often did I fire lately?", "how long since I
+    last fired?") constant time.
+
+    Iterating or indexing yields (tick, input_value, fired) tuples, oldest first, so code that
+    reads `neuron.history` like the old list keeps working.
+    """
+    __slots__ = ("capacity", "ticks", "inputs", "fired", "_next", "_size", "fire_count", "quiet_streak")
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.ticks = array('q', [0]) * capacity
+        self.inputs = array('d', [0.0]) * capacity
+        self.fired = array('b', [0]) * capacity
+        self._next = 0  # slot the next entry will be written to
+        self._size = 0
+        self.fire_count = 0  # firings among the entries currently remembered
+        self.quiet_streak = 0  # consecutive most recent entries without a firing
+
+    def append(self, tick, input_value, fired):
+        slot = self._next
+        if self._size == self.capacity:
+            # The oldest entry is about to be overwritten; forget its firing too
+            self.fire_count -= self.fired[slot]
+        else:
+            self._size += 1
+        self.ticks[slot] = tick
+        self.inputs[slot] = input_value
+        self.fired[slot] = fired
+        if fired:
+            self.fire_count += 1
+            self.quiet_streak = 0
+        else:
+            self.quiet_streak += 1
+        self._next = slot + 1 if slot + 1 < self.capacity else 0
+
+    def _slot(self, index):
+        # Map a logical index (0 = oldest, -1 = newest) to a ring slot
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("firing history index out of range")
+        return (self._next - self._size + index) % self.capacity
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        slot = self._slot(index)
+        return (self.ticks[slot], self.inputs[slot], bool(self.fired[slot]))
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield self[index]
+
+    def recent(self, count):
+        """The last `count` entries, oldest first."""
+        count = min(count, self._size)
+        return [self[index] for index in range(self._size - count, self._size)]
+
+    def firing_ticks(self, count=None):
+        """Ticks at which the neuron fired among the last `count` entries (all remembered ones by default)."""
+        entries = self if count is None else self.recent(count)
+        return [tick for tick, _, fired in entries if fired]
+
+    @property
+    def last_fired(self):
+        return bool(self._size) and bool(self.fired[self._slot(-1)])
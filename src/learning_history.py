@@ -0,0 +1,74 @@
+"""
+LearningHistory: A watcher's bounded learning log that spills old entries to its store.
+"""
+from collections import deque
+
+
+class LearningHistory:
+    """
+    Keeps the newest `capacity` entries in memory. Older ones spill into a PatternStore, tagged
+    with the owning watcher and `kind`, where entries() can still find them; memory therefore
+    stays flat however long the watcher lives. Without a store they are dropped.
+
+    `store` is a zero-argument callable returning the PatternStore, or None when there is none,
+    so a store is only opened once something actually overflows. Entries written by persist()
+    are not written again when they later leave memory.
+
+    Appending, iterating, len() and indexing work on the in-memory entries, like the plain
+    list this replaces.
+    """
+
+    def __init__(self, capacity, store, watcher_id, kind="learning"):
+        self.capacity = max(1, capacity)
+        self._store = store
+        self.watcher_id = watcher_id
+        self.kind = kind
+        self._recent = deque()
+        self.total = 0  # entries ever appended; entry n (0-based) is in memory once n >= total - len(self)
+        self._persisted = 0  # entries 0.._persisted-1 are in the store
+
+    def append(self, entry):
+        if not isinstance(entry, dict):
+            entry = {"event": self.kind, "value": entry}
+        self._recent.append(entry)
+        self.total += 1
+        if len(self._recent) > self.capacity:
+            oldest = self._recent.popleft()
+            if self._persisted <= self.total - len(self._recent) - 1:
+                store = self._store()
+                if store is None:
+                    return
+                store.append_learning((oldest,), watcher=self.watcher_id, kind=self.kind)
+                self._persisted += 1
+
+    def persist(self):
+        """Write the in-memory entries the store does not have yet."""
+        first_in_memory = self.total - len(self._recent)
+        pending = list(self._recent)[max(0, self._persisted - first_in_memory):]
+        store = self._store()
+        if store is None:
+            return
+        if pending:
+            store.append_learning(pending, watcher=self.watcher_id, kind=self.kind)
+        self._persisted = self.total
+
+    def entries(self, neuron_id=None, limit=None):
+        """Every entry this history ever held (spilled and in memory), oldest first, optionally for one neuron."""
+        first_in_memory = self.total - len(self._recent)
+        spilled = []
+        if self._persisted:
+            spilled = self._store().learning(neuron_id=neuron_id, watcher=self.watcher_id, kind=self.kind)
+        recent = list(self._recent)[max(0, self._persisted - first_in_memory):]
+        if neuron_id is not None:
+            recent = [entry for entry in recent if entry.get("neuron_id") == neuron_id]
+        found = spilled + recent
+        return found if limit is None else found[-limit:]
+
+    def __len__(self):
+        return len(self._recent)
+
+    def __iter__(self):
+        return iter(self._recent)
+
+    def __getitem__(self, index):
+        return self._recent[index]
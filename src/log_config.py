@@ -2,3 +2,11 @@
 Logging configuration for PatternWatcher and Neuron
 """
 LOG_MODE = 'diagnostic'  # Options: 'concise', 'diagnostic'
+
+# Where narration goes. Options: 'null' (off, near zero cost), 'memory' (kept for Markdown export),
+# 'stdout' (rate-limited console echo), 'file' (buffered text file); combine with '+', e.g. 'memory+stdout'.
+# Resolved once when each Neuron/PatternWatcher is constructed.
+LOG_SINK = 'memory'
+LOG_STDOUT_MAX_PER_SECOND = 50  # Console lines per second before the stdout sink starts summarizing
+LOG_FILE_PATH = 'logs/narration.log'  # Used by the 'file' sink
+LOG_FILE_BUFFER = 1000  # Lines buffered by the 'file' sink before each write
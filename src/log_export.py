@@ -0,0 +1,77 @@
+"""
+LogExporter: Streams PatternWatcher and Neuron narratives into a Markdown file section by section.
+"""
+import os
+import log_config
+
+
+class LogExporter:
+    """
+    Writes the same Markdown the scenarios used to assemble as one big string, but one owner at
+    a time through a buffered file: the watcher's narrative, then one fold per neuron, each
+    separated by a blank line. After an owner is written its in-memory records are drained, so
+    peak memory is one owner's narrative rather than the whole run's, twice over.
+
+    Owners may be written whenever convenient, e.g. a neuron as soon as it is retired; writing
+    an owner again later adds a further section with whatever it narrated since.
+    """
+
+    def __init__(self, path, log_mode=None, buffer_size=1 << 16, drain=True):
+        self.path = path
+        self.log_mode = log_mode or log_config.LOG_MODE
+        self.drain = drain
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8", buffering=buffer_size)
+        self._sections = 0
+
+    def _begin_section(self):
+        if self._sections:
+            self._file.write("\n\n")
+        self._sections += 1
+
+    def _write_lines(self, lines):
+        write = self._file.write
+        for i, line in enumerate(lines):
+            if i:
+                write("\n")
+            write(line)
+
+    def _drain(self, owner):
+        if self.drain and hasattr(owner.log_sink, "drain"):
+            owner.log_sink.drain()
+
+    def write_watcher(self, watcher):
+        self._begin_section()
+        if self.log_mode == 'concise':
+            self._file.write(watcher.export_concise_log())
+        else:
+            self._write_lines(watcher.log)
+        self._drain(watcher)
+
+    def write_neuron(self, neuron):
+        self._begin_section()
+        if self.log_mode == 'concise':
+            self._file.write(neuron.export_concise_log())
+        else:
+            # Same fold as Neuron.markdown_log() / utils.markdown_fold, written line by line
+            self._file.write(f"<details><summary>Neuron {neuron.id}</summary>\n")
+            self._write_lines(neuron.log)
+            self._file.write("\n</details>")
+        self._drain(neuron)
+
+    def write_neurons(self, neurons):
+        for neuron in neurons:
+            self.write_neuron(neuron)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
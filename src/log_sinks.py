@@ -0,0 +1,199 @@
+"""
+Log sinks: Where Neuron and PatternWatcher narration records go once they are recorded.
+
+Every sink has the same small surface:
+- enabled: False only for NullSink, letting owners skip building records altogether
+- records: the records kept in memory for later rendering (empty for sinks that keep none)
+- emit(record, owner): accept one record; owner.render_line(record) turns it into text on demand
+- flush() / close()
+"""
+import atexit
+import os
+import sys
+import time
+import log_config
+
+
+class NullSink:
+    """Narration off: nothing is recorded, rendered or printed."""
+    enabled = False
+    records = ()
+
+    def emit(self, record, owner):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class MemorySink:
+    """Keeps records in memory so markdown_log()/export_concise_log() can render them later."""
+    enabled = True
+    __slots__ = ("records",)
+
+    def __init__(self):
+        self.records = []
+
+    def emit(self, record, owner):
+        self.records.append(record)
+
+    def drain(self):
+        """Hand over the records gathered so far and start afresh."""
+        records, self.records = self.records, []
+        return records
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class BufferedFileSink:
+    """Renders records to a text file, writing in batches of `buffer_size` lines."""
+    enabled = True
+    records = ()
+
+    def __init__(self, path, buffer_size=1000):
+        self.path = path
+        self.buffer_size = buffer_size
+        self._pending = []
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def emit(self, record, owner):
+        self._pending.append(owner.render_line(record))
+        if len(self._pending) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._pending and not self._file.closed:
+            self._file.write("\n".join(self._pending) + "\n")
+            self._pending = []
+            self._file.flush()
+
+    def close(self):
+        self.flush()
+        if not self._file.closed:
+            self._file.close()
+
+
+class StdoutSink:
+    """
+    Prints records as they happen, but never more than `max_per_second` lines per second.
+    Suppressed lines are counted and summarized once the next second begins.
+    """
+    enabled = True
+    records = ()
+
+    def __init__(self, max_per_second=50, stream=None):
+        self.max_per_second = max_per_second
+        self.stream = stream or sys.stdout
+        self._window_start = 0.0
+        self._printed = 0
+        self.suppressed = 0
+
+    def emit(self, record, owner):
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            if self.suppressed:
+                self.stream.write(f"... {self.suppressed} narration events suppressed to keep the console readable.\n")
+            self._window_start = now
+            self._printed = 0
+            self.suppressed = 0
+        if self._printed >= self.max_per_second:
+            self.suppressed += 1
+            return
+        self._printed += 1
+        self.stream.write(owner.render_line(record) + "\n")
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        if self.suppressed:
+            self.stream.write(f"... {self.suppressed} narration events suppressed to keep the console readable.\n")
+            self.suppressed = 0
+        self.flush()
+
+
+class TeeSink:
+    """Sends every record to several sinks, e.g. memory for the Markdown export plus stdout."""
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+        self.enabled = any(sink.enabled for sink in sinks)
+
+    @property
+    def records(self):
+        for sink in self.sinks:
+            if hasattr(sink, "drain"):
+                return sink.records
+        return ()
+
+    def emit(self, record, owner):
+        for sink in self.sinks:
+            sink.emit(record, owner)
+
+    def drain(self):
+        for sink in self.sinks:
+            if hasattr(sink, "drain"):
+                return sink.drain()
+        return []
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+# One stateless NullSink serves every silent owner
+NULL_SINK = NullSink()
+
+# Console and file sinks are shared by every owner so lines interleave in one place
+_shared_sinks = {}
+
+
+def _shared(name):
+    if name not in _shared_sinks:
+        if name == "stdout":
+            sink = StdoutSink(log_config.LOG_STDOUT_MAX_PER_SECOND)
+        else:
+            sink = BufferedFileSink(log_config.LOG_FILE_PATH, log_config.LOG_FILE_BUFFER)
+        atexit.register(sink.close)
+        _shared_sinks[name] = sink
+    return _shared_sinks[name]
+
+
+def resolve_sink(spec=None):
+    """
+    Build the sink for a new Neuron/PatternWatcher. `spec` may be a sink instance or a name from
+    log_config.LOG_SINK: 'null', 'memory', 'stdout', 'file', or several joined by '+'.
+    Memory sinks are per owner; stdout and file sinks are shared.
+    """
+    if spec is None:
+        spec = log_config.LOG_SINK
+    if not isinstance(spec, str):
+        return spec
+    sinks = []
+    for name in spec.split("+"):
+        name = name.strip()
+        if name == "null":
+            continue
+        if name == "memory":
+            sinks.append(MemorySink())
+        elif name in ("stdout", "file"):
+            sinks.append(_shared(name))
+        else:
+            raise ValueError(f"Unknown log sink '{name}'. Options: null, memory, stdout, file.")
+    if not sinks:
+        return NULL_SINK
+    if len(sinks) == 1:
+        return sinks[0]
+    return TeeSink(*sinks)
@@ -5,7 +5,8 @@ def scenario_patternwatcher_multi_neuron():
     from pattern_watcher import PatternWatcher
     from config import DEFAULT_THRESHOLD, DEFAULT_REFRACTORY_OFFSET, DEFAULT_DECAY_FACTOR, DEFAULT_WEIGHTS
     interface = NeuronPatternInterface()
-    watcher = PatternWatcher(interface)
+    # This watcher learns in a store of this run's own (or in PATTERN_DB, accumulating across runs)
+    watcher = PatternWatcher(interface, store=open_scenario_store())
     # Create 9 neurons with varied config
     neurons = []
     for i in range(9):
@@ -24,14 +25,14 @@ def scenario_patternwatcher_multi_neuron():
         {"value": lambda: random.uniform(1.5, 2.5), "source": "stress", "label": "stress"},
         {"value": lambda: random.uniform(0.5, 1.7), "source": "conflict", "label": "conflict"},
     ]
+    watcher.watch_neurons(neurons)
     for t in range(12):
         for n in neurons:
             event = random.choice(event_types)
             n.receive_input(event["value"](), source=f"{event['source']}_{t}")
-        watcher.monitor_neurons(neurons, pattern=f"cycle_{t}", rapid_firing_threshold=3)
-        for n in neurons:
-            watcher.monitor_bounds(n)
-        firings = [i for i, n in enumerate(neurons) if n.history and n.history[-1][2]]
+        watcher.monitor_neurons(pattern=f"cycle_{t}", rapid_firing_threshold=3)
+        watcher.monitor_bounds_batch(neurons)
+        firings = [i for i, n in enumerate(neurons) if n.history.last_fired]
         if len(firings) >= 3:
             watcher.log_event(
                 f"Detected rapid firing in Neurons {', '.join(str(i+1) for i in firings)}. Issuing notifications.",
@@ -57,17 +58,11 @@ def scenario_patternwatcher_multi_neuron():
         f"Lessons learned—future configs should {', '.join(lessons) if lessons else 'maintain current parameter ranges.'}",
         event_type="lesson_learned"
     )
-    # Build combined log
-    if LOG_MODE == 'concise':
-        log_content = watcher.export_concise_log()
-        for n in neurons:
-            log_content += "\n\n" + n.export_concise_log()
-    else:
-        log_content = "\n".join(watcher.log)
-        for n in neurons:
-            log_content += "\n\n" + n.markdown_log()
-    with open("logs/experiment1/scenario_patternwatcher_multi_neuron.md", "w") as f:
-        f.write(log_content)
+    watcher.save()
+    # Stream the combined log: watcher narrative, then one fold per neuron
+    with LogExporter(os.path.join(LOG_DIR, "scenario_patternwatcher_multi_neuron.md"), LOG_MODE) as exporter:
+        exporter.write_watcher(watcher)
+        exporter.write_neurons(neurons)
     print("[PatternWatcher Multi-Neuron] Scenario Summary:")
     print("  9 neurons, random events, PatternWatcher boundary/pattern monitoring, learning log, lessons learned.")
     print("  Review scenario_patternwatcher_multi_neuron.md for full narrative logs.")
@@ -76,10 +71,34 @@ def scenario_patternwatcher_multi_neuron():
 Scenario Runner: Modular narrative neuron testing and log output.
 """
 import os
+import zlib
+import numpy as np
 from neuron import Neuron
+from log_export import LogExporter
+from pattern_store import open_store, close_store
+from utils import seed_ids
 from config import DEFAULT_THRESHOLD, DEFAULT_REFRACTORY_OFFSET, DEFAULT_REFRACTORY_EVENTS, DEFAULT_DECAY_FACTOR, DEFAULT_WEIGHTS
 
 LOG_DIR = "logs/experiment1"
+PATTERN_DB = None  # PatternStore file for scenarios that learn across runs; None gives each run a fresh one in LOG_DIR (git-ignored)
+
+def pattern_db_path():
+    """Where learning scenarios keep their PatternStore in this run."""
+    return PATTERN_DB or os.path.join(LOG_DIR, "pattern_db.sqlite3")
+
+def open_scenario_store():
+    """
+    The PatternStore a learning scenario writes to. Without PATTERN_DB it starts empty on every
+    run, so learning history and trust from an earlier run cannot carry over into this one.
+    """
+    path = pattern_db_path()
+    if not PATTERN_DB:
+        close_store(path)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return open_store(path)
 
 def save_log(filename, neuron):
     os.makedirs(LOG_DIR, exist_ok=True)
@@ -95,7 +114,7 @@ def scenario_constant_low_input():
     save_log("scenario_constant_low_input.md", neuron)
     print("[Constant Low Input] Summary:")
     print("  Inputs below threshold; no firing expected.")
-    print("  Recent firings:", [t for t, _, fired in neuron.history if fired])
+    print("  Recent firings:", neuron.history.firing_ticks())
 
 # --- Scenario 2: Threshold Crossing ---
 def scenario_threshold_crossing():
@@ -175,13 +194,9 @@ def scenario_threshold_crossing():
         event_type="lesson_learned"
     )
     # Export logs
-    if LOG_MODE == 'concise':
-        log_content = watcher.export_concise_log() + "\n\n" + neuron.export_concise_log()
-    else:
-        log_content = "\n".join(watcher.log) + "\n\n" + neuron.markdown_log()
-    os.makedirs(LOG_DIR, exist_ok=True)
-    with open(os.path.join(LOG_DIR, "scenario_threshold_crossing.md"), "w") as f:
-        f.write(log_content)
+    with LogExporter(os.path.join(LOG_DIR, "scenario_threshold_crossing.md"), LOG_MODE) as exporter:
+        exporter.write_watcher(watcher)
+        exporter.write_neuron(neuron)
     print("[Threshold Crossing] Expanded Summary:")
     print("  Edge cases, adaptation, PatternWatcher notifications, recovery narration.")
     print("  Review scenario_threshold_crossing.md for full narrative logs.")
@@ -194,8 +209,7 @@ def scenario_rapid_repeated_firing():
         neuron.receive_input(HIGH_INPUT_VALUE, source=f"high_input_{i}")
     neuron.notify_pattern("Rapid repeated firing detected")
     # Introspective self-reflection and adaptation
-    firings = [t for t, _, fired in neuron.history if fired]
-    if len(firings) >= 3:
+    if neuron.history.fire_count >= 3:
         neuron.log_event(f"Neuron {neuron.id}: After monitoring, I have decided to increase my threshold to prevent over-excitation.")
         old_threshold = neuron.threshold
         neuron.threshold = min(neuron.threshold + 0.2, 2.0)
@@ -207,7 +221,7 @@ def scenario_rapid_repeated_firing():
     save_log("scenario_rapid_repeated_firing.md", neuron)
     print("[Rapid Repeated Firing] Summary:")
     print("  High-value inputs induce repeated firing and adaptation.")
-    print("  Recent firings:", [t for t, _, fired in neuron.history if fired])
+    print("  Recent firings:", neuron.history.firing_ticks())
 
 # --- Scenario 4: Sleep/Wake Stress Test ---
 def scenario_sleep_wake_stress():
@@ -254,7 +268,7 @@ def scenario_sleep_wake_stress():
     save_log("scenario_sleep_wake_stress.md", neuron)
     print("[Sleep/Wake Stress Test] Summary:")
     print(f"  Inputs during sleep ignored; firing resumes after wake. Barrage of {len(event_types)} events triggers stress and adaptation.")
-    print("  Recent firings:", [t for t, _, fired in neuron.history if fired])
+    print("  Recent firings:", neuron.history.firing_ticks())
 
 # --- Scenario 5: Pattern Notification Mock ---
 def scenario_pattern_notification():
@@ -327,6 +341,7 @@ def scenario_pattern_notification():
 
     # Save combined log
     log_content = neuronA.markdown_log() + "\n\n" + neuronB.markdown_log()
+    log_content += "\n\n## NeuronPatternInterface\n" + "\n".join(interface.get_log())
     with open(os.path.join(LOG_DIR, "scenario_pattern_notification.md"), "w") as f:
         f.write(log_content)
     print("[PatternWatcher–Neuron Enhanced] Scenario Summary:")
@@ -343,6 +358,7 @@ def scenario_feedback_variation():
     """
     Enhanced feedback variation scenario: passive decay, refractory normalization, feedback source narration, introspective commentary.
     """
+    # No clock: the cycles are stepped by hand, refractory normalization included, as this scenario has always done
     neuron = Neuron(threshold=DEFAULT_THRESHOLD, refractory_offset=DEFAULT_REFRACTORY_OFFSET, refractory_events=DEFAULT_REFRACTORY_EVENTS, decay_factor=DEFAULT_DECAY_FACTOR, weights=DEFAULT_WEIGHTS)
     FEEDBACK_INPUTS = [DEFAULT_THRESHOLD * 1.2, None, DEFAULT_THRESHOLD * 1.1, None, DEFAULT_THRESHOLD * 1.3, None, DEFAULT_THRESHOLD * 1.4, None, DEFAULT_THRESHOLD * 1.2]
     inputs = FEEDBACK_INPUTS
@@ -371,7 +387,8 @@ def scenario_feedback_variation():
         # B. Feedback Events Frequency
         feedback = None
         source = None
-        if neuron.history and neuron.history[-1][2]:
+        # Only a cycle with input can fire; an idle cycle would otherwise count the last firing again
+        if val is not None and neuron.history.last_fired:
             firings += 1
             current = neuron.threshold
             if feedback_idx < len(feedback_sequence):
@@ -395,28 +412,39 @@ def scenario_feedback_variation():
     print(f"  Number of firings: {firings}")
     print(f"  Adaptation sequence: {feedback_sequence}")
 
-def run_all_scenarios():
-    print("Running Neuron Scenario Suite...")
-    scenario_constant_low_input()
-    scenario_threshold_crossing()
-    scenario_rapid_repeated_firing()
-    scenario_sleep_wake_stress()
-    scenario_pattern_notification()
-    scenario_feedback_variation()
-    scenario_patternwatcher_multi_neuron()
-    print("All scenarios complete. Review logs in logs/experiment1/.")
+# Every scenario by name, in the order run_all_scenarios() tells them
+SCENARIOS = {
+    "constant_low_input": scenario_constant_low_input,
+    "threshold_crossing": scenario_threshold_crossing,
+    "rapid_repeated_firing": scenario_rapid_repeated_firing,
+    "sleep_wake_stress": scenario_sleep_wake_stress,
+    "pattern_notification": scenario_pattern_notification,
+    "feedback_variation": scenario_feedback_variation,
+    "patternwatcher_multi_neuron": scenario_patternwatcher_multi_neuron,
+}
+
 
+def scenario_seed(name, seed=0):
+    """The seed scenario `name` runs with in variant `seed`; stable across processes and runs."""
+    return zlib.crc32(f"{name}:{seed}".encode())
 
-def run_all_scenarios():
+
+def seed_scenario(name, seed=0):
+    """Seed `random`, NumPy and new_id() so scenario `name` (variant `seed`) draws the same numbers and ids every run."""
+    value = scenario_seed(name, seed)
+    random.seed(value)
+    np.random.seed(value)
+    seed_ids(value)
+    return value
+
+
+def run_all_scenarios(seed=0):
     print("Running Neuron Scenario Suite...")
-    scenario_constant_low_input()
-    scenario_threshold_crossing()
-    scenario_rapid_repeated_firing()
-    scenario_sleep_wake_stress()
-    scenario_pattern_notification()
-    scenario_feedback_variation()
-    print("All scenarios complete. Review logs in logs/experiment1/.")
+    os.makedirs(LOG_DIR, exist_ok=True)
+    for name, scenario in SCENARIOS.items():
+        seed_scenario(name, seed)
+        scenario()
+    print(f"All scenarios complete. Review logs in {LOG_DIR}/.")
 
 if __name__ == "__main__":
     run_all_scenarios()
-    scenario_patternwatcher_multi_neuron()
@@ -0,0 +1,172 @@
+"""
+Metrics: Optional counters and timers for the hot paths, polled with metrics_snapshot().
+
+Instrumentation is installed by enable() and removed by disable(). While it is off the
+instrumented methods are the plain, unwrapped originals, so it costs nothing at all; while it
+is on every instrumented call adds one timer read on entry and one on exit.
+
+Counters:
+- neuron.inputs, neuron.fires, neuron.refractory_entries, neuron.boundary_notifications
+- log.records: narration records handed to a sink by neurons and watchers
+- log.bytes: narrative text rendered by streaming sinks and written by LogExporter
+- interface.adoption_updates, dispatcher.events, population.steps, population.fires
+
+Timers are cumulative wall time and call count per method. They are inclusive: the time of
+Neuron.receive_input also contains the Neuron.decide_to_fire it calls.
+"""
+import functools
+import time
+import numpy as np
+from dispatcher import Dispatcher
+from log_export import LogExporter
+from neuron import Neuron
+from neuron_pattern_interface import NeuronPatternInterface
+from pattern_watcher import PatternWatcher
+from population import NeuronPopulation
+
+COUNTERS = (
+    "neuron.inputs", "neuron.fires", "neuron.refractory_entries", "neuron.boundary_notifications",
+    "log.records", "log.bytes", "interface.adoption_updates", "dispatcher.events",
+    "population.steps", "population.fires",
+)
+
+_counters = dict.fromkeys(COUNTERS, 0)
+_timers = {}  # "Class.method" -> [calls, seconds]
+_originals = {}  # (class, method name) -> the function enable() replaced
+_since = time.perf_counter()
+
+
+def _timed(cls, name, after=None):
+    """Wrap cls.name to time every call; `after(result, args)` may update counters."""
+    method = cls.__dict__[name]
+    totals = _timers.setdefault(f"{cls.__name__}.{name}", [0, 0.0])
+    perf_counter = time.perf_counter
+
+    @functools.wraps(method)
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            totals[0] += 1
+            totals[1] += perf_counter() - start
+        if after is not None:
+            after(result, args)
+        return result
+    return timed
+
+
+def _counted(cls, name, counter, amount=None):
+    """Wrap cls.name to add one (or `amount(result, args)`) to `counter` per call, untimed."""
+    method = cls.__dict__[name]
+
+    @functools.wraps(method)
+    def counted(*args, **kwargs):
+        result = method(*args, **kwargs)
+        _counters[counter] += 1 if amount is None else amount(result, args)
+        return result
+    return counted
+
+
+def _exported(name):
+    """Wrap LogExporter.name to time it and add the text it wrote to log.bytes."""
+    method = LogExporter.__dict__[name]
+    totals = _timers.setdefault(f"LogExporter.{name}", [0, 0.0])
+    perf_counter = time.perf_counter
+
+    @functools.wraps(method)
+    def exported(exporter, owner):
+        start = perf_counter()
+        position = exporter._file.tell()
+        method(exporter, owner)
+        _counters["log.bytes"] += exporter._file.tell() - position
+        totals[0] += 1
+        totals[1] += perf_counter() - start
+    return exported
+
+
+def _count(counter, amount=None):
+    def after(result, args):
+        _counters[counter] += 1 if amount is None else amount(result, args)
+    return after
+
+
+def _decided(result, args):
+    # The entry decide_to_fire just appended fired exactly when the quiet streak is back to zero
+    if args[0]._history.quiet_streak == 0:
+        _counters["neuron.fires"] += 1
+
+
+def _stepped(fired, args):
+    _counters["population.steps"] += 1
+    _counters["population.fires"] += int(np.count_nonzero(fired))
+
+
+def _line_bytes(line, args):
+    return len(line) + 1  # plus the newline the sink adds
+
+
+def _instrumentation():
+    """(class, method name, wrapper) for everything enable() installs."""
+    return (
+        (Neuron, "receive_input", _timed(Neuron, "receive_input", _count("neuron.inputs"))),
+        (Neuron, "decide_to_fire", _timed(Neuron, "decide_to_fire", _decided)),
+        (Neuron, "catch_up", _timed(Neuron, "catch_up")),
+        (Neuron, "enter_refractory", _counted(Neuron, "enter_refractory", "neuron.refractory_entries")),
+        (Neuron, "receive_boundary_notification", _counted(Neuron, "receive_boundary_notification", "neuron.boundary_notifications")),
+        (Neuron, "_record", _counted(Neuron, "_record", "log.records")),
+        (Neuron, "render_line", _counted(Neuron, "render_line", "log.bytes", _line_bytes)),
+        (PatternWatcher, "_record", _counted(PatternWatcher, "_record", "log.records")),
+        (PatternWatcher, "render_line", _counted(PatternWatcher, "render_line", "log.bytes", _line_bytes)),
+        (PatternWatcher, "monitor_neurons", _timed(PatternWatcher, "monitor_neurons")),
+        (PatternWatcher, "monitor_bounds", _timed(PatternWatcher, "monitor_bounds")),
+        (PatternWatcher, "monitor_bounds_batch", _timed(PatternWatcher, "monitor_bounds_batch")),
+        (NeuronPatternInterface, "update_adoption", _timed(NeuronPatternInterface, "update_adoption", _count("interface.adoption_updates"))),
+        (Dispatcher, "deliver_batch", _timed(Dispatcher, "deliver_batch", _count("dispatcher.events", lambda result, args: len(args[1])))),
+        (NeuronPopulation, "step", _timed(NeuronPopulation, "step", _stepped)),
+        (LogExporter, "write_neuron", _exported("write_neuron")),
+        (LogExporter, "write_watcher", _exported("write_watcher")),
+    )
+
+
+def enabled():
+    return bool(_originals)
+
+
+def enable():
+    """Install the counters and timers (no-op if they already are)."""
+    if _originals:
+        return
+    for cls, name, wrapper in _instrumentation():
+        _originals[(cls, name)] = cls.__dict__[name]
+        setattr(cls, name, wrapper)
+
+
+def disable():
+    """Put the uninstrumented methods back. Counts gathered so far are kept until reset()."""
+    for (cls, name), method in _originals.items():
+        setattr(cls, name, method)
+    _originals.clear()
+
+
+def reset():
+    global _since
+    for counter in _counters:
+        _counters[counter] = 0
+    for totals in _timers.values():
+        totals[0] = 0
+        totals[1] = 0.0
+    _since = time.perf_counter()
+
+
+def metrics_snapshot():
+    """
+    Current counters and timers as plain data, cheap enough to poll: a copy of a few dozen
+    numbers, without touching any neuron.
+    """
+    return {
+        "enabled": enabled(),
+        "elapsed": time.perf_counter() - _since,
+        "counters": dict(_counters),
+        "timers": {name: {"calls": calls, "seconds": seconds} for name, (calls, seconds) in _timers.items() if calls},
+    }
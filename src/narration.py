@@ -0,0 +1,129 @@
+"""
+Narration: Compact structured event records, rendered into narrative sentences only on export.
+
+A record is a plain tuple (stamp, event_type, template, args, extra, subject):
+- stamp: the simulation tick the event happened in (turned into a time of day only when rendered)
+- event_type: optional label such as "fire" or "boundary_notification"
+- template: key into TEMPLATES, or None when args is already a finished message
+- args: positional values for the template
+- extra: optional context dict supplied by the caller
+- subject: optional neuron id the event is about (used by PatternWatcher)
+"""
+import time
+
+
+def _firing_history(firings):
+    return f"Here is my recent firing history: {firings if firings else 'No recent firings.'}"
+
+
+def _trust_change(neuron_id, old_score, new_score, context=None):
+    explanation = f"Neuron {neuron_id}: My trust score for PatternWatcher has changed from {old_score:.2f} to {new_score:.2f}."
+    if context:
+        explanation += f" Reason: {context}"
+    return explanation
+
+
+# template id -> sentence (str.format with positional args) or callable(*args) -> sentence
+TEMPLATES = {
+    # Neuron lifecycle
+    "birth": "I am born as Neuron {0} for task: '{1}' with baseline threshold {2}, refractory offset {3}, decay factor {4}, and weights {5}.",
+    "sleep": "I am going to sleep and will ignore events until woken.",
+    "wake": "I am now awake and ready to receive events.",
+    "asleep_ignore": "I am currently asleep and will ignore incoming events until activated. (Task: {0})",
+    # Neuron input handling and firing
+    "input": "Received input {0} of type '{1}' from {2} for task '{3}'.",
+    "potential": "My membrane potential has decayed from {0} to {1} after receiving input.",
+    "threshold": "My threshold is currently {0}.",
+    "passive_decay": "No input received this cycle; my membrane potential has decayed from {0} to {1}.",
+    "passive_decay_span": "No input received for {0} cycles; my membrane potential has decayed from {1} to {2}.",
+    "fire": "I decided to fire because my membrane potential ({0}) exceeded my threshold ({1}) for task '{2}'.",
+    "reset": "Resetting membrane potential from {0} to baseline ({1}) after firing.",
+    "no_fire": "I did not fire because my membrane potential ({0}) did not meet my threshold ({1}).",
+    "frustrated": "I am frustrated by not firing recently. Lowering threshold from {0} to {1}.",
+    "history": _firing_history,
+    "refractory_enter": "Entering refractory period; raising threshold to {0} after firing.",
+    "refractory_end": "My refractory period has ended, returning threshold from {0} to baseline {1}.",
+    # Neuron boundary handling and adaptation
+    "boundary_received": "I received a boundary notification from PatternWatcher. {0}={1} is outside safe range ({2}-{3}).",
+    "boundary_threshold": "I am reducing my threshold from {0} to {1} to return to safe operating range.",
+    "boundary_refractory_offset": "I am adjusting my refractory offset from {0} to {1} for safety.",
+    "boundary_decay_factor": "I am adjusting my decay factor from {0} to {1} for safety.",
+    "boundary_membrane_potential": "I am resetting my membrane potential from {0} to {1} for safety.",
+    "boundary_recovered": "Recovery complete. Lesson learned: returning to baseline {0} of {1} maintains stability after stress.",
+    "adapt_refractory": "Neuron {0}: Updated refractory offset from {1} to {2} as advised by PatternWatcher.",
+    "adapt_decay": "Neuron {0}: Updated decay factor from {1} to {2} as advised by PatternWatcher.",
+    "adapt_dampening": "Neuron {0}: Network-wide dampening applied. Increased threshold from {1} to {2}.",
+    # Neuron pattern dialogue
+    "notify_pattern": "PatternWatcher has notified me about a recurring pattern: {0}. I will monitor this closely.",
+    "pattern_notified": "Neuron {0}: Received pattern notification '{1}' from interface. Monitoring for now.",
+    "open_to_input": "Neuron {0}: I remain open to future PatternWatcher input, even after graduation.",
+    "pattern_already_known": "Neuron {0}: Already recognize pattern '{1}' independently. No longer rely on PatternWatcher, but remain open to input.",
+    "pattern_adopted": "Neuron {0}: PatternWatcher's suggestions have proven useful. I have adopted pattern '{1}' and updated my recognition.",
+    "pattern_challenged": "Neuron {0}: I am challenging PatternWatcher's directive regarding '{1}' and will log my experience.",
+    "pattern_unconvinced": "Neuron {0}: Despite repeated suggestions, I remain unconvinced about '{1}'.",
+    "pattern_revised": "Neuron {0}: Following a misfire with {1}, I am revising my recognition criteria and trust in my own judgment.",
+    "pattern_graduated": "Neuron {0}: After repeated encounters, I now recognize '{1}' independently and have graduated from the interface, but remain open to input.",
+    "pattern_shared": "Neuron {0}: Sharing my experience with {1} to help Neuron {2}.",
+    "pattern_mentored": "Neuron {0}: Received mentoring from Neuron {1} regarding {2}.",
+    # NeuronPatternInterface
+    "interface_registered": "NeuronPatternInterface: Registered pattern '{0}' from PatternWatcher.",
+    "interface_notifying": "NeuronPatternInterface: Notifying Neuron {0} about pattern '{1}'.",
+    "adoption_status": "NeuronPatternInterface: Neuron {0} adoption status for '{1}' is now '{2}'.",
+    "adoption_revised": "NeuronPatternInterface: Neuron {0} has revised their recognition of {1}.",
+    "adoption_revisions": "NeuronPatternInterface: Multiple neurons ({0}) have revised {1}. Notifying PatternWatcher.",
+    "interface_mentored": "NeuronPatternInterface: Neuron {0} mentored Neuron {1} on {2}. Trust boosted.",
+    # PatternWatcher
+    "rapid_firing": "PatternWatcher: Persistent rapid firing detected in {0} neurons. Recommending increased refractory offset and decay factor.",
+    "network_dampening": "PatternWatcher: Multiple neurons exhibiting rapid firing. Triggering network-wide dampening.",
+    "neuron_refractory_updated": "PatternWatcher: Neuron {0} updated refractory offset to {1}.",
+    "neuron_decay_updated": "PatternWatcher: Neuron {0} updated decay factor to {1}.",
+    "bounds_approaching": "Threshold for Neuron {0} is approaching unsafe {1} limit ({2}: {3}, safe range: {4}-{5}). Notifying neuron.",
+    "learning": "PatternWatcher Learning Log: {0}",
+    "pattern_discovered": "PatternWatcher has discovered recurring pattern '{0}'. Registering with NeuronPatternInterface.",
+    "pattern_recommended": "PatternWatcher recommends pattern '{0}' to Neuron {1}.",
+    "confidence_up": "PatternWatcher: Increased confidence in pattern '{0}' due to positive neuron feedback.",
+    "confidence_down": "PatternWatcher: Decreased confidence in pattern '{0}' due to skepticism from neuron.",
+    "trust_changed": _trust_change,
+    "skepticism_noted": "PatternWatcher: Noted skepticism from Neuron {0}. Will review my classification of relevant patterns.",
+    "independent_adaptation": "PatternWatcher: Neuron {0} adapted independently. Considering updating global pattern criteria.",
+    "revision_alert": "PatternWatcher: Alert—multiple neurons have revised {0}. Global review triggered.",
+}
+
+
+class NarrativeLog(list):
+    """
+    The rendered lines an owner's `log` property returns, a copy made on every read. Appending
+    to this list also records the line with its owner (as log_event() does), so it shows up in
+    every later read and export.
+    """
+    __slots__ = ("_owner",)
+
+    def __init__(self, lines, owner):
+        super().__init__(lines)
+        self._owner = owner
+
+    def append(self, line):
+        super().append(line)
+        self._owner.log_event(line)
+
+    def extend(self, lines):
+        for line in lines:
+            self.append(line)
+
+
+def render_message(record):
+    """Turn a record's template and args into the narrative sentence."""
+    template, args = record[2], record[3]
+    if template is None:
+        return args
+    sentence = TEMPLATES[template]
+    if callable(sentence):
+        return sentence(*args)
+    return sentence.format(*args)
+
+
+def format_stamp(stamp, clock=None):
+    """The tick, preceded by the time of day it began when the SimulationClock that counted it is known."""
+    if clock is None:
+        return f"tick {stamp}"
+    return f"{time.strftime('%H:%M:%S', time.localtime(clock.wall_time(stamp)))} tick {stamp}"
@@ -2,8 +2,13 @@
 """
 Neuron class: Narrative-driven, event-driven, explainable, self-reflective.
 """
-import datetime
-import uuid
+import sys
+import log_config
+from narration import NarrativeLog, render_message, format_stamp
+from firing_history import FiringHistory
+from utils import new_id
+from patternwatcher_config import PATTERNWATCHER_MEMORY_WINDOW
+from log_sinks import resolve_sink
 from config import (
     DEFAULT_THRESHOLD, DEFAULT_REFRACTORY_OFFSET, DEFAULT_REFRACTORY_EVENTS, DEFAULT_DECAY_FACTOR,
     DEFAULT_PASSIVE_DECAY_LOG_THRESHOLD, DEFAULT_WEIGHTS, DEFAULT_TRUST_SCORE,
@@ -14,25 +19,55 @@ from config import (
 
 
 
+class _CaughtUp:
+    """Neuron attribute stored in `slot` that catches up on the ticks finished since it was last current."""
+    __slots__ = ("slot",)
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __get__(self, neuron, owner=None):
+        if neuron is None:
+            return self
+        if neuron._clock is not None and neuron._clock.now - 1 > neuron._updated_at:
+            neuron.catch_up()
+        return getattr(neuron, self.slot)
+
+    def __set__(self, neuron, value):
+        if neuron._clock is not None and neuron._clock.now - 1 > neuron._updated_at:
+            neuron.catch_up()
+        setattr(neuron, self.slot, value)
+
+
 class Neuron:
+    # Slotted and lazily furnished so that millions of idle neurons stay small: containers that
+    # only some neurons ever need (history, listeners, pattern sets, the uuid) appear on first use.
+    __slots__ = (
+        "_id", "baseline_threshold", "_threshold", "refractory_offset", "refractory_events",
+        "_refractory_counter", "_in_refractory", "weights", "_potential", "baseline_potential",
+        "decay_factor", "_history", "tick", "_clock", "_updated_at", "_at", "asleep", "log_mode", "log_sink", "_narrating", "_rendered",
+        "history_length", "passive_decay_log_threshold", "last_input_received", "interface",
+        "_fire_listeners", "_patterns_monitored", "_patterns_adopted", "trust_score", "task_context",
+    )
+
     def receive_boundary_notification(self, param, value, safe_min, safe_max, watcher=None):
-        self.log_event(f"I received a boundary notification from PatternWatcher. {param}={value} is outside safe range ({safe_min}-{safe_max}).")
+        self.narrate("boundary_received", param, value, safe_min, safe_max)
         # Adaptive response: bring parameter back to safe range
         old_value = value
         if param == "threshold":
             self.threshold = min(max(self.threshold, safe_min), safe_max)
-            self.log_event(f"I am reducing my threshold from {old_value} to {self.threshold} to return to safe operating range.")
+            self.narrate("boundary_threshold", old_value, self.threshold)
         elif param == "refractory_offset":
             self.refractory_offset = min(max(self.refractory_offset, safe_min), safe_max)
-            self.log_event(f"I am adjusting my refractory offset from {old_value} to {self.refractory_offset} for safety.")
+            self.narrate("boundary_refractory_offset", old_value, self.refractory_offset)
         elif param == "decay_factor":
             self.decay_factor = min(max(self.decay_factor, safe_min), safe_max)
-            self.log_event(f"I am adjusting my decay factor from {old_value} to {self.decay_factor} for safety.")
+            self.narrate("boundary_decay_factor", old_value, self.decay_factor)
         elif param == "membrane_potential":
             self.potential = min(max(self.potential, safe_min), safe_max)
-            self.log_event(f"I am resetting my membrane potential from {old_value} to {self.potential} for safety.")
+            self.narrate("boundary_membrane_potential", old_value, self.potential)
         # Recovery narration and lessons learned
-        self.log_event(f"Recovery complete. Lesson learned: returning to baseline {param} of {getattr(self, param)} maintains stability after stress.")
+        self.narrate("boundary_recovered", param, getattr(self, param))
         if watcher:
             watcher.log_learning(f"Logged successful intervention for Neuron {self.id} on {param}. Updated recognition patterns for future events.")
     def adapt_parameters(self, refractory_offset_increase=False, decay_factor_decrease=False, network_dampening=False, watcher=None):
@@ -40,68 +75,165 @@ class Neuron:
         if refractory_offset_increase:
             old_offset = self.refractory_offset
             self.refractory_offset = min(1.0, self.refractory_offset + 0.2)
-            self.log_event(f"Neuron {self.id}: Updated refractory offset from {old_offset} to {self.refractory_offset} as advised by PatternWatcher.")
+            self.narrate("adapt_refractory", self.id, old_offset, self.refractory_offset)
             if watcher:
-                watcher.log_event(f"PatternWatcher: Neuron {self.id} updated refractory offset to {self.refractory_offset}.")
+                watcher.narrate("neuron_refractory_updated", self.id, self.refractory_offset)
         if decay_factor_decrease:
             old_decay = self.decay_factor
             self.decay_factor = max(0.5, self.decay_factor - 0.1)
-            self.log_event(f"Neuron {self.id}: Updated decay factor from {old_decay} to {self.decay_factor} as advised by PatternWatcher.")
+            self.narrate("adapt_decay", self.id, old_decay, self.decay_factor)
             if watcher:
-                watcher.log_event(f"PatternWatcher: Neuron {self.id} updated decay factor to {self.decay_factor}.")
+                watcher.narrate("neuron_decay_updated", self.id, self.decay_factor)
         if network_dampening:
             old_threshold = self.threshold
             self.threshold = min(self.threshold + 0.2, 2.0)
-            self.log_event(f"Neuron {self.id}: Network-wide dampening applied. Increased threshold from {old_threshold} to {self.threshold}.")
-    def __init__(self, neuron_id=None, threshold=DEFAULT_THRESHOLD, weights=None, history_length=5, refractory_offset=DEFAULT_REFRACTORY_OFFSET, refractory_events=DEFAULT_REFRACTORY_EVENTS, decay_factor=DEFAULT_DECAY_FACTOR, passive_decay_log_threshold=DEFAULT_PASSIVE_DECAY_LOG_THRESHOLD, interface=None, task_context="Generic Task"):
-        self.id = neuron_id or str(uuid.uuid4())
+            self.narrate("adapt_dampening", self.id, old_threshold, self.threshold)
+    def __init__(self, neuron_id=None, threshold=DEFAULT_THRESHOLD, weights=None, history_length=5, refractory_offset=DEFAULT_REFRACTORY_OFFSET, refractory_events=DEFAULT_REFRACTORY_EVENTS, decay_factor=DEFAULT_DECAY_FACTOR, passive_decay_log_threshold=DEFAULT_PASSIVE_DECAY_LOG_THRESHOLD, interface=None, task_context="Generic Task", log_sink=None, clock=None):
+        self._id = neuron_id  # a uuid is only minted if someone asks for it
         self.baseline_threshold = threshold
-        self.threshold = threshold
+        self._threshold = threshold
         self.refractory_offset = refractory_offset
         self.refractory_events = refractory_events
-        self.refractory_counter = 0
-        self.in_refractory = False
-        self.weights = weights or DEFAULT_WEIGHTS
-        self.potential = 0.0
+        self._refractory_counter = 0
+        self._in_refractory = False
+        self.weights = list(weights or DEFAULT_WEIGHTS)  # own copy, so changing it changes only this neuron
+        self._potential = 0.0
         self.baseline_potential = 0.0
         self.decay_factor = decay_factor
-        self.history = []  # List of (timestamp, input, fired, input_event)
+        self._history = None  # FiringHistory, allocated with the first input
+        self.tick = 0  # Inputs processed so far; serves as this neuron's clock for history entries
+        # With a shared SimulationClock, decay and refractory expiry are applied lazily, on the next
+        # input or read, for all the ticks finished since _updated_at, so idle neurons cost nothing per tick
+        self._clock = clock
+        self._updated_at = clock.now - 1 if clock is not None else 0  # last tick fully accounted for
+        self._at = None  # tick of the batched input being handled, which may be ahead of the clock
         self.asleep = False
-        self.log = []
+        # Narration settings are resolved once here, not per event
+        self.log_mode = log_config.LOG_MODE
+        self.log_sink = resolve_sink(log_sink)
+        self._narrating = self.log_sink.enabled
+        self._rendered = None  # see _log_lines()
         self.history_length = history_length
         self.passive_decay_log_threshold = passive_decay_log_threshold
         self.last_input_received = False
         self.interface = interface
-        self.patterns_monitored = set()
-        self.patterns_adopted = set()
+        self._fire_listeners = None  # callables(neuron) notified whenever this neuron fires
+        self._patterns_monitored = None
+        self._patterns_adopted = None
         self.trust_score = DEFAULT_TRUST_SCORE
-        self.task_context = task_context
-        self.log_event(f"I am born as Neuron {self.id} for task: '{self.task_context}' with baseline threshold {self.baseline_threshold}, refractory offset {self.refractory_offset}, decay factor {self.decay_factor}, and weights {self.weights}.", event_type="birth", extra={"task_context": self.task_context})
+        self.task_context = sys.intern(task_context)  # thousands of neurons share a handful of contexts
+        if self._narrating:
+            self.narrate("birth", self.id, self.task_context, self.baseline_threshold, self.refractory_offset, self.decay_factor, list(self.weights), event_type="birth")
+
+    @property
+    def id(self):
+        if self._id is None:
+            self._id = new_id()
+        return self._id
+
+    @id.setter
+    def id(self, value):
+        self._id = value
+
+    @property
+    def history(self):
+        """Bounded ring buffer of (tick, input, fired); long enough for both adapt() and PatternWatcher's window."""
+        if self._history is None:
+            self._history = FiringHistory(max(self.history_length, PATTERNWATCHER_MEMORY_WINDOW))
+        return self._history
+
+    # Time-dependent state: with a clock, reading or writing it first catches up on the ticks missed.
+    # A tick counts as finished once the clock has moved past it; the current one may still bring input.
+    potential = _CaughtUp("_potential")
+    threshold = _CaughtUp("_threshold")
+    in_refractory = _CaughtUp("_in_refractory")
+    refractory_counter = _CaughtUp("_refractory_counter")
+
+    @property
+    def clock(self):
+        return self._clock
+
+    @property
+    def now(self):
+        """The tick this neuron is at: its clock's, or a batched input's own; without a clock, its input count."""
+        if self._at is not None:
+            return self._at
+        return self._clock.now if self._clock is not None else self.tick
+
+    @clock.setter
+    def clock(self, clock):
+        # Joining a clock starts the neuron afresh at its current tick; ticks before it never happened here
+        self._clock = clock
+        self._updated_at = clock.now - 1 if clock is not None else 0
+
+    def catch_up(self, now=None):
+        """
+        Apply what the finished ticks without input did to this neuron: `decay_factor ** elapsed`
+        to the membrane potential and `elapsed` ticks of refractory countdown, narrated as one
+        summary. Asleep neurons neither decay nor count down, as with passive_decay().
+        Ticks before `now` (by default the clock's) count as finished; none is ever settled twice.
+        """
+        finished = (self._clock.now if now is None else now) - 1
+        elapsed = finished - self._updated_at
+        if elapsed <= 0:
+            return
+        self._updated_at = finished
+        if self.asleep:
+            return
+        old_potential = self._potential
+        self._potential = old_potential * self.decay_factor ** elapsed
+        if self._narrating and abs(self._potential - old_potential) > self.passive_decay_log_threshold:
+            if elapsed == 1:
+                self.narrate("passive_decay", old_potential, self._potential)
+            else:
+                self.narrate("passive_decay_span", elapsed, old_potential, self._potential)
+        if self._in_refractory:
+            # Count down all but the last missed tick at once; update_refractory() takes the last
+            self._refractory_counter = min(self._refractory_counter + elapsed - 1, self.refractory_events - 1)
+            self.update_refractory()
+
+    @property
+    def fire_listeners(self):
+        if self._fire_listeners is None:
+            self._fire_listeners = []
+        return self._fire_listeners
+
+    @property
+    def patterns_monitored(self):
+        if self._patterns_monitored is None:
+            self._patterns_monitored = set()
+        return self._patterns_monitored
+
+    @property
+    def patterns_adopted(self):
+        if self._patterns_adopted is None:
+            self._patterns_adopted = set()
+        return self._patterns_adopted
 
     def receive_pattern_notification(self, pattern, interface):
-        self.log_event(f"Neuron {self.id}: Received pattern notification '{pattern}' from interface. Monitoring for now.")
+        self.narrate("pattern_notified", self.id, pattern)
         self.patterns_monitored.add(pattern)
         if interface:
             interface.update_adoption(self, pattern, "monitoring")
-        self.log_event(f"Neuron {self.id}: I remain open to future PatternWatcher input, even after graduation.")
+        self.narrate("open_to_input", self.id)
 
     def receive_pattern_recommendation(self, pattern, watcher):
         if pattern in self.patterns_adopted:
-            self.log_event(f"Neuron {self.id}: Already recognize pattern '{pattern}' independently. No longer rely on PatternWatcher, but remain open to input.")
+            self.narrate("pattern_already_known", self.id, pattern)
             return
         if self.trust_score > TRUST_ADOPT_THRESHOLD:
             self.patterns_adopted.add(pattern)
-            self.log_event(f"Neuron {self.id}: PatternWatcher's suggestions have proven useful. I have adopted pattern '{pattern}' and updated my recognition.")
+            self.narrate("pattern_adopted", self.id, pattern)
             watcher.update_trust(self, TRUST_INCREMENT, context="PatternWatcher’s recommendation led to successful adoption.")
             if self.interface:
                 self.interface.update_adoption(self, pattern, "adopted")
         elif self.trust_score < TRUST_CHALLENGE_THRESHOLD:
-            self.log_event(f"Neuron {self.id}: I am challenging PatternWatcher's directive regarding '{pattern}' and will log my experience.")
+            self.narrate("pattern_challenged", self.id, pattern)
             watcher.update_trust(self, -TRUST_DECREMENT, context="Neuron challenged PatternWatcher directive.")
             if self.interface:
                 self.interface.update_adoption(self, pattern, "challenging")
         else:
-            self.log_event(f"Neuron {self.id}: Despite repeated suggestions, I remain unconvinced about '{pattern}'.")
+            self.narrate("pattern_unconvinced", self.id, pattern)
             watcher.update_trust(self, -TRUST_DEBATE_DECREMENT, context="Neuron debated PatternWatcher recommendation.")
             if self.interface:
                 self.interface.update_adoption(self, pattern, "debating")
@@ -109,138 +241,232 @@ class Neuron:
     def encounter_pattern(self, pattern, negative=False):
         if pattern in self.patterns_monitored:
             if negative:
-                self.log_event(f"Neuron {self.id}: Following a misfire with {pattern}, I am revising my recognition criteria and trust in my own judgment.")
+                self.narrate("pattern_revised", self.id, pattern)
                 self.trust_score -= 0.1
                 if self.interface:
                     self.interface.update_adoption(self, pattern, "revised")
             else:
-                self.log_event(f"Neuron {self.id}: After repeated encounters, I now recognize '{pattern}' independently and have graduated from the interface, but remain open to input.")
+                self.narrate("pattern_graduated", self.id, pattern)
                 self.patterns_adopted.add(pattern)
                 if self.interface:
                     self.interface.update_adoption(self, pattern, "independent")
                 self.trust_score += 0.1
     def share_pattern(self, other_neuron, pattern):
         if pattern in self.patterns_adopted:
-            self.log_event(f"Neuron {self.id}: Sharing my experience with {pattern} to help Neuron {other_neuron.id}.")
+            self.narrate("pattern_shared", self.id, pattern, other_neuron.id)
             other_neuron.receive_pattern_notification(pattern, self.interface)
-            other_neuron.log_event(f"Neuron {other_neuron.id}: Received mentoring from Neuron {self.id} regarding {pattern}.")
+            other_neuron.narrate("pattern_mentored", other_neuron.id, self.id, pattern)
 
     def log_event(self, message, event_type=None, watcher=None, extra=None):
-        from log_config import LOG_MODE
-        import datetime
-        timestamp = datetime.datetime.now().strftime('%H:%M:%S')
-        if LOG_MODE == 'diagnostic':
-            entry = f"- [{timestamp}] "
-            if event_type:
-                entry += f"**{event_type}**: "
-            entry += message
-            self.log.append(entry)
-            print(entry)
-        else:
-            # Concise mode: group major events, collapse repeated recoveries
-            if event_type == 'birth':
-                self.log.append(f"- [{timestamp}] {message}")
-            elif event_type == 'boundary_notification' and extra:
-                if not hasattr(self, '_boundary_events'):
-                    self._boundary_events = []
-                self._boundary_events.append([
-                    timestamp,
+        # Free-form narration: the message is kept as-is, stamped with the current tick
+        if not self._narrating:
+            return
+        self._record((self.now, event_type, None, message, extra, None))
+
+    def narrate(self, template, *args, event_type=None, extra=None):
+        # Structured narration: keep the template id and raw values, build the sentence on export
+        if not self._narrating:
+            return
+        self._record((self.now, event_type, template, args, extra, None))
+
+    def _record(self, record):
+        self.log_sink.emit(record, self)
+
+    @property
+    def records(self):
+        """Narration records kept in memory by the log sink (empty when the sink keeps none)."""
+        return self.log_sink.records
+
+    def render_line(self, record):
+        # One line of text for streaming sinks (console, file)
+        if self.log_mode == 'diagnostic':
+            return self._render_diagnostic(record)
+        return f"- [{format_stamp(record[0], self._clock)}] {render_message(record)}"
+
+    def _render_diagnostic(self, record):
+        entry = f"- [{format_stamp(record[0], self._clock)}] "
+        if record[1]:
+            entry += f"**{record[1]}**: "
+        return entry + render_message(record)
+
+    def _group_concise(self):
+        # Concise mode: group major events, collapse repeated recoveries
+        boundary_events, recovery_events, lessons_learned, other = [], set(), [], []
+        for record in self.records:
+            stamp, event_type, _, _, extra, _ = record
+            if event_type == 'boundary_notification' and extra:
+                boundary_events.append([
+                    format_stamp(stamp, self._clock),
                     extra.get('param', ''),
                     extra.get('value', ''),
                     f"{extra.get('safe_min', '')}–{extra.get('safe_max', '')}",
                     extra.get('action', '')
                 ])
-            elif event_type == 'recovery':
-                if not hasattr(self, '_recovery_events'):
-                    self._recovery_events = set()
-                key = (extra.get('param', ''), extra.get('value', ''))
-                if key not in self._recovery_events:
-                    self._recovery_events.add(key)
-                    self.log.append(f"- [{timestamp}] {message}")
             elif event_type == 'lesson_learned':
-                if not hasattr(self, '_lessons_learned'):
-                    self._lessons_learned = []
-                self._lessons_learned.append(f"- {message}")
+                lessons_learned.append(f"- {render_message(record)}")
             else:
-                self.log.append(f"- [{timestamp}] {message}")
-            print(f"- [{timestamp}] {message}")
+                line = self._concise_line(record, recovery_events)
+                if line is not None:
+                    other.append(line)
+        return boundary_events, recovery_events, lessons_learned, other
+
+    def _concise_line(self, record, recoveries):
+        # A record's line among the concise "other" events; None if it is grouped elsewhere or a repeated recovery
+        stamp, event_type, _, _, extra, _ = record
+        if event_type == 'boundary_notification' and extra or event_type == 'lesson_learned':
+            return None
+        if event_type == 'recovery':
+            key = (extra.get('param', ''), extra.get('value', ''))
+            if key in recoveries:
+                return None
+            recoveries.add(key)
+        return f"- [{format_stamp(stamp, self._clock)}] {render_message(record)}"
+
+    def _log_lines(self):
+        # The lines `log` shows, each rendered once: a read only renders what was recorded since the last
+        records = self.records
+        rendered = self._rendered
+        if rendered is None or rendered[0] is not records or rendered[1] != self.log_mode or rendered[2] > len(records):
+            rendered = self._rendered = [records, self.log_mode, 0, [], set()]  # records, mode, count, lines, recoveries
+        _, mode, count, lines, recoveries = rendered
+        for record in records[count:]:
+            line = self._render_diagnostic(record) if mode == 'diagnostic' else self._concise_line(record, recoveries)
+            if line is not None:
+                lines.append(line)
+        rendered[2] = len(records)
+        return lines
+
+    def _grouped(self):
+        # In diagnostic mode nothing is grouped: every event is an "other" event in full detail
+        if self.log_mode == 'diagnostic':
+            return [], [], [], [self._render_diagnostic(record) for record in self.records]
+        return self._group_concise()
+
+    @property
+    def log(self):
+        """Rendered narrative lines for the current LOG_MODE; appending a line records it as an event."""
+        return NarrativeLog(self._log_lines(), self)
 
     def export_concise_log(self):
+        boundary_events, recovery_events, lessons_learned, other = self._grouped()
         log_md = []
-        if hasattr(self, '_boundary_events') and self._boundary_events:
+        if boundary_events:
             log_md.append("## Boundary Notifications\n")
             log_md.append("| Time | Parameter | Value | Safe Range | Action |\n|------|-----------|-------|-----------|--------|")
-            for row in self._boundary_events:
+            for row in boundary_events:
                 log_md.append("| " + " | ".join(str(x) for x in row) + " |")
-        if hasattr(self, '_recovery_events') and self._recovery_events:
+        if recovery_events:
             log_md.append("\n## Recovery Events\n")
-            for event in self._recovery_events:
+            for event in recovery_events:
                 log_md.append(f"- {event}")
-        if hasattr(self, '_lessons_learned'):
-            log_md.append("\n## Lessons Learned\n" + '\n'.join(self._lessons_learned))
-        if self.log:
-            log_md.append("\n## Other Events\n" + '\n'.join(self.log))
+        if lessons_learned:
+            log_md.append("\n## Lessons Learned\n" + '\n'.join(lessons_learned))
+        if other:
+            log_md.append("\n## Other Events\n" + '\n'.join(other))
         return '\n'.join(log_md)
 
     def markdown_log(self):
-        content = "\n".join(self.log)
+        content = "\n".join(self._log_lines())
         return f"<details><summary>Neuron {self.id}</summary>\n{content}\n</details>"
 
 
 
-    def receive_input(self, input_value, source=None, input_type="generic", metadata=None, task_context=None):
+    def receive_input(self, input_value, source=None, input_type="generic", metadata=None, task_context=None, tick=None):
+        # `tick`: when the input arrived, for batched inputs delivered ahead of the clock
+        self._at = tick
         self.last_input_received = True
         if self.asleep:
-            self.log_event(f"I am currently asleep and will ignore incoming events until activated. (Task: {task_context or self.task_context})", event_type="state", extra={"task_context": task_context or self.task_context})
+            if self._narrating:
+                self.narrate("asleep_ignore", task_context or self.task_context, event_type="state")
+            self._at = None
             return
-        # Build input event abstraction
-        input_event = {
-            "value": input_value,
-            "source": source,
-            "input_type": input_type,
-            "metadata": metadata or {},
-            "task_context": task_context or self.task_context
-        }
-        self.log_event(f"Received input {input_value} of type '{input_type}' from {source} for task '{input_event['task_context']}'.", event_type="input", extra=input_event)
+        self.tick += 1
         # Decay membrane potential before adding new input
-        old_potential = self.potential
-        self.potential = self.potential * self.decay_factor + input_value * self.weights[0]
-        self.log_event(f"My membrane potential has decayed from {old_potential} to {self.potential} after receiving input.", event_type="potential", extra=input_event)
-        self.log_event(f"My threshold is currently {self.threshold}.", event_type="threshold", extra=input_event)
-        # Update history with input event
-        self.history.append((datetime.datetime.now().isoformat(), input_value, False, input_event))
+        if self._clock is not None:
+            # Settle the idle ticks before this one; this tick is then handled as usual
+            now = self._clock.now if tick is None else tick
+            self.catch_up(now)
+            if now > self._updated_at:
+                self._updated_at = now
+        old_potential = self._potential
+        self._potential = self._potential * self.decay_factor + input_value * self.weights[0]
+        input_event = None
+        if self._narrating:
+            # Build input event abstraction; only narration reads it, so skip it when nobody listens
+            input_event = {
+                "value": input_value,
+                "source": source,
+                "input_type": input_type,
+                "metadata": metadata or {},
+                "task_context": task_context or self.task_context
+            }
+            self.narrate("input", input_value, input_type, source, input_event["task_context"], event_type="input", extra=input_event)
+            self.narrate("potential", old_potential, self._potential, event_type="potential", extra=input_event)
+            self.narrate("threshold", self._threshold, event_type="threshold", extra=input_event)
         self.decide_to_fire(input_value, input_event)
+        self._at = None
+
+    def receive_batch(self, inputs, ticks=None):
+        """
+        Receive several dispatcher events in order, as (value, source, input_type, metadata) tuples.
+        `ticks` come from a dispatcher that owns this neuron's clock: the tick each event arrived
+        at. Each event is handled at its own tick, so the events land as if delivered one by one;
+        the shared clock is left alone, other neurons may be reading it.
+        """
+        receive = self.receive_input
+        if ticks is None:
+            for value, source, input_type, metadata in inputs:
+                receive(value, source, input_type, metadata)
+            return
+        try:
+            for tick, (value, source, input_type, metadata) in zip(ticks, inputs):
+                receive(value, source, input_type, metadata, None, tick)
+        finally:
+            self._at = None
+
     def passive_decay(self):
         """
         Apply passive decay if no input is received this cycle.
         Log only if the change is above passive_decay_log_threshold.
         """
+        if self._clock is not None:
+            # Ticks without input are accounted for lazily; this only brings them up to date
+            self.catch_up()
+            self.last_input_received = False
+            return
         if self.asleep:
             return
         if not self.last_input_received:
-            old_potential = self.potential
-            self.potential = self.potential * self.decay_factor
-            if abs(self.potential - old_potential) > self.passive_decay_log_threshold:
-                self.log_event(f"No input received this cycle; my membrane potential has decayed from {old_potential} to {self.potential}.")
+            old_potential = self._potential
+            self._potential = self._potential * self.decay_factor
+            if self._narrating and abs(self._potential - old_potential) > self.passive_decay_log_threshold:
+                self.narrate("passive_decay", old_potential, self._potential)
         self.last_input_received = False
 
 
 
     def decide_to_fire(self, input_value, input_event=None):
-        if self.potential >= self.threshold:
-            self.log_event(f"I decided to fire because my membrane potential ({self.potential}) exceeded my threshold ({self.threshold}) for task '{input_event['task_context'] if input_event else self.task_context}'.", event_type="fire", extra=input_event)
-            self.history.append((datetime.datetime.now().isoformat(), input_value, True))
+        if self._potential >= self._threshold:
+            if self._narrating:
+                self.narrate("fire", self._potential, self._threshold, input_event["task_context"] if input_event else self.task_context, event_type="fire", extra=input_event)
+            self.history.append(self.tick, input_value, True)
+            if self._fire_listeners:
+                for listener in self._fire_listeners:
+                    listener(self)
             self.enter_refractory()
-            old_potential = self.potential
-            self.potential = self.baseline_potential
-            self.log_event(f"Resetting membrane potential from {old_potential} to baseline ({self.baseline_potential}) after firing.")
+            old_potential = self._potential
+            self._potential = self.baseline_potential
+            if self._narrating:
+                self.narrate("reset", old_potential, self.baseline_potential)
             self.adapt(fired=True)
-            self.refractory_counter = 0  # Reset refractory counter on firing
+            self._refractory_counter = 0  # Reset refractory counter on firing
         else:
-            self.log_event(f"I did not fire because my membrane potential ({self.potential}) did not meet my threshold ({self.threshold}).")
-            self.history.append((datetime.datetime.now().isoformat(), input_value, False))
+            if self._narrating:
+                self.narrate("no_fire", self._potential, self._threshold)
+            self.history.append(self.tick, input_value, False)
             self.adapt(fired=False)
-        self.summarize_history()
+        if self._narrating:
+            self.summarize_history()
         self.update_refractory()
 
 
@@ -250,51 +476,57 @@ class Neuron:
             pass
         else:
             # If not firing for a while, lower threshold (unless in refractory)
-            if not self.in_refractory and len(self.history) >= self.history_length and all(not h[2] for h in self.history[-self.history_length:]):
-                old_threshold = self.threshold
-                self.threshold = max(self.baseline_threshold, self.threshold - TRUST_DEBATE_DECREMENT)
-                self.log_event(f"I am frustrated by not firing recently. Lowering threshold from {old_threshold} to {self.threshold}.")
+            if not self._in_refractory and self.history.quiet_streak >= self.history_length:
+                old_threshold = self._threshold
+                self._threshold = max(self.baseline_threshold, self._threshold - TRUST_DEBATE_DECREMENT)
+                if self._narrating:
+                    self.narrate("frustrated", old_threshold, self._threshold)
 
 
     def summarize_history(self):
-        recent = self.history[-self.history_length:]
-        firings = [t for t, _, fired in recent if fired]
-        self.log_event(f"Here is my recent firing history: {firings if firings else 'No recent firings.'}")
+        firings = self.history.firing_ticks(self.history_length)
+        self.narrate("history", firings)
 
 
     def sleep(self):
+        if self._clock is not None:
+            self.catch_up()
         self.asleep = True
-        self.log_event("I am going to sleep and will ignore events until woken.")
+        self.narrate("sleep")
 
 
     def wake(self):
+        if self._clock is not None:
+            self.catch_up()  # time spent asleep passes without decay
         self.asleep = False
-        self.log_event("I am now awake and ready to receive events.")
+        self.narrate("wake")
 
 
     def notify_pattern(self, pattern):
-        self.log_event(f"PatternWatcher has notified me about a recurring pattern: {pattern}. I will monitor this closely.")
+        self.narrate("notify_pattern", pattern)
 
 
     def get_log(self):
         return self.log
 
     def enter_refractory(self):
-        self.in_refractory = True
-        self.refractory_counter = 0
-        old_threshold = self.threshold
-        self.threshold = self.baseline_threshold + self.refractory_offset
-        self.log_event(f"Entering refractory period; raising threshold to {self.threshold} after firing.")
+        self._in_refractory = True
+        self._refractory_counter = 0
+        old_threshold = self._threshold
+        self._threshold = self.baseline_threshold + self.refractory_offset
+        if self._narrating:
+            self.narrate("refractory_enter", self._threshold)
 
 
     def update_refractory(self):
-        if self.in_refractory:
-            self.refractory_counter += 1
-            if self.refractory_counter >= self.refractory_events:
-                old_threshold = self.threshold
-                self.threshold = self.baseline_threshold
-                self.in_refractory = False
-                self.log_event(f"My refractory period has ended, returning threshold from {old_threshold} to baseline {self.baseline_threshold}.")
+        if self._in_refractory:
+            self._refractory_counter += 1
+            if self._refractory_counter >= self.refractory_events:
+                old_threshold = self._threshold
+                self._threshold = self.baseline_threshold
+                self._in_refractory = False
+                if self._narrating:
+                    self.narrate("refractory_end", old_threshold, self.baseline_threshold)
 
 # --- Sample Usage & Log Output ---
 if __name__ == "__main__":
@@ -1,34 +1,89 @@
 from config import ADOPTION_THRESHOLD, MENTORING_TRUST_BOOST
+from clock import SimulationClock
+from log_sinks import resolve_sink
+from narration import format_stamp, render_message
 """
 NeuronPatternInterface: Manages pattern registry, neuron adoption, and narrative notifications.
 """
 class NeuronPatternInterface:
-    def __init__(self):
+    def __init__(self, log_sink=None, clock=None):
+        # Narration goes to a log sink like a Neuron's or PatternWatcher's, stamped with the
+        # simulation's clock (or a clock of its own that never advances)
+        self.log_sink = resolve_sink(log_sink)
+        self._narrating = self.log_sink.enabled
+        self.clock = SimulationClock() if clock is None else clock
         self.pattern_registry = {}  # pattern -> [PatternWatcher]
         self.neuron_adoption = {}  # neuron_id -> {pattern: status}
+        # Reverse index kept in step with neuron_adoption, so counts and lookups never rescan it
+        self.adoption_index = {}  # pattern -> {status: {neuron_id: neuron}}
 
     def register_pattern(self, pattern, watcher):
         self.pattern_registry.setdefault(pattern, []).append(watcher)
-        print(f"NeuronPatternInterface: Registered pattern '{pattern}' from PatternWatcher.")
+        self.narrate("interface_registered", pattern)
 
     def notify_neuron(self, neuron, pattern):
-        print(f"NeuronPatternInterface: Notifying Neuron {neuron.id} about pattern '{pattern}'.")
+        self.narrate("interface_notifying", neuron.id, pattern, neuron_id=neuron.id)
         neuron.receive_pattern_notification(pattern, self)
 
     def update_adoption(self, neuron, pattern, status):
-        self.neuron_adoption.setdefault(neuron.id, {})[pattern] = status
-        print(f"NeuronPatternInterface: Neuron {neuron.id} adoption status for '{pattern}' is now '{status}'.")
-        if status == "revised":
-            print(f"NeuronPatternInterface: Neuron {neuron.id} has revised their recognition of {pattern}.")
+        statuses = self.neuron_adoption.setdefault(neuron.id, {})
+        by_status = self.adoption_index.setdefault(pattern, {})
+        previous = statuses.get(pattern)
+        if previous is not None:
+            del by_status[previous][neuron.id]
+        statuses[pattern] = status
+        by_status.setdefault(status, {})[neuron.id] = neuron
+        if self._narrating:
+            self.narrate("adoption_status", neuron.id, pattern, status, neuron_id=neuron.id)
+            if status == "revised":
+                self.narrate("adoption_revised", neuron.id, pattern, neuron_id=neuron.id)
         # Aggregate feedback: if enough neurons revise, notify PatternWatcher
-        revised_count = sum(1 for n in self.neuron_adoption if self.neuron_adoption[n].get(pattern) == "revised")
+        revised_count = self.status_count(pattern, "revised")
         if revised_count >= ADOPTION_THRESHOLD:
-            from pattern_watcher import PatternWatcher
             # This assumes a singleton PatternWatcher for notification
-            print(f"NeuronPatternInterface: Multiple neurons ({revised_count}) have revised {pattern}. Notifying PatternWatcher.")
+            self.narrate("adoption_revisions", revised_count, pattern)
+
     def mentor_neuron(self, mentor, mentee, pattern):
         # Mentor shares pattern and boosts trust
         if pattern in mentor.patterns_adopted:
             mentee.patterns_monitored.add(pattern)
             mentee.trust_score += MENTORING_TRUST_BOOST
-            print(f"NeuronPatternInterface: Neuron {mentor.id} mentored Neuron {mentee.id} on {pattern}. Trust boosted.")
+            self.narrate("interface_mentored", mentor.id, mentee.id, pattern, neuron_id=mentee.id)
+
+    def status_count(self, pattern, status):
+        """How many neurons currently hold `status` for `pattern`."""
+        return len(self.adoption_index.get(pattern, {}).get(status, ()))
+
+    def status_counts(self, pattern):
+        """{status: number of neurons} for one pattern."""
+        return {status: len(neurons) for status, neurons in self.adoption_index.get(pattern, {}).items() if neurons}
+
+    def neuron_ids_with_status(self, pattern, status):
+        return list(self.adoption_index.get(pattern, {}).get(status, ()))
+
+    def neurons_with_status(self, pattern, status):
+        """The neurons currently holding `status` for `pattern`, e.g. everyone still monitoring it."""
+        return list(self.adoption_index.get(pattern, {}).get(status, {}).values())
+
+    def renotify(self, pattern, status="monitoring"):
+        """Notify again every neuron holding `status` for `pattern`; returns how many were notified."""
+        neurons = self.neurons_with_status(pattern, status)
+        for neuron in neurons:
+            self.notify_neuron(neuron, pattern)
+        return len(neurons)
+
+    def narrate(self, template, *args, event_type=None, neuron_id=None, extra=None):
+        if not self._narrating:
+            return
+        self.log_sink.emit((self.clock.now, event_type, template, args, extra, neuron_id), self)
+
+    def render_line(self, record):
+        return f"- [{format_stamp(record[0], self.clock)}] {render_message(record)}"
+
+    @property
+    def records(self):
+        """Narration records kept in memory by the log sink (empty when the sink keeps none)."""
+        return self.log_sink.records
+
+    def get_log(self):
+        return [self.render_line(record) for record in self.records]
@@ -0,0 +1,140 @@
+"""
+PatternStore: Persistent pattern database that lets PatternWatcher learning accumulate across runs.
+"""
+import atexit
+import json
+import os
+import sqlite3
+import time
+from patternwatcher_config import PATTERN_DB_PATH, PATTERN_DB_COMMIT_EVERY
+
+
+class PatternStore:
+    """
+    SQLite database of pattern confidences, trust scores and learning history, indexed by
+    pattern and by neuron id.
+
+    Nothing is read up front: opening the store costs the same whether it holds ten patterns
+    or ten million, and a watcher fetches a pattern's confidence or a neuron's trust score the
+    first time it needs it. Writes are upserts and appends batched into one transaction every
+    `commit_every` writes (and on commit()/close()), so each run only pays for what it changed.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS confidence (pattern TEXT PRIMARY KEY, confidence REAL NOT NULL, updated REAL NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS trust (neuron_id TEXT PRIMARY KEY, score REAL NOT NULL, updated REAL NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS learning (id INTEGER PRIMARY KEY AUTOINCREMENT, event TEXT, neuron_id TEXT, pattern TEXT, entry TEXT NOT NULL, watcher TEXT, kind TEXT)",
+        "CREATE INDEX IF NOT EXISTS learning_by_neuron ON learning (neuron_id)",
+        "CREATE INDEX IF NOT EXISTS learning_by_pattern ON learning (pattern)",
+    )
+    # Columns added after the first version of the schema; older database files gain them on open
+    LATER_COLUMNS = (("learning", "watcher"), ("learning", "kind"))
+    LATER_INDEXES = ("CREATE INDEX IF NOT EXISTS learning_by_watcher ON learning (watcher, kind)",)
+
+    def __init__(self, path=PATTERN_DB_PATH, commit_every=PATTERN_DB_COMMIT_EVERY):
+        self.path = path
+        self.commit_every = commit_every
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")  # concurrent runs can read while one writes
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in self.SCHEMA:
+            self._db.execute(statement)
+        for table, column in self.LATER_COLUMNS:
+            if column not in {row[1] for row in self._db.execute(f"PRAGMA table_info({table})")}:
+                self._db.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT")
+        for statement in self.LATER_INDEXES:
+            self._db.execute(statement)
+        self._db.commit()
+        self._uncommitted = 0
+
+    def get_confidence(self, pattern):
+        row = self._db.execute("SELECT confidence FROM confidence WHERE pattern = ?", (pattern,)).fetchone()
+        return None if row is None else row[0]
+
+    def put_confidences(self, items):
+        """Upsert (pattern, confidence) pairs."""
+        now = time.time()
+        rows = [(pattern, confidence, now) for pattern, confidence in items]
+        self._db.executemany("INSERT INTO confidence VALUES (?, ?, ?) ON CONFLICT(pattern) DO UPDATE SET confidence = excluded.confidence, updated = excluded.updated", rows)
+        self._wrote(len(rows))
+
+    def get_trust(self, neuron_id):
+        row = self._db.execute("SELECT score FROM trust WHERE neuron_id = ?", (neuron_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def put_trust(self, items):
+        """Upsert (neuron_id, trust score) pairs."""
+        now = time.time()
+        rows = [(neuron_id, score, now) for neuron_id, score in items]
+        self._db.executemany("INSERT INTO trust VALUES (?, ?, ?) ON CONFLICT(neuron_id) DO UPDATE SET score = excluded.score, updated = excluded.updated", rows)
+        self._wrote(len(rows))
+
+    def append_learning(self, entries, watcher=None, kind="learning"):
+        """
+        Append learning-history entries (dicts such as PatternWatcher.learning_history holds),
+        optionally tagged with the watcher they came from and which of its histories.
+        """
+        rows = [
+            (entry.get("event"), entry.get("neuron_id"), entry.get("pattern"), json.dumps(entry, default=str), watcher, kind)
+            for entry in entries
+        ]
+        self._db.executemany("INSERT INTO learning (event, neuron_id, pattern, entry, watcher, kind) VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self._wrote(len(rows))
+
+    def learning(self, neuron_id=None, pattern=None, watcher=None, kind=None, limit=None):
+        """Most recent learning entries matching every given filter, oldest first."""
+        filters = [(column, value) for column, value in (("neuron_id", neuron_id), ("pattern", pattern), ("watcher", watcher), ("kind", kind)) if value is not None]
+        where = " AND ".join(f"{column} = ?" for column, _ in filters) or "1"
+        rows = self._db.execute(
+            f"SELECT entry FROM learning WHERE {where} ORDER BY id DESC LIMIT ?",
+            [value for _, value in filters] + [-1 if limit is None else limit]
+        ).fetchall()
+        return [json.loads(row[0]) for row in reversed(rows)]
+
+    def learning_for_neuron(self, neuron_id, limit=None):
+        """Most recent learning entries about one neuron, oldest first."""
+        return self.learning(neuron_id=neuron_id, limit=limit)
+
+    def learning_for_pattern(self, pattern, limit=None):
+        return self.learning(pattern=pattern, limit=limit)
+
+    def pattern_count(self):
+        return self._db.execute("SELECT COUNT(*) FROM confidence").fetchone()[0]
+
+    def _wrote(self, count):
+        self._uncommitted += count
+        if self._uncommitted >= self.commit_every:
+            self.commit()
+
+    def commit(self):
+        self._db.commit()
+        self._uncommitted = 0
+
+    def close(self):
+        try:
+            self.commit()
+            self._db.close()
+        except sqlite3.ProgrammingError:
+            pass  # already closed
+
+
+# One store per database file, shared by every watcher in the process
+_open_stores = {}
+
+
+def open_store(path=PATTERN_DB_PATH):
+    """The process-wide PatternStore for `path`, committed and closed at exit."""
+    if path not in _open_stores:
+        store = PatternStore(path)
+        atexit.register(store.close)
+        _open_stores[path] = store
+    return _open_stores[path]
+
+
+def close_store(path=PATTERN_DB_PATH):
+    """Commit and close the process-wide store for `path`, if one is open; the next open_store() reopens it."""
+    store = _open_stores.pop(path, None)
+    if store is not None:
+        store.close()
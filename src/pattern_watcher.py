@@ -3,41 +3,102 @@ PatternWatcher: Persistent, cumulative pattern detection and logging.
 """
 import json
 import os
-from utils import narrative_log
+from collections import deque
+from itertools import chain
+from operator import attrgetter
+import numpy as np
+import log_config
+from utils import new_id
+from clock import SimulationClock
+from narration import NarrativeLog, render_message, format_stamp
+from log_sinks import resolve_sink
+from confidence_table import ConfidenceTable
+from pattern_store import PatternStore
+from learning_history import LearningHistory
 from config import DEFAULT_TRUST_SCORE, PATTERNWATCHER_CONFIDENCE_STEP
 
 
 class PatternWatcher:
-    def monitor_neurons(self, neurons, pattern, rapid_firing_threshold=3):
-        # Check for rapid firing in all neurons
-        rapid_firing_neurons = []
+    def watch_neurons(self, neurons):
+        """
+        Subscribe to the neurons' fire events so rapid firing is tracked as it happens instead of
+        rescanning every history each cycle. Neurons already watched are left alone.
+        Windows are kept in the neuron's time: its clock's ticks, or its input count without one.
+        Histories count inputs, so only a neuron without a clock has earlier firings to start from.
+        """
         for neuron in neurons:
-            firings = [t for t, _, fired in neuron.history if fired]
-            if len(firings) >= rapid_firing_threshold:
+            if neuron.id in self._fire_windows:
+                continue
+            # Seed the window with firings that happened before we started watching
+            window = deque(neuron.history.firing_ticks() if neuron.clock is None else (), maxlen=self.memory_window)
+            self._fire_windows[neuron.id] = window
+            neuron.fire_listeners.append(self._on_fire)
+            if window:
+                self._recent_firers[neuron.id] = neuron
+
+    def _on_fire(self, neuron):
+        self._fire_windows[neuron.id].append(neuron.now)
+        self._recent_firers[neuron.id] = neuron
+
+    def _window_count(self, neuron):
+        # Firings within the last memory_window ticks of this neuron's time
+        window = self._fire_windows[neuron.id]
+        oldest = neuron.now - self.memory_window
+        while window and window[0] <= oldest:
+            window.popleft()
+        return len(window)
+
+    def monitor_neurons(self, neurons=None, pattern=None, rapid_firing_threshold=3):
+        # Only neurons that fired since the last cycle can newly cross the threshold,
+        # so the cost follows the number of firings, not the number of neurons or history size.
+        if neurons is not None:
+            self.watch_neurons(neurons)
+        for neuron_id, neuron in list(self._rapid_firing.items()):
+            if self._window_count(neuron) < rapid_firing_threshold:
+                del self._rapid_firing[neuron_id]  # calmed down; may be reported again later
+        rapid_firing_neurons = []
+        for neuron_id, neuron in self._recent_firers.items():
+            if neuron_id not in self._rapid_firing and self._window_count(neuron) >= rapid_firing_threshold:
+                self._rapid_firing[neuron_id] = neuron
                 rapid_firing_neurons.append(neuron)
+        self._recent_firers.clear()
         if rapid_firing_neurons:
-            self.log_event(f"PatternWatcher: Persistent rapid firing detected in {len(rapid_firing_neurons)} neurons. Recommending increased refractory offset and decay factor.")
+            self.narrate("rapid_firing", len(rapid_firing_neurons))
             for neuron in rapid_firing_neurons:
                 neuron.adapt_parameters(refractory_offset_increase=True, decay_factor_decrease=True, watcher=self)
         if len(rapid_firing_neurons) > 1:
-            self.log_event(f"PatternWatcher: Multiple neurons exhibiting rapid firing. Triggering network-wide dampening.")
+            self.narrate("network_dampening")
             for neuron in rapid_firing_neurons:
                 neuron.adapt_parameters(network_dampening=True, watcher=self)
-    def __init__(self, interface, task_context="Generic Task"):
+        if self._owns_clock:
+            self.clock.advance()  # one cycle done
+        return rapid_firing_neurons
+
+    def __init__(self, interface, task_context="Generic Task", log_sink=None, store=None, clock=None):
         from patternwatcher_config import (
             SAFE_THRESHOLD_MIN, SAFE_THRESHOLD_MAX,
             SAFE_REFRACTORY_OFFSET_MIN, SAFE_REFRACTORY_OFFSET_MAX,
             SAFE_DECAY_FACTOR_MIN, SAFE_DECAY_FACTOR_MAX,
             SAFE_MEMBRANE_POTENTIAL_MIN, SAFE_MEMBRANE_POTENTIAL_MAX,
             PATTERNWATCHER_SENSITIVITY, PATTERNWATCHER_LEARNING_RATE,
-            PATTERNWATCHER_MEMORY_WINDOW, PATTERNWATCHER_NOTIFICATION_THRESHOLD,
-            PATTERNWATCHER_LEARNING_HISTORY, PATTERNWATCHER_SUCCESSFUL_RECOGNITIONS, PATTERNWATCHER_FAILED_RECOGNITIONS
+            PATTERNWATCHER_MEMORY_WINDOW, PATTERNWATCHER_NOTIFICATION_THRESHOLD
         )
+        self.id = new_id()
         self.interface = interface
         self.task_context = task_context
-        self.log = []
+        # Narration settings are resolved once here, not per event
+        self.log_mode = log_config.LOG_MODE
+        self.log_sink = resolve_sink(log_sink)
+        self._narrating = self.log_sink.enabled
+        # Narration is stamped with ticks of the simulation's clock. Without one the watcher keeps
+        # its own, which counts monitor_neurons() cycles.
+        self._owns_clock = clock is None
+        self.clock = SimulationClock() if clock is None else clock
+        # Optional PatternStore (or a path to one): confidences and trust scores are looked up
+        # there on first use, and save() writes back what this watcher learned
+        self.store = PatternStore(store) if isinstance(store, str) else store
         self.trust_scores = {}  # neuron_id -> trust score
-        self.pattern_confidence = {}  # pattern -> confidence
+        self.pattern_confidence = ConfidenceTable(fallback=self.store.get_confidence if self.store else None)  # pattern -> confidence; whole-table shifts are O(1)
         # Safe/unsafe bounds
         self.safe_bounds = {
             "threshold": (SAFE_THRESHOLD_MIN, SAFE_THRESHOLD_MAX),
@@ -49,9 +110,100 @@ class PatternWatcher:
         self.learning_rate = PATTERNWATCHER_LEARNING_RATE
         self.memory_window = PATTERNWATCHER_MEMORY_WINDOW
         self.notification_threshold = PATTERNWATCHER_NOTIFICATION_THRESHOLD
-        self.learning_history = PATTERNWATCHER_LEARNING_HISTORY
-        self.successful_recognitions = PATTERNWATCHER_SUCCESSFUL_RECOGNITIONS
-        self.failed_recognitions = PATTERNWATCHER_FAILED_RECOGNITIONS
+        # Each watcher keeps its own histories, memory_window entries deep; older entries spill to the store
+        self.learning_history = LearningHistory(self.memory_window, self._history_store, self.id, "learning")
+        self.successful_recognitions = LearningHistory(self.memory_window, self._history_store, self.id, "successful_recognition")
+        self.failed_recognitions = LearningHistory(self.memory_window, self._history_store, self.id, "failed_recognition")
+        # Incremental rapid-firing detection (see watch_neurons / monitor_neurons)
+        self._fire_windows = {}  # neuron_id -> deque of recent fire ticks
+        self._recent_firers = {}  # neuron_id -> neuron, fired since the last monitor_neurons()
+        self._rapid_firing = {}  # neuron_id -> neuron, currently above the rapid-firing threshold
+        self._bound_cutoffs = None  # see _cutoffs(); rebuilt whenever safe_bounds or notification_threshold change
+        self._bound_cutoffs_key = None
+
+    def _cutoffs(self):
+        """
+        The values at which monitor_bounds() starts notifying, per parameter, as
+        (far_low, near_low, near_high, far_high): a value outside the safe range is reported
+        once its unsafe fraction reaches notification_threshold (at or beyond far_low/far_high),
+        a value inside it once it is nearer the edge than near_low/near_high.
+        """
+        key = (tuple(self.safe_bounds.items()), self.notification_threshold)
+        if key != self._bound_cutoffs_key:
+            margin = self.notification_threshold
+            self._bound_cutoffs = {
+                param: (safe_min - margin * (safe_max - safe_min), safe_min * (2 - margin), safe_max * margin, safe_max + margin * (safe_max - safe_min))
+                for param, (safe_min, safe_max) in self.safe_bounds.items()
+            }
+            self._bound_cutoffs_key = key
+        return self._bound_cutoffs
+
+    def monitor_bounds_batch(self, neurons=None, population=None):
+        """
+        Check many neurons against safe_bounds at once, with the same rules as monitor_bounds().
+
+        Parameter values come from `population` (a NeuronPopulation) when given, else are gathered
+        from the `neurons` in a single pass. All parameters of all neurons are tested with one
+        set of array masks, and only violators are visited afterwards: each Neuron is notified
+        as monitor_bounds() would do it; without Neuron objects the population's columns are
+        clamped back into range directly. Parameters the neurons do not carry are skipped, as in
+        monitor_bounds(). Returns (neuron_indices, params) of the violations, ordered by neuron.
+        """
+        cutoffs = self._cutoffs()
+        if population is not None:
+            checked = [param for param in cutoffs if hasattr(population, param)]
+            values = np.array([getattr(population, param) for param in checked], dtype=np.float64).reshape(len(checked), population.size)
+        else:
+            checked = [param for param in cutoffs if neurons and hasattr(neurons[0], param)]
+            # One pass over the neurons, every checked parameter at once: (neurons, params), transposed
+            gathered = map(attrgetter(*checked), neurons) if len(checked) > 1 else ((getattr(neuron, checked[0]),) for neuron in neurons) if checked else ()
+            values = np.fromiter(chain.from_iterable(gathered), dtype=np.float64, count=len(neurons) * len(checked)).reshape(len(neurons), len(checked)).T
+        if not checked:
+            return np.zeros(0, dtype=np.int64), []
+        # One row of cutoffs per checked parameter, broadcast across the neurons
+        far_low, near_low, near_high, far_high = (np.array(column)[:, None] for column in zip(*(cutoffs[param] for param in checked)))
+        safe_min, safe_max = (np.array(column)[:, None] for column in zip(*(self.safe_bounds[param] for param in checked)))
+        unsafe = (values <= far_low) | (values >= far_high)
+        unsafe |= (values >= safe_min) & (values <= safe_max) & ((values > near_high) | (values < near_low))
+        # Nonzero entries of the transpose come neuron by neuron, parameters in safe_bounds order
+        indices, param_orders = np.nonzero(unsafe.T)
+        if not indices.size:
+            return np.zeros(0, dtype=np.int64), []
+        params = [checked[param_order] for param_order in param_orders.tolist()]
+        # Read every value before acting, as monitor_bounds() does for one neuron
+        if population is not None:
+            values = [getattr(population, param)[index].item() for index, param in zip(indices.tolist(), params)]
+        else:
+            values = [getattr(neurons[index], param) for index, param in zip(indices.tolist(), params)]
+        for index, param, value in zip(indices.tolist(), params, values):
+            safe_min, safe_max = self.safe_bounds[param]
+            if neurons is not None:
+                self._notify_bounds(neurons[index], param, value, safe_min, safe_max)
+            else:
+                self.narrate("bounds_approaching", index, 'high' if value > safe_max else 'low', param, value, safe_min, safe_max)
+                column = getattr(population, param)
+                column[index] = min(max(column[index], safe_min), safe_max)
+                self.learning_history.append({
+                    "event": "boundary_notification",
+                    "neuron_id": index,
+                    "param": param,
+                    "value": value,
+                    "safe_min": safe_min,
+                    "safe_max": safe_max
+                })
+        return indices, params
+
+    def _notify_bounds(self, neuron, param, value, safe_min, safe_max):
+        self.narrate("bounds_approaching", neuron.id, 'high' if value > safe_max else 'low', param, value, safe_min, safe_max)
+        neuron.receive_boundary_notification(param, value, safe_min, safe_max, watcher=self)
+        self.learning_history.append({
+            "event": "boundary_notification",
+            "neuron_id": neuron.id,
+            "param": param,
+            "value": value,
+            "safe_min": safe_min,
+            "safe_max": safe_max
+        })
 
     def monitor_bounds(self, neuron):
         # Check all neuron parameters for safe/unsafe bounds
@@ -69,87 +221,120 @@ class PatternWatcher:
                 if unsafe_fraction >= self.notification_threshold:
                     unsafe_events.append((param, value, safe_min, safe_max))
         for param, value, safe_min, safe_max in unsafe_events:
-            self.log_event(f"Threshold for Neuron {neuron.id} is approaching unsafe {('high' if value > safe_max else 'low')} limit ({param}: {value}, safe range: {safe_min}-{safe_max}). Notifying neuron.")
-            neuron.receive_boundary_notification(param, value, safe_min, safe_max, watcher=self)
-            self.learning_history.append({
-                "event": "boundary_notification",
-                "neuron_id": neuron.id,
-                "param": param,
-                "value": value,
-                "safe_min": safe_min,
-                "safe_max": safe_max
-            })
+            self._notify_bounds(neuron, param, value, safe_min, safe_max)
 
     def log_learning(self, message):
-        self.log_event(f"PatternWatcher Learning Log: {message}")
+        self.narrate("learning", message)
         self.learning_history.append({"event": "learning_log", "message": message})
 
     def discover_pattern(self, pattern):
-        self.log_event(f"PatternWatcher has discovered recurring pattern '{pattern}'. Registering with NeuronPatternInterface.")
+        self.narrate("pattern_discovered", pattern)
         self.interface.register_pattern(pattern, self)
         self.pattern_confidence[pattern] = self.pattern_confidence.get(pattern, 0.5)  # Initial confidence
 
     def recommend_pattern(self, neuron, pattern):
-        self.log_event(f"PatternWatcher recommends pattern '{pattern}' to Neuron {neuron.id}.")
+        self.narrate("pattern_recommended", pattern, neuron.id)
         neuron.receive_pattern_recommendation(pattern, self)
         # Adapt confidence based on neuron feedback
         if neuron.trust_score > 0.8:
             self.pattern_confidence[pattern] = min(1.0, self.pattern_confidence.get(pattern, 0.5) + PATTERNWATCHER_CONFIDENCE_STEP)
-            self.log_event(f"PatternWatcher: Increased confidence in pattern '{pattern}' due to positive neuron feedback.")
+            self.narrate("confidence_up", pattern)
         elif neuron.trust_score < 0.3:
             self.pattern_confidence[pattern] = max(0.0, self.pattern_confidence.get(pattern, 0.5) - PATTERNWATCHER_CONFIDENCE_STEP)
-            self.log_event(f"PatternWatcher: Decreased confidence in pattern '{pattern}' due to skepticism from neuron.")
+            self.narrate("confidence_down", pattern)
 
     def update_trust(self, neuron, delta, context=None):
-        old_score = self.trust_scores.get(neuron.id, DEFAULT_TRUST_SCORE)
+        old_score = self.trust_score(neuron.id)
         new_score = min(1.0, max(0.0, old_score + delta))
         self.trust_scores[neuron.id] = new_score
-        explanation = f"Neuron {neuron.id}: My trust score for PatternWatcher has changed from {old_score:.2f} to {new_score:.2f}."
-        if context:
-            explanation += f" Reason: {context}"
-        self.log_event(explanation)
+        self.narrate("trust_changed", neuron.id, old_score, new_score, context)
         # PatternWatcher reflects on neuron behavior
         if delta < 0:
-            self.log_event(f"PatternWatcher: Noted skepticism from Neuron {neuron.id}. Will review my classification of relevant patterns.")
+            self.narrate("skepticism_noted", neuron.id)
             # Lower confidence in all patterns associated with this neuron
-            for pattern in self.pattern_confidence:
-                self.pattern_confidence[pattern] = max(0.0, self.pattern_confidence[pattern] - PATTERNWATCHER_CONFIDENCE_STEP)
+            self.pattern_confidence.shift_all(-PATTERNWATCHER_CONFIDENCE_STEP)
         elif delta > 0 and new_score > 0.8:
-            self.log_event(f"PatternWatcher: Neuron {neuron.id} adapted independently. Considering updating global pattern criteria.")
-            for pattern in self.pattern_confidence:
-                self.pattern_confidence[pattern] = min(1.0, self.pattern_confidence[pattern] + PATTERNWATCHER_CONFIDENCE_STEP)
+            self.narrate("independent_adaptation", neuron.id)
+            self.pattern_confidence.shift_all(PATTERNWATCHER_CONFIDENCE_STEP)
+    def trust_score(self, neuron_id):
+        score = self.trust_scores.get(neuron_id)
+        if score is None and self.store is not None:
+            score = self.store.get_trust(neuron_id)
+            if score is not None:
+                self.trust_scores[neuron_id] = score
+        return DEFAULT_TRUST_SCORE if score is None else score
+
+    def _history_store(self):
+        # Where histories overflow; without a store they stay bounded in memory and forget the oldest
+        return self.store
+
+    def save(self):
+        """
+        Write what this watcher learned to its store: the confidences and trust scores it has
+        touched, and the history entries it has not written yet.
+        """
+        if self.store is None:
+            return
+        self.store.put_confidences(self.pattern_confidence.items())
+        self.store.put_trust(self.trust_scores.items())
+        for history in (self.learning_history, self.successful_recognitions, self.failed_recognitions):
+            history.persist()
+        self.store.commit()
+
     def reflect_on_revision(self, pattern):
-        self.log_event(f"PatternWatcher: Alert—multiple neurons have revised {pattern}. Global review triggered.")
+        self.narrate("revision_alert", pattern)
 
     def log_event(self, message, event_type=None, neuron_id=None, extra=None):
-        # Always include task context in narration
+        # Free-form narration: the message is kept as-is, stamped with the current tick
+        if not self._narrating:
+            return
+        self._record((self.clock.now, event_type, None, message, extra, neuron_id))
+
+    def narrate(self, template, *args, event_type=None, neuron_id=None, extra=None):
+        # Structured narration: keep the template id and raw values, build the sentence on export
+        if not self._narrating:
+            return
+        self._record((self.clock.now, event_type, template, args, extra, neuron_id))
+
+    def _record(self, record):
+        self.log_sink.emit(record, self)
+
+    @property
+    def records(self):
+        """Narration records kept in memory by the log sink (empty when the sink keeps none)."""
+        return self.log_sink.records
+
+    def render_line(self, record):
+        # One line of text for streaming sinks (console, file)
+        if self.log_mode == 'diagnostic':
+            return self._render_diagnostic(record)
+        return f"- [{format_stamp(record[0], self.clock)}] {render_message(record)}"
+
+    def _render_diagnostic(self, record):
+        # Diagnostic mode: full detail, markdown, always including task context
+        stamp, event_type, _, _, extra, neuron_id = record
         if extra is None:
             extra = {}
         if 'task_context' not in extra:
-            extra['task_context'] = getattr(self, 'task_context', 'Generic Task')
-        # ...existing code...
-        from log_config import LOG_MODE
-        import datetime
-        timestamp = datetime.datetime.now().strftime('%H:%M:%S')
-        # Diagnostic mode: full detail, markdown, grouped by event type
-        if LOG_MODE == 'diagnostic':
-            entry = f"- [{timestamp}] "
-            if event_type:
-                entry += f"**{event_type}**: "
-            entry += message
-            if neuron_id:
-                entry += f" (Neuron {neuron_id})"
-            if extra:
-                entry += f" | {extra}"
-            self.log.append(entry)
-            print(entry)
-        else:
-            # Concise mode: group major events, markdown headings/tables
+            extra = {**extra, 'task_context': self.task_context}
+        entry = f"- [{format_stamp(stamp, self.clock)}] "
+        if event_type:
+            entry += f"**{event_type}**: "
+        entry += render_message(record)
+        if neuron_id:
+            entry += f" (Neuron {neuron_id})"
+        if extra:
+            entry += f" | {extra}"
+        return entry
+
+    def _group_concise(self):
+        # Concise mode: group major events, markdown headings/tables
+        boundary_table, pattern_events, lessons_learned, other = [], [], [], []
+        for record in self.records:
+            stamp, event_type, _, _, extra, neuron_id = record
             if event_type == 'boundary_notification' and extra:
-                if not hasattr(self, '_boundary_table'):
-                    self._boundary_table = []
-                self._boundary_table.append([
-                    timestamp,
+                boundary_table.append([
+                    format_stamp(stamp, self.clock),
                     f"Neuron {neuron_id}",
                     extra.get('param', ''),
                     extra.get('value', ''),
@@ -157,30 +342,38 @@ class PatternWatcher:
                     extra.get('action', '')
                 ])
             elif event_type == 'pattern_event':
-                if not hasattr(self, '_pattern_events'):
-                    self._pattern_events = []
-                self._pattern_events.append(f"- [{timestamp}] {message}")
+                pattern_events.append(f"- [{format_stamp(stamp, self.clock)}] {render_message(record)}")
             elif event_type == 'lesson_learned':
-                if not hasattr(self, '_lessons_learned'):
-                    self._lessons_learned = []
-                self._lessons_learned.append(f"- {message}")
+                lessons_learned.append(f"- {render_message(record)}")
             else:
-                self.log.append(f"- [{timestamp}] {message}")
-            print(f"- [{timestamp}] {message}")
+                other.append(f"- [{format_stamp(stamp, self.clock)}] {render_message(record)}")
+        return boundary_table, pattern_events, lessons_learned, other
+
+    def _grouped(self):
+        # In diagnostic mode nothing is grouped: every event is an "other" event in full detail
+        if self.log_mode == 'diagnostic':
+            return [], [], [], [self._render_diagnostic(record) for record in self.records]
+        return self._group_concise()
+
+    @property
+    def log(self):
+        """Rendered narrative lines for the current LOG_MODE; appending a line records it as an event."""
+        return NarrativeLog(self._grouped()[3], self)
 
     def export_concise_log(self):
         # Export grouped markdown log for concise mode
+        boundary_table, pattern_events, lessons_learned, other = self._grouped()
         log_md = []
-        if hasattr(self, '_pattern_events'):
-            log_md.append("## PatternWatcher Events\n" + '\n'.join(self._pattern_events))
-        if hasattr(self, '_boundary_table') and self._boundary_table:
+        if pattern_events:
+            log_md.append("## PatternWatcher Events\n" + '\n'.join(pattern_events))
+        if boundary_table:
             log_md.append("\n## Boundary Notifications\n")
             log_md.append("| Time | Neuron | Parameter | Value | Safe Range | Action |\n|------|--------|-----------|-------|-----------|--------|")
-            for row in self._boundary_table:
+            for row in boundary_table:
                 log_md.append("| " + " | ".join(str(x) for x in row) + " |")
-        if hasattr(self, '_lessons_learned'):
-            log_md.append("\n## Lessons Learned\n" + '\n'.join(self._lessons_learned))
+        if lessons_learned:
+            log_md.append("\n## Lessons Learned\n" + '\n'.join(lessons_learned))
         # Add any other logs
-        if self.log:
-            log_md.append("\n## Other Events\n" + '\n'.join(self.log))
+        if other:
+            log_md.append("\n## Other Events\n" + '\n'.join(other))
         return '\n'.join(log_md)
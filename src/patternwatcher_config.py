@@ -1,5 +1,6 @@
 # patternwatcher_config.py
 # Configuration for PatternWatcher sensitivity, boundaries, learning, and memory
+import os
 
 SAFE_THRESHOLD_MIN = 0.5
 SAFE_THRESHOLD_MAX = 2.0
@@ -15,7 +16,6 @@ PATTERNWATCHER_LEARNING_RATE = 0.1
 PATTERNWATCHER_MEMORY_WINDOW = 10  # Number of events to remember for learning
 PATTERNWATCHER_NOTIFICATION_THRESHOLD = 0.9  # Fraction of unsafe bound before notification
 
-# Patterns and learning history
-PATTERNWATCHER_LEARNING_HISTORY = []
-PATTERNWATCHER_SUCCESSFUL_RECOGNITIONS = []
-PATTERNWATCHER_FAILED_RECOGNITIONS = []
+# Persistent pattern database shared by every run (see pattern_store.py)
+PATTERN_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "patterns", "pattern_db.sqlite3")
+PATTERN_DB_COMMIT_EVERY = 500  # Writes batched into one transaction
@@ -0,0 +1,251 @@
+"""
+NeuronPopulation: Struct-of-arrays engine that advances a whole batch of neurons in one step.
+"""
+from multiprocessing import shared_memory
+import numpy as np
+from config import (
+    DEFAULT_THRESHOLD, DEFAULT_REFRACTORY_OFFSET, DEFAULT_REFRACTORY_EVENTS, DEFAULT_DECAY_FACTOR,
+    DEFAULT_WEIGHTS, TRUST_DEBATE_DECREMENT
+)
+
+
+class NeuronPopulation:
+    """
+    Holds the state of many neurons as parallel NumPy arrays so that one call to step()
+    does what Neuron.receive_input -> decide_to_fire -> enter_refractory/update_refractory/adapt
+    does for a single neuron. Narration is left to Neuron objects, which can be loaded from
+    and written back to a population whenever someone wants to hear their story.
+    """
+
+    # (name, dtype) for every per-neuron column; shared-memory and checkpoint code allocate from this.
+    FIELDS = (
+        ("potential", np.float64),
+        ("baseline_potential", np.float64),
+        ("threshold", np.float64),
+        ("baseline_threshold", np.float64),
+        ("refractory_offset", np.float64),
+        ("refractory_events", np.int32),
+        ("refractory_counter", np.int32),
+        ("in_refractory", np.bool_),
+        ("decay_factor", np.float64),
+        ("weight", np.float64),
+        ("history_length", np.int32),
+        ("quiet_streak", np.int32),  # consecutive inputs without firing, drives adapt()
+        ("asleep", np.bool_),
+    )
+
+    def __init__(self, size, threshold=DEFAULT_THRESHOLD, refractory_offset=DEFAULT_REFRACTORY_OFFSET,
+                 refractory_events=DEFAULT_REFRACTORY_EVENTS, decay_factor=DEFAULT_DECAY_FACTOR,
+                 weight=DEFAULT_WEIGHTS[0], history_length=5, buffers=None, clock=None):
+        self.size = size
+        self.clock = clock  # optional SimulationClock, advanced by every step() and whole-population idle()
+        for name, dtype in self.FIELDS:
+            if buffers is not None and name in buffers:
+                array = buffers[name]
+            else:
+                array = np.zeros(size, dtype=dtype)
+            setattr(self, name, array)
+        if buffers is None:
+            self.threshold[:] = threshold
+            self.baseline_threshold[:] = threshold
+            self.refractory_offset[:] = refractory_offset
+            self.refractory_events[:] = refractory_events
+            self.decay_factor[:] = decay_factor
+            self.weight[:] = weight
+            self.history_length[:] = history_length
+        self.fired = np.zeros(size, dtype=np.bool_)
+        self.steps = 0
+        # Scratch buffers reused by step() so a batch update allocates almost nothing
+        self._drive = np.zeros(size, dtype=np.float64)
+        self._receiving = np.zeros(size, dtype=np.bool_)
+        self._scratch = np.zeros(size, dtype=np.bool_)
+        self._scratch2 = np.zeros(size, dtype=np.bool_)
+
+    @classmethod
+    def from_neurons(cls, neurons):
+        """Gather the parameters and state of existing Neuron objects into one population."""
+        population = cls(len(neurons))
+        for i, neuron in enumerate(neurons):
+            population.load_neuron(i, neuron)
+        return population
+
+    def load_neuron(self, index, neuron):
+        self.potential[index] = neuron.potential
+        self.baseline_potential[index] = neuron.baseline_potential
+        self.threshold[index] = neuron.threshold
+        self.baseline_threshold[index] = neuron.baseline_threshold
+        self.refractory_offset[index] = neuron.refractory_offset
+        self.refractory_events[index] = neuron.refractory_events
+        self.refractory_counter[index] = neuron.refractory_counter
+        self.in_refractory[index] = neuron.in_refractory
+        self.decay_factor[index] = neuron.decay_factor
+        self.weight[index] = neuron.weights[0]
+        self.history_length[index] = neuron.history_length
+        self.quiet_streak[index] = neuron._history.quiet_streak if neuron._history is not None else 0
+        self.asleep[index] = neuron.asleep
+
+    def write_back(self, neurons):
+        """
+        Copy population state into Neuron objects so they can narrate where the batch left them.
+        The quiet streak that drives adapt() goes into the neuron's history counters; the history
+        entries themselves are not rebuilt here (Cluster.run_sharded replays those).
+        """
+        for i, neuron in enumerate(neurons):
+            neuron.potential = float(self.potential[i])
+            neuron.threshold = float(self.threshold[i])
+            neuron.refractory_offset = float(self.refractory_offset[i])
+            neuron.refractory_counter = int(self.refractory_counter[i])
+            neuron.in_refractory = bool(self.in_refractory[i])
+            neuron.decay_factor = float(self.decay_factor[i])
+            neuron.asleep = bool(self.asleep[i])
+            quiet_streak = int(self.quiet_streak[i])
+            if quiet_streak or neuron._history is not None:
+                neuron.history.quiet_streak = quiet_streak
+
+    def share(self):
+        """
+        Move every column into multiprocessing.shared_memory so worker processes can step slices
+        of this population in place. Returns the SharedMemory blocks (keep them alive, then
+        close() and unlink() them when done) and a picklable layout for attach().
+        """
+        blocks = []
+        layout = {"size": self.size, "columns": {}}
+        for name, dtype in self.FIELDS:
+            source = getattr(self, name)
+            block = shared_memory.SharedMemory(create=True, size=max(source.nbytes, 1))
+            shared = np.ndarray(self.size, dtype=dtype, buffer=block.buf)
+            shared[:] = source
+            setattr(self, name, shared)
+            blocks.append(block)
+            layout["columns"][name] = block.name
+        return blocks, layout
+
+    @classmethod
+    def attach(cls, layout, start=0, stop=None):
+        """
+        Open a population laid out by share() from another process, restricted to neurons
+        [start, stop). Returns the population and the SharedMemory blocks to close afterwards.
+        """
+        stop = layout["size"] if stop is None else stop
+        blocks = []
+        buffers = {}
+        for name, dtype in cls.FIELDS:
+            block = shared_memory.SharedMemory(name=layout["columns"][name])
+            blocks.append(block)
+            buffers[name] = np.ndarray(layout["size"], dtype=dtype, buffer=block.buf)[start:stop]
+        return cls(stop - start, buffers=buffers), blocks
+
+    def state(self, index):
+        """Snapshot of one neuron's columns as plain Python values."""
+        return {name: self.__dict__[name][index].item() for name, _ in self.FIELDS}
+
+    def sleep(self, indices=None):
+        self.asleep[slice(None) if indices is None else indices] = True
+
+    def wake(self, indices=None):
+        self.asleep[slice(None) if indices is None else indices] = False
+
+    def step(self, inputs, active=None, current=None):
+        """
+        Deliver one input to every neuron (or to those selected by the boolean mask `active`).
+        `inputs` may be a scalar or an array of length `size`. Asleep neurons ignore their input,
+        exactly as Neuron.receive_input does. Returns the boolean mask of neurons that fired.
+        `current` is input that is already weighted, such as synaptic current: it is added to
+        the potential as it is, not scaled by `weight`.
+
+        Every pass over the arrays is a plain in-place ufunc; updates that only concern some
+        neurons (firing, frustration, end of refractory) go through index lists so that their
+        cost scales with how many neurons actually changed, not with the population size.
+        """
+        receiving = self._receiving
+        np.logical_not(self.asleep, out=receiving)
+        if active is not None:
+            receiving &= active
+        every_neuron = bool(receiving.all())
+
+        # receive_input: decay the membrane potential, then add the weighted input
+        drive = np.multiply(self.weight, inputs, out=self._drive)
+        if current is not None:
+            drive += current
+        if every_neuron:
+            self.potential *= self.decay_factor
+            self.potential += drive
+        else:
+            drive += self.potential * self.decay_factor
+            np.copyto(self.potential, drive, where=receiving)
+        fired = np.greater_equal(self.potential, self.threshold, out=self.fired)
+        if not every_neuron:
+            fired &= receiving
+
+        # adapt bookkeeping: every receiving neuron is one input further from its last firing
+        if every_neuron:
+            self.quiet_streak += 1
+        else:
+            self.quiet_streak += receiving
+
+        # decide_to_fire -> enter_refractory: raise threshold, reset potential and counters
+        firing = np.flatnonzero(fired)
+        if firing.size:
+            self.in_refractory[firing] = True
+            self.threshold[firing] = self.baseline_threshold[firing] + self.refractory_offset[firing]
+            self.potential[firing] = self.baseline_potential[firing]
+            self.refractory_counter[firing] = 0
+            self.quiet_streak[firing] = 0
+
+        # adapt(fired=False): neurons quiet for history_length inputs lower their threshold.
+        # Those already resting at baseline would not change, so they are skipped.
+        frustrated = np.greater_equal(self.quiet_streak, self.history_length, out=self._scratch)
+        np.greater(frustrated, self.in_refractory, out=frustrated)  # "and not in refractory"
+        frustrated &= np.not_equal(self.threshold, self.baseline_threshold, out=self._scratch2)
+        if not every_neuron:
+            frustrated &= receiving
+        lowering = np.flatnonzero(frustrated)
+        if lowering.size:
+            self.threshold[lowering] = np.maximum(self.baseline_threshold[lowering],
+                                                  self.threshold[lowering] - TRUST_DEBATE_DECREMENT)
+
+        # update_refractory: count down the refractory period and return to baseline when it ends
+        counting = self.in_refractory if every_neuron else self.in_refractory & receiving
+        self.refractory_counter += counting
+        ended = np.greater_equal(self.refractory_counter, self.refractory_events, out=self._scratch)
+        ended &= counting
+        ending = np.flatnonzero(ended)
+        if ending.size:
+            self.threshold[ending] = self.baseline_threshold[ending]
+            self.in_refractory[ending] = False
+
+        self.steps += 1
+        if self.clock is not None:
+            self.clock.advance()
+        return fired
+
+    def idle(self, active=None):
+        """
+        One tick without input for every neuron (or those selected by `active`), as a Neuron on a
+        SimulationClock accounts for it: passive decay of the membrane potential and one tick of
+        refractory countdown. Asleep neurons are left alone. Nobody fires on an idle tick.
+        With `active` it covers only the neurons sitting out a tick that a step() then completes,
+        so only a whole-population idle() counts as a step and advances the clock.
+        """
+        resting = np.logical_not(self.asleep, out=self._receiving)
+        if active is not None:
+            resting &= active
+        decayed = np.multiply(self.potential, self.decay_factor, out=self._drive)
+        np.copyto(self.potential, decayed, where=resting)
+        counting = np.logical_and(self.in_refractory, resting, out=self._scratch2)
+        self.refractory_counter += counting
+        ended = np.greater_equal(self.refractory_counter, self.refractory_events, out=self._scratch)
+        ended &= counting
+        ending = np.flatnonzero(ended)
+        if ending.size:
+            self.threshold[ending] = self.baseline_threshold[ending]
+            self.in_refractory[ending] = False
+        self.fired[:] = False
+        if active is None:
+            self.steps += 1
+            if self.clock is not None:
+                self.clock.advance()
+        return self.fired
+
+    def fired_indices(self):
+        return np.flatnonzero(self.fired)
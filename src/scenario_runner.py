@@ -0,0 +1,123 @@
+"""
+Scenario Runner: Runs the scenarios of main.py, and seeded variants of them, across processes.
+
+Usage:
+    python src/scenario_runner.py [--scenarios NAME ...] [--variants N] [--processes P]
+                                  [--log-root DIR] [--shared-store] [--metrics]
+
+Each job is one scenario in one variant. It gets its own log directory
+(<log root>/<scenario>/variant-<n>), its own seed (main.scenario_seed(scenario, variant)) and,
+unless --shared-store is given, its own pattern database inside that directory, so it comes out
+the same whichever worker runs it and whatever ran before. The scenario's printed summary is
+captured in the worker and returned. All summaries are printed in job order and written to
+<log root>/summary.json.
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import time
+import traceback
+
+
+def run_scenario(job):
+    """Run one (scenario, variant, log_dir, isolate_store, with_metrics) job; returns its summary."""
+    name, variant, log_dir, isolate_store, with_metrics = job
+    import main
+    import metrics
+    from pattern_store import close_store
+    from patternwatcher_config import PATTERN_DB_PATH
+    os.makedirs(log_dir, exist_ok=True)
+    saved = main.LOG_DIR, main.PATTERN_DB
+    main.LOG_DIR = log_dir
+    # Isolated runs get main's default: a fresh store in their own log directory
+    main.PATTERN_DB = None if isolate_store else PATTERN_DB_PATH
+    if with_metrics:
+        metrics.reset()
+        metrics.enable()
+    output = io.StringIO()
+    error = None
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output):
+            seed = main.seed_scenario(name, variant)
+            main.SCENARIOS[name]()
+    except Exception:
+        seed = main.scenario_seed(name, variant)
+        error = traceback.format_exc()
+    finally:
+        seconds = time.perf_counter() - start
+        if with_metrics:
+            metrics.disable()
+        if isolate_store:
+            close_store(main.pattern_db_path())  # pool workers exit without running atexit handlers
+        main.LOG_DIR, main.PATTERN_DB = saved
+    return {
+        "scenario": name,
+        "variant": variant,
+        "seed": seed,
+        "log_dir": log_dir,
+        "ok": error is None,
+        "error": error,
+        "seconds": seconds,
+        "output": output.getvalue().splitlines(),
+        "files": sorted(os.listdir(log_dir)),
+        "metrics": metrics.metrics_snapshot() if with_metrics else None,
+    }
+
+
+def run_scenarios(scenarios=None, variants=1, log_root=None, processes=None, isolate_store=True, with_metrics=False):
+    """
+    Run every scenario (default: all of main.SCENARIOS) in variants 0..variants-1 on a pool of
+    `processes` workers (default: one per CPU; 1 runs in this process). Returns the summaries in
+    job order and writes them to <log_root>/summary.json.
+    """
+    import main
+    scenarios = list(scenarios or main.SCENARIOS)
+    unknown = [name for name in scenarios if name not in main.SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown scenario(s) {', '.join(unknown)}. Options: {', '.join(main.SCENARIOS)}.")
+    log_root = log_root or os.path.join("logs", "runs", time.strftime("%Y%m%d-%H%M%S"))
+    jobs = [
+        (name, variant, os.path.join(log_root, name, f"variant-{variant}"), isolate_store, with_metrics)
+        for name in scenarios
+        for variant in range(variants)
+    ]
+    processes = max(1, min(processes or os.cpu_count() or 1, len(jobs)))
+    if processes == 1:
+        summaries = [run_scenario(job) for job in jobs]
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            summaries = pool.map(run_scenario, jobs, chunksize=1)
+    os.makedirs(log_root, exist_ok=True)
+    with open(os.path.join(log_root, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump({"processes": processes, "jobs": summaries}, f, indent=2)
+    return summaries
+
+
+def print_summaries(summaries):
+    for summary in summaries:
+        status = "ok" if summary["ok"] else "FAILED"
+        print(f"== {summary['scenario']} (variant {summary['variant']}, seed {summary['seed']}): {status} in {summary['seconds']:.2f}s -> {summary['log_dir']}")
+        for line in summary["output"]:
+            print(f"   {line}")
+        if summary["error"]:
+            print(summary["error"])
+    failed = sum(not summary["ok"] for summary in summaries)
+    print(f"{len(summaries) - failed}/{len(summaries)} scenario runs succeeded.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run narrative neuron scenarios in parallel, deterministically.")
+    parser.add_argument("--scenarios", nargs="+", help="scenario names (default: all)")
+    parser.add_argument("--variants", type=int, default=1, help="seeded variants per scenario")
+    parser.add_argument("--processes", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--log-root", help="directory for this run's logs (default: logs/runs/<time>)")
+    parser.add_argument("--shared-store", action="store_true", help="let scenarios learn in the shared patterns/pattern_db.sqlite3")
+    parser.add_argument("--metrics", action="store_true", help="record metrics.metrics_snapshot() per run")
+    args = parser.parse_args()
+    summaries = run_scenarios(args.scenarios, args.variants, args.log_root, args.processes, not args.shared_store, args.metrics)
+    print_summaries(summaries)
+    raise SystemExit(0 if all(summary["ok"] for summary in summaries) else 1)
@@ -0,0 +1,99 @@
+"""
+Sweep: Simulates many neuron configurations against the same stimulus at once.
+"""
+import itertools
+from collections import namedtuple
+import numpy as np
+from config import SWEEP_RATE_WINDOW
+from population import NeuronPopulation
+
+# Parameters a sweep can vary, with the population column each one sets
+SWEEP_PARAMETERS = {
+    "threshold": ("threshold", "baseline_threshold"),
+    "decay_factor": ("decay_factor",),
+    "refractory_offset": ("refractory_offset",),
+    "refractory_events": ("refractory_events",),
+    "weight": ("weight",),
+    "history_length": ("history_length",),
+}
+
+SweepResult = namedtuple("SweepResult", "parameters fire_counts firing_rates final_thresholds final_potentials")
+
+
+def parameter_grid(**values):
+    """
+    Every combination of the given parameter values, as one array per parameter, e.g.
+    parameter_grid(threshold=[0.8, 1.0], decay_factor=[0.9, 0.95]) describes four configs.
+    """
+    names = list(values)
+    combinations = list(itertools.product(*(np.asarray(values[name]).ravel().tolist() for name in names)))
+    return {name: np.array([combination[i] for combination in combinations]) for i, name in enumerate(names)}
+
+
+def sweep(parameters, stimulus, grid=True, rate_window=SWEEP_RATE_WINDOW):
+    """
+    Run every configuration over `stimulus` and report how each behaved.
+
+    `parameters` maps names from SWEEP_PARAMETERS to values; with `grid` every combination
+    is a configuration (see parameter_grid), otherwise the values are already one array entry
+    per configuration. Parameters not given keep the Neuron defaults.
+
+    `stimulus` holds one input per tick, shared by all configurations, or has shape
+    (ticks, configurations). A None or NaN entry is a tick without input, which decays the
+    potential and counts down refractory periods as a Neuron on a SimulationClock would.
+
+    All configurations are rows of one NeuronPopulation, so each tick is a single vectorized
+    step whatever the number of configurations. Returns a SweepResult of arrays indexed by
+    configuration: `parameters` (the value of every swept parameter), `fire_counts`,
+    `firing_rates` (configurations x ticks: share of the last `rate_window` ticks that fired, or
+    of all ticks so far while there are fewer), `final_thresholds` and `final_potentials`.
+    """
+    if rate_window < 1:
+        raise ValueError("rate_window must be at least one tick")
+    unknown = [name for name in parameters if name not in SWEEP_PARAMETERS]
+    if unknown:
+        raise ValueError(f"Cannot sweep {', '.join(unknown)}. Options: {', '.join(SWEEP_PARAMETERS)}.")
+    if grid:
+        parameters = parameter_grid(**parameters)
+    else:
+        parameters = {name: np.asarray(values).ravel() for name, values in parameters.items()}
+    sizes = {len(values) for values in parameters.values()}
+    if len(sizes) > 1:
+        raise ValueError("Every parameter needs one value per configuration")
+    size = sizes.pop() if sizes else 1
+
+    population = NeuronPopulation(size)
+    for name, values in parameters.items():
+        for column in SWEEP_PARAMETERS[name]:
+            getattr(population, column)[:] = values
+
+    stimulus = np.array([np.nan if value is None else value for value in stimulus] if isinstance(stimulus, (list, tuple)) else stimulus, dtype=np.float64)
+    ticks = len(stimulus)
+    idle = np.isnan(stimulus) if stimulus.ndim == 1 else np.isnan(stimulus).all(axis=1)
+    fired = np.zeros((ticks, size), dtype=np.bool_)
+    for tick in range(ticks):
+        if idle[tick]:
+            population.idle()
+            continue
+        inputs = stimulus[tick]
+        if stimulus.ndim == 1:
+            fired[tick] = population.step(inputs)
+        else:
+            # Configurations whose input is missing this tick sit it out
+            receiving = ~np.isnan(inputs)
+            population.idle(~receiving)
+            fired[tick] = population.step(np.nan_to_num(inputs), receiving)
+
+    # Windowed firing rate from a running count: fires in (t - window, t], over the ticks in it
+    running = np.cumsum(fired, axis=0, dtype=np.int32)
+    windowed = running.copy()
+    windowed[rate_window:] -= running[:-rate_window]
+    spans = np.minimum(np.arange(1, ticks + 1), rate_window)
+    firing_rates = (windowed / spans[:, None]).T
+    return SweepResult(
+        parameters=parameters,
+        fire_counts=running[-1].copy() if ticks else np.zeros(size, dtype=np.int32),
+        firing_rates=firing_rates,
+        final_thresholds=population.threshold.copy(),
+        final_potentials=population.potential.copy(),
+    )
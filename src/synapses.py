@@ -0,0 +1,118 @@
+"""
+Synapses: Sparse connectivity that lets neurons of a NeuronPopulation drive each other.
+"""
+import numpy as np
+from config import SYNAPSE_DEFAULT_WEIGHT, SYNAPSE_DEFAULT_DELAY
+
+
+class Synapses:
+    """
+    Connections between the neurons of one population in CSR form: the outgoing synapses of
+    neuron i are entries indptr[i]:indptr[i + 1] of `targets`, `weights` and `delays`.
+
+    A spike sent along a synapse with delay d arrives d ticks later. Arrivals wait in a ring
+    of `max_delay` per-neuron input rows; propagate() adds every spike of a tick into that
+    ring with one scatter-add, and arriving() hands over the row that is due.
+    """
+
+    def __init__(self, size, indptr, targets, weights, delays):
+        self.size = size
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.delays = np.asarray(delays, dtype=np.int64)
+        if self.delays.size and self.delays.min() < 1:
+            raise ValueError("Synaptic delays must be at least one tick")
+        self.max_delay = int(self.delays.max()) if self.delays.size else 1
+        self._pending = np.zeros((self.max_delay, size), dtype=np.float64)
+        self._cursor = 0  # ring row holding the input due this tick
+        # Where each synapse lands in the flattened ring, relative to the current row
+        self._landing = self.delays * size + self.targets
+
+    @classmethod
+    def from_edges(cls, size, pre, post, weights=SYNAPSE_DEFAULT_WEIGHT, delays=SYNAPSE_DEFAULT_DELAY):
+        """Build connectivity from parallel arrays of (presynaptic, postsynaptic) indices."""
+        pre = np.asarray(pre, dtype=np.int64)
+        post = np.asarray(post, dtype=np.int64)
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), pre.shape)
+        delays = np.broadcast_to(np.asarray(delays, dtype=np.int64), pre.shape)
+        order = np.argsort(pre, kind="stable")
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pre, minlength=size), out=indptr[1:])
+        return cls(size, indptr, post[order], weights[order], delays[order])
+
+    @classmethod
+    def random(cls, size, fan_out, weight=SYNAPSE_DEFAULT_WEIGHT, max_delay=SYNAPSE_DEFAULT_DELAY, seed=None):
+        """
+        Connect every neuron to `fan_out` random others with delays drawn from 1..max_delay. A
+        single neuron has no others to reach, so it gets no synapses.
+        """
+        if size < 0 or fan_out < 0:
+            raise ValueError("size and fan_out cannot be negative")
+        rng = np.random.default_rng(seed)
+        if size < 2:
+            fan_out = 0
+        pre = np.repeat(np.arange(size, dtype=np.int64), fan_out)
+        post = rng.integers(0, size - 1, size=pre.size)
+        post += post >= pre  # no neuron synapses onto itself
+        delays = rng.integers(1, max_delay + 1, size=pre.size)
+        return cls.from_edges(size, pre, post, weight, delays)
+
+    @property
+    def count(self):
+        return self.targets.size
+
+    def outgoing(self, index):
+        """(targets, weights, delays) of one neuron's synapses."""
+        span = slice(self.indptr[index], self.indptr[index + 1])
+        return self.targets[span], self.weights[span], self.delays[span]
+
+    def propagate(self, fired):
+        """
+        Send a spike from every neuron in `fired` (indices or a boolean mask) along all of its
+        synapses; call it once per tick, after arriving(). The synapses of all firing neurons are
+        gathered at once and their weights scatter-added into the arrival ring, so the cost
+        follows the number of synapses used, not the number of neurons.
+        """
+        fired = np.asarray(fired)
+        if fired.dtype == np.bool_:
+            fired = np.flatnonzero(fired)
+        if not fired.size:
+            return
+        starts = self.indptr[fired]
+        counts = self.indptr[fired + 1] - starts
+        total = int(counts.sum())
+        if not total:
+            return
+        # Synapse ids of all firing neurons: each neuron's run of consecutive ids, laid end to end
+        run_offsets = np.cumsum(counts) - counts
+        synapses = np.arange(total, dtype=np.int64) + np.repeat(starts - run_offsets, counts)
+        # arriving() has already moved the cursor on, so a delay of d lands d - 1 rows past it
+        landing = self._landing[synapses]
+        landing += (self._cursor - 1) * self.size
+        landing %= self._pending.size
+        np.add.at(self._pending.reshape(-1), landing, self.weights[synapses])
+
+    def arriving(self):
+        """Synaptic input due this tick (one value per neuron). Advances the ring to the next tick."""
+        row = self._pending[self._cursor]
+        arrived = row.copy()
+        row[:] = 0.0
+        self._cursor = (self._cursor + 1) % self._pending.shape[0]
+        return arrived
+
+    def step(self, population, inputs=0.0):
+        """
+        Advance `population` one tick: deliver `inputs` plus whatever synaptic input is due,
+        then propagate the resulting spikes. Returns the fired mask, like NeuronPopulation.step.
+        Synaptic input is scaled by the synapse weights only; the neurons' own `weight` applies
+        to `inputs`.
+        """
+        fired = population.step(inputs, current=self.arriving())
+        self.propagate(fired)
+        return fired
+
+    def reset(self):
+        """Drop every spike still in flight."""
+        self._pending[:] = 0.0
+        self._cursor = 0
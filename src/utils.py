@@ -2,11 +2,24 @@
 Utils: Narrative logging, Markdown folds, serialization, helpers.
 """
 import datetime
+import random
+import uuid
 
 def narrative_log(log, message):
     timestamp = datetime.datetime.now().isoformat()
     log.append(f"- {timestamp}: {message}")
 
+# Ids come from a generator of their own, so creating objects never shifts a scenario's draws from `random`
+_ids = random.Random()
+
+def seed_ids(seed):
+    """Make new_id() repeat the same ids, e.g. for each seeded scenario run."""
+    _ids.seed(seed)
+
+def new_id():
+    """A random uuid4 string; seed_ids() (as main.seed_scenario does) makes neuron and watcher ids repeat from run to run."""
+    return str(uuid.UUID(int=_ids.getrandbits(128), version=4))
+
 # Markdown fold helpers
 def markdown_fold(title, content):
     return f"<details><summary>{title}</summary>\n{content}\n</details>"
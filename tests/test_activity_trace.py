@@ -0,0 +1,53 @@
+import os
+import re
+from activity_trace import TRACE_META, TraceReader, TraceSink, TraceWriter
+from clock import SimulationClock
+from log_sinks import MemorySink, TeeSink
+from narration import render_message
+from neuron import Neuron
+
+THRESHOLD_CHANGES = ("fire", "reset", "no_fire", "frustrated", "refractory_enter", "refractory_end")
+
+
+def test_replay_tells_threshold_changes_in_the_order_the_neuron_did(tmp_path):
+    writer = TraceWriter(str(tmp_path), segment_rows=8, buffer_rows=4)
+    memory = MemorySink()
+    clock = SimulationClock()
+    neuron = Neuron(history_length=2, log_sink=TeeSink(memory, TraceSink(writer)), clock=clock)
+    for value in (2, 0, 0, 0, 0, 0.1, 0.1, 0.1, 0.1, 3, 0.1):
+        neuron.receive_input(value)
+        clock.advance()
+    writer.close()
+    told = [render_message(record) for record in memory.records if record[2] in THRESHOLD_CHANGES]
+    replayed = [re.sub(r"^- \[tick \d+\] (\*\*\w+\*\*: )?", "", line) for line in TraceReader(str(tmp_path)).narrate(neuron.id)]
+    assert [line for line in replayed if not line.startswith(("Received input", "My threshold is"))] == told
+    assert any("frustrated" in line for line in told) and any("Entering refractory" in line for line in told)
+
+
+def test_metadata_is_written_on_segment_rollover_and_close_only(tmp_path):
+    writer = TraceWriter(str(tmp_path), segment_rows=4, buffer_rows=2)
+    for tick in range(3):
+        writer.append(tick, 0, 0)
+    writer.flush()
+    assert not os.path.exists(tmp_path / TRACE_META)
+    for tick in range(3, 6):
+        writer.append(tick, 0, 0)
+    writer.flush()
+    assert len(TraceReader(str(tmp_path))) == 4  # the filled segment only
+    writer.close()
+    assert len(TraceReader(str(tmp_path))) == 6
+
+
+def test_replay_given_the_clock_stamps_lines_as_the_live_log_does(tmp_path):
+    writer = TraceWriter(str(tmp_path))
+    memory = MemorySink()
+    clock = SimulationClock()
+    neuron = Neuron(log_sink=TeeSink(memory, TraceSink(writer)), clock=clock)
+    neuron.log_mode = "diagnostic"
+    for value in (2, 0, 0, 3):
+        neuron.receive_input(value)
+        clock.advance()
+    writer.close()
+    live = [neuron.render_line(record) for record in memory.records if record[2] in THRESHOLD_CHANGES]
+    replayed = [line for line in TraceReader(str(tmp_path)).narrate(neuron.id, clock=clock) if line in live]
+    assert replayed == live and re.match(r"- \[\d\d:\d\d:\d\d tick \d+\] ", live[0])
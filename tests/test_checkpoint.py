@@ -0,0 +1,53 @@
+import asyncio
+from checkpoint import Checkpointer, _gather_neurons
+from dispatcher import Dispatcher
+from neuron import Neuron
+
+
+def _stimulate(neurons, value):
+    for neuron in neurons:
+        neuron.receive_input(value)
+
+
+def test_a_save_after_restoring_an_older_checkpoint_is_a_delta_against_that_one(tmp_path):
+    checkpointer = Checkpointer(str(tmp_path))
+    neurons = [Neuron(log_sink="null"), Neuron(threshold=1.5, log_sink="null")]
+    _stimulate(neurons, 0.2)  # histories allocated, so later saves keep the row layout and can be deltas
+    first = checkpointer.save(neurons)
+    _stimulate(neurons, 0.7)
+    checkpointer.save(neurons)
+    _stimulate(neurons, 0.9)
+    checkpointer.save(neurons)
+
+    rolled_back = checkpointer.restore(first, log_sink="null").neurons
+    _stimulate(rolled_back[:1], 0.4)  # only one neuron differs from the checkpoint it came from
+    saved = checkpointer.save(rolled_back)
+    assert checkpointer._manifest(saved)["base"] == first
+
+    restored = Checkpointer(str(tmp_path)).restore(saved, log_sink="null").neurons
+    assert _gather_neurons(restored).tobytes() == _gather_neurons(rolled_back).tobytes()
+
+
+def test_restored_neurons_get_a_memory_sink_each(tmp_path):
+    checkpointer = Checkpointer(str(tmp_path))
+    checkpointer.save([Neuron(log_sink="null"), Neuron(log_sink="null")])
+    first, second = checkpointer.restore(log_sink="memory").neurons
+    first.log_event("only mine")
+    assert first.log_sink is not second.log_sink
+    assert not second.records
+
+
+def test_queued_events_are_saved_and_left_in_the_queue(tmp_path):
+    async def scenario():
+        dispatcher = Dispatcher()
+        neuron = Neuron(log_sink="null")
+        dispatcher.register(neuron)
+        for value in (0.1, 0.2, 0.3):
+            await dispatcher.emit(value, source="s")
+        Checkpointer(str(tmp_path)).save([neuron], dispatcher=dispatcher)
+        restored = Checkpointer(str(tmp_path)).restore(log_sink="null").dispatcher
+        return dispatcher, restored
+
+    dispatcher, restored = asyncio.run(scenario())
+    assert [event["value"] for event in restored.queued_events()] == [0.1, 0.2, 0.3]
+    assert dispatcher.event_queue.qsize() == 3 and dispatcher.event_queue._unfinished_tasks == 3
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from clock import SimulationClock
+from cluster import Cluster
+from neuron import Neuron
+
+
+def _neurons(clock=None):
+    neurons = []
+    for i in range(6):
+        neuron = Neuron(threshold=0.9 + 0.1 * i, history_length=2 + i % 3, refractory_events=1 + i % 2,
+                        decay_factor=0.85 + 0.02 * i, log_sink="null", clock=clock)
+        # Some history before the run, so quiet streaks and ring buffers are already in use
+        for value in (0.2, 0.1, 0.05):
+            neuron.receive_input(value)
+        neurons.append(neuron)
+    neurons[4].sleep()
+    return neurons
+
+
+def _listen(neurons):
+    heard = []
+    for index, neuron in enumerate(neurons):
+        neuron.fire_listeners.append(lambda neuron, index=index: heard.append((index, neuron.tick)))
+    return heard
+
+
+def _state(neuron):
+    return (neuron.potential, neuron.threshold, neuron.refractory_counter, neuron.in_refractory,
+            neuron.tick, neuron.asleep, list(neuron.history), neuron.history.quiet_streak, neuron.history.fire_count)
+
+
+@pytest.mark.parametrize("clocked", [False, True])
+def test_sharded_run_matches_serial_run(clocked):
+    stimulus = np.random.default_rng(7).uniform(0.0, 0.7, size=(40, 6))
+    serial_clock = SimulationClock() if clocked else None
+    serial = _neurons(serial_clock)
+    serial_heard = _listen(serial)
+    for inputs in stimulus:
+        for neuron, value in zip(serial, inputs.tolist()):
+            neuron.receive_input(value)
+        if serial_clock is not None:
+            serial_clock.advance()
+
+    sharded = _neurons(SimulationClock() if clocked else None)
+    sharded_heard = _listen(sharded)
+    cluster = Cluster(sharded)
+    fire_ticks, fire_indices = cluster.run_sharded(stimulus, workers=2)
+
+    assert [_state(neuron) for neuron in sharded] == [_state(neuron) for neuron in serial]
+    assert sharded_heard == serial_heard
+    assert len(fire_ticks) == len(serial_heard)
+    if clocked:
+        assert cluster.clock.now == serial_clock.now
@@ -0,0 +1,42 @@
+import random
+import pytest
+from cofiring import CoFiringTracker
+from neuron import Neuron
+
+
+def test_a_growing_group_grows_its_cluster_instead_of_forming_another():
+    neurons = [Neuron(log_sink="null") for _ in range(3)]
+    tracker = CoFiringTracker()
+    for tick in range(1, 30):
+        tracker.observe(tick, neurons if tick > 10 else neurons[:2])
+        tracker.detect()
+    assert len(tracker.clusters) == 1
+    assert {neuron.id for neuron in tracker.clusters[0].neurons} == {neuron.id for neuron in neurons}
+
+
+def test_groups_bridged_by_a_neuron_merge_into_one_cluster():
+    neurons = [Neuron(log_sink="null") for _ in range(5)]
+    tracker = CoFiringTracker()
+    for tick in range(1, 30):
+        # Two groups firing at different ticks
+        tracker.observe(tick, neurons[:2] if tick % 2 else neurons[3:])
+        tracker.detect()
+    assert len(tracker.clusters) == 2
+    for tick in range(30, 80):
+        tracker.observe(tick, neurons)  # now everyone, neuron 2 included, fires together
+        tracker.detect()
+    assert len(tracker.clusters) == 1
+    assert {neuron.id for neuron in tracker.clusters[0].neurons} == {neuron.id for neuron in neurons}
+
+
+def test_pair_scores_match_a_full_recount_every_tick():
+    rng = random.Random(0)
+    neurons = [Neuron(log_sink="null") for _ in range(6)]
+    tracker = CoFiringTracker(window=12, decay=0.5)  # decays fast enough to move the epoch along too
+    for tick in range(1, 600):
+        tracker.observe(tick, [neuron for i, neuron in enumerate(neurons) if rng.random() < (0.9 if i < 3 else 0.3)])
+        tracker.detect()
+        for (first, second), score in tracker.pair_scores.items():
+            common = set(tracker._fires[first]) & set(tracker._fires[second])
+            assert tracker.pair_score(first, second) == pytest.approx(sum(0.5 ** (tick - fired) for fired in common))
+    assert tracker.pair_scores and tracker._epoch > 0
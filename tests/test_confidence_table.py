@@ -0,0 +1,32 @@
+import random
+import pytest
+from confidence_table import ConfidenceTable
+
+
+def test_lazy_shifts_match_clamping_every_entry_each_time():
+    rng = random.Random(0)
+    table, naive = ConfidenceTable(), {}
+    patterns = [f"p{i}" for i in range(8)]
+    for _ in range(2000):
+        roll = rng.random()
+        if roll < 0.4:
+            pattern, confidence = rng.choice(patterns), rng.random()
+            table[pattern] = naive[pattern] = confidence
+        elif roll < 0.95:
+            delta = rng.uniform(-0.3, 0.3)
+            table.shift_all(delta)
+            naive = {pattern: min(1.0, max(0.0, value + delta)) for pattern, value in naive.items()}
+        elif naive:
+            pattern = rng.choice(sorted(naive))
+            del table[pattern], naive[pattern]
+        assert dict(table.items()) == pytest.approx(naive)
+
+
+def test_patterns_not_held_are_asked_of_the_fallback_once():
+    asked = []
+    table = ConfidenceTable(fallback=lambda pattern: asked.append(pattern) or (0.7 if pattern == "known" else None))
+    table.shift_all(-0.5)  # shifts before a pattern is loaded do not apply to it
+    assert table["known"] == 0.7 and "known" in table and "unknown" not in table
+    assert asked == ["known", "unknown"]
+    with pytest.raises(KeyError):
+        table["unknown"]
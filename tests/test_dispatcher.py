@@ -0,0 +1,67 @@
+import numpy as np
+from checkpoint import _gather_neurons
+from clock import SimulationClock
+from dispatcher import Dispatcher
+from neuron import Neuron
+from utils import seed_ids
+
+
+def _network():
+    seed_ids(0)  # the same ids in both networks, so their narration compares equal
+    clock = SimulationClock()
+    dispatcher = Dispatcher(clock=clock)
+    neurons = [Neuron(threshold=0.8 + 0.2 * i, history_length=3, log_sink="memory") for i in range(4)]
+    dispatcher.register(neurons[0])
+    dispatcher.register(neurons[1], sources=["a"])
+    dispatcher.register(neurons[2], sources=["b"], input_types=["burst"])
+    dispatcher.register(neurons[3], input_types=["burst"])
+    events = [{'value': 0.3 + 0.1 * (i % 7), 'source': "ab"[i % 2], 'input_type': "burst" if i % 5 == 0 else "generic", 'metadata': None}
+              for i in range(40)]
+    return clock, dispatcher, neurons, events
+
+
+def test_a_clocked_batch_lands_as_if_delivered_one_event_per_tick(monkeypatch):
+    clock, dispatcher, neurons, events = _network()
+    for event in events:
+        dispatcher.deliver(event)
+    batched_clock, batched_dispatcher, batched_neurons, _ = _network()
+    inboxes = []
+    receive_batch = Neuron.receive_batch
+    monkeypatch.setattr(Neuron, "receive_batch", lambda neuron, inbox, ticks=None: inboxes.append(len(inbox)) or receive_batch(neuron, inbox, ticks))
+    for start in range(0, len(events), 16):
+        batched_dispatcher.deliver_batch(events[start:start + 16])
+    assert len(inboxes) == 3 * len(neurons)  # one inbox per neuron per batch
+    assert batched_clock.now == clock.now == len(events)
+    assert _gather_neurons(batched_neurons).tobytes() == _gather_neurons(neurons).tobytes()
+    for batched, single in zip(batched_neurons, neurons):
+        assert [record[:4] for record in batched.records] == [record[:4] for record in single.records]
+
+
+
+def test_reading_another_neuron_during_a_batch_changes_neither_of_them():
+    def network():
+        seed_ids(0)
+        clock = SimulationClock()
+        dispatcher = Dispatcher(clock=clock)
+        reader, read = Neuron(threshold=0.5, log_sink="memory"), Neuron(threshold=50, log_sink="memory")
+        dispatcher.register(reader, sources=["a"])
+        dispatcher.register(read, sources=["b"])
+        reader.fire_listeners.append(lambda neuron: read.potential)  # catches `read` up to the clock
+        return clock, dispatcher, [reader, read]
+    # `reader` comes first in each batch and fires after the events `read` has yet to hear
+    events = [{'value': 1.0, 'source': "ab"[i % 8 in (1, 2, 3)], 'input_type': "generic", 'metadata': None} for i in range(32)]
+    _, dispatcher, neurons = network()
+    for event in events:
+        dispatcher.deliver(event)
+    _, batched_dispatcher, batched_neurons = network()
+    for start in range(0, len(events), 8):
+        batched_dispatcher.deliver_batch(events[start:start + 8])
+    assert any(record[2] == "fire" for record in neurons[0].records)
+    for neuron in neurons + batched_neurons:
+        neuron.catch_up()  # the reads caught `read` up to different ticks; what it owes is the same
+    batched, single = _gather_neurons(batched_neurons), _gather_neurons(neurons)
+    for column in single.dtype.names:
+        assert np.allclose(batched[column], single[column]), column  # decay split at other ticks rounds differently
+    for batched_neuron, neuron in zip(batched_neurons, neurons):
+        assert [record[:3] for record in batched_neuron.records if record[1] is not None] == \
+            [record[:3] for record in neuron.records if record[1] is not None]
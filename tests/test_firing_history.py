@@ -0,0 +1,28 @@
+import random
+import pytest
+from firing_history import FiringHistory
+
+
+def test_the_ring_keeps_the_newest_entries_and_its_counters_across_wraparound():
+    rng = random.Random(0)
+    history, entries = FiringHistory(5), []
+    for tick in range(23):
+        entry = (tick, rng.random(), rng.random() < 0.4)
+        history.append(*entry)
+        entries.append(entry)
+        kept = entries[-5:]
+        assert list(history) == kept
+        assert history.fire_count == sum(fired for _, _, fired in kept)
+        quiet = next((i for i, (_, _, fired) in enumerate(reversed(entries)) if fired), len(entries))
+        assert history.quiet_streak == quiet  # counts past the entries the ring still holds
+        assert history.last_fired == entry[2]
+        assert history[0] == kept[0] and history[-1] == entry
+        assert history.recent(3) == kept[-3:]
+        assert history.firing_ticks(3) == [tick for tick, _, fired in kept[-3:] if fired]
+    with pytest.raises(IndexError):
+        history[5]
+
+
+def test_an_empty_history_has_not_fired():
+    history = FiringHistory(3)
+    assert len(history) == 0 and not history.last_fired and history.firing_ticks() == []
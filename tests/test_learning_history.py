@@ -0,0 +1,26 @@
+from learning_history import LearningHistory
+from pattern_store import PatternStore
+
+
+def test_overflow_spills_to_the_store_and_reloads_with_the_rest(tmp_path):
+    store = PatternStore(str(tmp_path / "patterns.sqlite3"))
+    history = LearningHistory(3, lambda: store, "w1")
+    for n in range(5):
+        history.append({"event": "learning", "neuron_id": f"n{n % 2}", "n": n})
+    assert [entry["n"] for entry in history] == [2, 3, 4]
+    assert [entry["n"] for entry in history.entries()] == [0, 1, 2, 3, 4]
+    assert [entry["n"] for entry in history.entries(neuron_id="n0")] == [0, 2, 4]
+    history.persist()
+    history.append({"event": "learning", "n": 5})  # 2 leaves memory; persist() already wrote it
+    store.close()
+    reopened = PatternStore(str(tmp_path / "patterns.sqlite3"))
+    assert [entry["n"] for entry in reopened.learning(watcher="w1")] == [0, 1, 2, 3, 4]
+
+
+def test_without_a_store_the_oldest_entries_are_forgotten():
+    history = LearningHistory(3, lambda: None, "w1")
+    for n in range(5):
+        history.append(n)
+    history.persist()
+    assert [entry["value"] for entry in history] == [2, 3, 4]
+    assert [entry["value"] for entry in history.entries()] == [2, 3, 4]
@@ -0,0 +1,23 @@
+from log_export import LogExporter
+from neuron import Neuron
+from neuron_pattern_interface import NeuronPatternInterface
+from pattern_watcher import PatternWatcher
+
+
+def test_the_export_matches_the_in_memory_logs_and_frees_them(tmp_path):
+    watcher = PatternWatcher(NeuronPatternInterface(log_sink="null"), log_sink="memory")
+    neurons = [Neuron(log_sink="memory") for _ in range(3)]
+    for neuron in neurons:
+        neuron.receive_input(1.2)
+        watcher.monitor_bounds(neuron)
+    watcher.discover_pattern("burst")
+    expected = "\n\n".join(["\n".join(watcher.log)] + [neuron.markdown_log() for neuron in neurons])
+    path = tmp_path / "run.md"
+    with LogExporter(str(path), log_mode="diagnostic") as exporter:
+        exporter.write_watcher(watcher)
+        exporter.write_neurons(neurons)
+        assert watcher.records == [] and all(neuron.records == [] for neuron in neurons)
+        neurons[0].receive_input(0.1)
+        later = neurons[0].markdown_log()
+        exporter.write_neuron(neurons[0])  # only what it narrated since
+    assert path.read_text(encoding="utf-8") == expected + "\n\n" + later
@@ -0,0 +1,46 @@
+import io
+import pytest
+from log_sinks import NULL_SINK, BufferedFileSink, MemorySink, StdoutSink, TeeSink, resolve_sink
+from neuron import Neuron
+
+
+def test_sink_names_resolve_to_sinks():
+    assert resolve_sink("null") is NULL_SINK
+    first, second = resolve_sink("memory"), resolve_sink("memory")
+    assert isinstance(first, MemorySink) and first is not second  # memory is per owner
+    tee = resolve_sink("null+memory+memory")
+    assert isinstance(tee, TeeSink) and len(tee.sinks) == 2 and tee.enabled
+    with pytest.raises(ValueError):
+        resolve_sink("printer")
+
+
+def test_a_silent_neuron_records_and_prints_nothing(capsys):
+    neuron = Neuron(log_sink="null")
+    for value in (0.5, 1.5, 0.0):
+        neuron.receive_input(value)
+    assert neuron.records == () and neuron.log == []
+    assert capsys.readouterr().out == ""
+
+
+def test_the_console_sink_holds_back_lines_past_its_rate_and_says_how_many():
+    stream = io.StringIO()
+    sink = StdoutSink(max_per_second=2, stream=stream)
+    memory = MemorySink()
+    neuron = Neuron(log_sink=TeeSink(memory, sink))
+    neuron.receive_input(0.1)
+    sink.close()
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 3 and "I am born" in lines[0]
+    assert lines[-1] == f"... {len(memory.records) - 2} narration events suppressed to keep the console readable."
+
+
+def test_the_file_sink_writes_in_batches(tmp_path):
+    path = tmp_path / "narration.log"
+    sink = BufferedFileSink(str(path), buffer_size=100)
+    neuron = Neuron(log_sink=sink)
+    neuron.receive_input(0.1)
+    assert path.read_text() == ""
+    sink.close()
+    lines = path.read_text().splitlines()
+    assert len(lines) > 1
+    assert lines[0].startswith("- [tick 0] ") and "I am born as Neuron" in lines[0]
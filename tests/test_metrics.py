@@ -0,0 +1,24 @@
+import metrics
+from neuron import Neuron
+
+
+def test_enable_counts_the_hot_paths_and_disable_puts_the_originals_back():
+    original = Neuron.__dict__["receive_input"]
+    neuron = Neuron(log_sink="null")
+    metrics.reset()
+    metrics.enable()
+    try:
+        assert Neuron.__dict__["receive_input"] is not original
+        for value in (2, 0, 0):
+            neuron.receive_input(value)
+        snapshot = metrics.metrics_snapshot()
+    finally:
+        metrics.disable()
+    assert snapshot["enabled"] and snapshot["counters"]["neuron.inputs"] == 3
+    assert snapshot["counters"]["neuron.fires"] == 1
+    assert snapshot["timers"]["Neuron.receive_input"]["calls"] == 3
+    assert Neuron.__dict__["receive_input"] is original
+    neuron.receive_input(2)
+    after = metrics.metrics_snapshot()
+    assert not after["enabled"] and after["counters"]["neuron.inputs"] == 3
+    metrics.reset()
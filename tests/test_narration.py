@@ -0,0 +1,23 @@
+import narration
+from narration import format_stamp, render_message
+from neuron import Neuron
+
+
+def test_records_keep_values_and_are_rendered_only_when_read(monkeypatch):
+    rendered = []
+    monkeypatch.setitem(narration.TEMPLATES, "fire", lambda *args: rendered.append(args) or f"fired {args[0]}")
+    neuron = Neuron(threshold=1.0, log_sink="memory")
+    neuron.receive_input(1.5)
+    fire = next(record for record in neuron.records if record[2] == "fire")
+    assert fire[:2] == (1, "fire") and fire[3][:2] == (1.5, 1.0)
+    assert rendered == []
+    assert any(line.endswith("fired 1.5") for line in neuron.log)
+    assert len(rendered) == 1
+
+
+def test_templates_render_as_sentences_and_free_text_as_is():
+    assert render_message((3, None, "threshold", (0.8,), None, None)) == "My threshold is currently 0.8."
+    assert render_message((3, None, "history", ([],), None, None)).endswith("No recent firings.")
+    assert render_message((3, None, "trust_changed", ("n1", 0.5, 0.25, "misfire"), None, None)).endswith("Reason: misfire")
+    assert render_message((3, "note", None, "Just text.", None, None)) == "Just text."
+    assert format_stamp(7) == "tick 7"
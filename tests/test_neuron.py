@@ -0,0 +1,20 @@
+from neuron import Neuron
+
+
+def test_the_log_renders_new_records_only_and_matches_a_full_render(monkeypatch):
+    neuron = Neuron(log_sink="memory")
+    for value in (0.4, 0.9, 0.2):
+        neuron.receive_input(value)
+    neuron.log_event("Recovered my threshold.", event_type="recovery", extra={"param": "threshold", "value": 1.0})
+    assert neuron.log == neuron._grouped()[3]
+    neuron.log_event("Recovered my threshold.", event_type="recovery", extra={"param": "threshold", "value": 1.0})  # shown once
+    neuron.log_event("Slow down.", event_type="lesson_learned")
+    neuron.receive_input(1.5)
+    neuron.log.append("A line of my own.")
+    assert neuron.log == neuron._grouped()[3]
+    assert neuron.log[-1].endswith("A line of my own.")
+    monkeypatch.setattr(neuron, "log_mode", "diagnostic" if neuron.log_mode == "concise" else "concise")
+    assert neuron.log == neuron._grouped()[3]
+    neuron.log_sink.drain()
+    neuron.receive_input(0.1)
+    assert neuron.log == neuron._grouped()[3] and len(neuron.log) < 10
@@ -0,0 +1,32 @@
+import random
+from collections import Counter
+from neuron import Neuron
+from neuron_pattern_interface import NeuronPatternInterface
+
+
+def test_the_adoption_index_counts_what_a_scan_of_every_neuron_would():
+    rng = random.Random(0)
+    interface = NeuronPatternInterface(log_sink="null")
+    neurons = [Neuron(log_sink="null") for _ in range(12)]
+    patterns = ["a", "b", "c"]
+    for _ in range(200):
+        interface.update_adoption(rng.choice(neurons), rng.choice(patterns), rng.choice(("monitoring", "adopted", "revised")))
+    for pattern in patterns:
+        scanned = Counter(statuses[pattern] for statuses in interface.neuron_adoption.values() if pattern in statuses)
+        assert interface.status_counts(pattern) == dict(scanned)
+        for status in ("monitoring", "adopted", "revised"):
+            assert interface.status_count(pattern, status) == scanned[status]
+            holders = {neuron_id for neuron_id, statuses in interface.neuron_adoption.items() if statuses.get(pattern) == status}
+            assert set(interface.neuron_ids_with_status(pattern, status)) == holders
+            assert {neuron.id for neuron in interface.neurons_with_status(pattern, status)} == holders
+
+
+def test_renotify_reaches_only_the_neurons_holding_the_status():
+    interface = NeuronPatternInterface(log_sink="null")
+    neurons = [Neuron(log_sink="memory") for _ in range(3)]
+    interface.update_adoption(neurons[0], "a", "monitoring")
+    interface.update_adoption(neurons[1], "a", "monitoring")
+    interface.update_adoption(neurons[1], "a", "adopted")
+    interface.update_adoption(neurons[2], "b", "monitoring")
+    assert interface.renotify("a") == 1
+    assert [neuron for neuron in neurons if any(record[2] == "pattern_notified" for record in neuron.records)] == neurons[:1]
@@ -0,0 +1,33 @@
+from neuron import Neuron
+from neuron_pattern_interface import NeuronPatternInterface
+from pattern_store import PatternStore
+from pattern_watcher import PatternWatcher
+
+
+def test_a_new_watcher_picks_up_what_an_earlier_one_saved(tmp_path):
+    path = str(tmp_path / "patterns.sqlite3")
+    neuron = Neuron(log_sink="null")
+    watcher = PatternWatcher(NeuronPatternInterface(log_sink="null"), log_sink="null", store=path)
+    watcher.discover_pattern("burst")
+    watcher.pattern_confidence["burst"] = 0.8
+    watcher.update_trust(neuron, -0.2, "misfire")
+    watcher.log_learning(f"Neuron {neuron.id} misfired")
+    watcher.save()
+    watcher.store.close()
+    confidence, trust = watcher.pattern_confidence["burst"], watcher.trust_score(neuron.id)
+
+    later = PatternWatcher(NeuronPatternInterface(log_sink="null"), log_sink="null", store=path)
+    assert later.pattern_confidence["burst"] == confidence < 0.8  # the trust drop lowered it
+    assert later.trust_score(neuron.id) == trust
+    assert "unseen" not in later.pattern_confidence
+    assert [entry["message"] for entry in later.store.learning(watcher=watcher.id)] == [f"Neuron {neuron.id} misfired"]
+    later.store.close()
+
+
+def test_lookups_by_neuron_and_pattern_return_the_newest_entries_oldest_first(tmp_path):
+    store = PatternStore(str(tmp_path / "patterns.sqlite3"), commit_every=2)
+    store.append_learning([{"event": "e", "neuron_id": "n1", "pattern": "p", "n": n} for n in range(5)])
+    store.append_learning([{"event": "e", "neuron_id": "n2", "n": 5}])
+    assert [entry["n"] for entry in store.learning_for_neuron("n1", limit=2)] == [3, 4]
+    assert [entry["n"] for entry in store.learning_for_pattern("p")] == [0, 1, 2, 3, 4]
+    store.close()
@@ -0,0 +1,71 @@
+import random
+from clock import SimulationClock
+from neuron import Neuron
+from neuron_pattern_interface import NeuronPatternInterface
+from pattern_watcher import PatternWatcher
+from population import NeuronPopulation
+from utils import seed_ids
+
+
+def _watcher():
+    return PatternWatcher(NeuronPatternInterface(log_sink="null"), log_sink="null")
+
+
+def test_only_neurons_newly_over_the_threshold_are_reported():
+    neurons = [Neuron(log_sink="null") for _ in range(3)]
+    watcher = _watcher()
+    watcher.watch_neurons(neurons)
+    for _ in range(3):
+        neurons[0].receive_input(10.0)  # fires on every input
+        neurons[1].receive_input(0.1)
+    neurons[2].receive_input(10.0)
+    assert watcher.monitor_neurons() == [neurons[0]]
+    neurons[0].receive_input(10.0)
+    assert watcher.monitor_neurons() == []  # still firing, already reported
+    for _ in range(watcher.memory_window):
+        neurons[0].receive_input(0.0)
+    watcher.monitor_neurons()  # calmed down
+    for _ in range(3):
+        neurons[0].receive_input(10.0)
+    assert watcher.monitor_neurons() == [neurons[0]]
+
+
+def test_a_clocked_neuron_is_windowed_by_clock_ticks():
+    clock = SimulationClock()
+    neuron = Neuron(log_sink="null", clock=clock)
+    watcher = _watcher()
+    watcher.watch_neurons([neuron])
+    for _ in range(3):
+        neuron.receive_input(10.0)
+        clock.advance(watcher.memory_window)  # three firings in a row, but far apart in time
+    assert watcher.monitor_neurons() == []
+    for _ in range(3):
+        neuron.receive_input(10.0)
+        clock.advance()
+    assert watcher.monitor_neurons() == [neuron]
+
+
+def _bounded_neurons():
+    seed_ids(0)
+    rng = random.Random(0)
+    neurons = [Neuron(log_sink="memory") for _ in range(40)]
+    for neuron in neurons:
+        neuron.threshold = rng.uniform(-1.0, 12.0)
+        neuron.refractory_offset = rng.uniform(-0.5, 3.0)
+        neuron.decay_factor = rng.uniform(0.0, 1.2)
+    return neurons
+
+
+def test_checking_bounds_in_a_batch_notifies_as_one_by_one_would():
+    neurons, watcher = _bounded_neurons(), _watcher()
+    for neuron in neurons:
+        watcher.monitor_bounds(neuron)
+    batched_neurons, batched_watcher = _bounded_neurons(), _watcher()
+    indices, params = batched_watcher.monitor_bounds_batch(batched_neurons)
+    assert len(indices) and batched_watcher.learning_history.total == watcher.learning_history.total
+    assert list(batched_watcher.learning_history) == list(watcher.learning_history)
+    for batched, single in zip(batched_neurons, neurons):
+        assert [record[:4] for record in batched.records] == [record[:4] for record in single.records]
+    population = NeuronPopulation.from_neurons(_bounded_neurons())
+    population_indices, population_params = _watcher().monitor_bounds_batch(population=population)
+    assert population_indices.tolist() == indices.tolist() and population_params == params
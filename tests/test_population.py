@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from clock import SimulationClock
+from neuron import Neuron
+from population import NeuronPopulation
+
+
+def test_a_tick_split_between_idle_and_step_counts_once():
+    population = NeuronPopulation(4)
+    population.clock = SimulationClock()
+    receiving = np.array([True, False, True, False])
+    population.idle(~receiving)
+    population.step(np.full(4, 0.5), receiving)
+    population.idle()
+    assert population.steps == 2
+    assert population.clock.now == 2
+
+
+def test_a_population_follows_the_neurons_it_stands_for():
+    rng = np.random.default_rng(0)
+    size = 24
+    clock = SimulationClock()
+    neurons = [Neuron(threshold=0.8 + 0.05 * i, refractory_events=1 + i % 4, decay_factor=0.7 + 0.01 * i,
+                      history_length=2 + i % 3, clock=clock) for i in range(size)]
+    for neuron in neurons[::2]:
+        neuron.threshold += 0.5  # above baseline, for adapt() to lower again
+    population = NeuronPopulation.from_neurons(neurons)
+    population.clock = SimulationClock()
+    for _ in range(300):
+        action = rng.choice(["step", "step", "step", "idle", "sleep", "wake"])
+        chosen = rng.random(size) < 0.5
+        if action == "step":
+            inputs = rng.random(size) * 0.8
+            population.idle(~chosen)
+            population.step(inputs, chosen)
+            for i in np.flatnonzero(chosen):
+                neurons[i].receive_input(float(inputs[i]))
+            clock.advance()
+        elif action == "idle":
+            population.idle()
+            clock.advance()
+        else:
+            getattr(population, action)(chosen)
+            for i in np.flatnonzero(chosen):
+                getattr(neurons[i], action)()
+    for i, neuron in enumerate(neurons):
+        assert population.potential[i] == pytest.approx(neuron.potential)
+        assert population.threshold[i] == pytest.approx(neuron.threshold)
+        assert population.in_refractory[i] == neuron.in_refractory
+        assert population.refractory_counter[i] == neuron.refractory_counter
+        assert population.quiet_streak[i] == neuron.history.quiet_streak
+        assert population.asleep[i] == neuron.asleep
+    assert population.clock.now == clock.now
@@ -0,0 +1,26 @@
+import random
+import main
+from neuron import Neuron
+from pattern_store import close_store
+
+
+def test_a_seeded_scenario_gets_the_same_ids_however_much_it_draws():
+    main.seed_scenario("feedback_variation")
+    first = [Neuron(log_sink="null").id for _ in range(3)]
+    main.seed_scenario("feedback_variation")
+    random.random()  # an extra draw from `random` must not shift the ids
+    assert [Neuron(log_sink="null").id for _ in range(3)] == first
+    main.seed_scenario("feedback_variation", seed=1)
+    assert Neuron(log_sink="null").id != first[0]
+
+
+def test_each_run_without_a_shared_store_starts_from_an_empty_one(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "LOG_DIR", str(tmp_path))
+    store = main.open_scenario_store()
+    store.put_trust([("n1", 0.2)])
+    store.append_learning([{"event": "learning", "neuron_id": "n1"}])
+    store = main.open_scenario_store()
+    try:
+        assert store.get_trust("n1") is None and store.learning() == []
+    finally:
+        close_store(main.pattern_db_path())
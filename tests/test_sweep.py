@@ -0,0 +1,29 @@
+import pytest
+from clock import SimulationClock
+from neuron import Neuron
+from sweep import sweep
+
+
+def test_each_configuration_behaves_like_its_own_neuron():
+    stimulus = [0.6, None, 0.7, 0.9, None, None, 1.2, 0.3, 0.8, None, 1.1]
+    result = sweep({"threshold": [0.8, 1.0, 1.2], "decay_factor": [0.5, 0.9]}, stimulus)
+    for i in range(6):
+        clock = SimulationClock()
+        neuron = Neuron(threshold=result.parameters["threshold"][i], decay_factor=result.parameters["decay_factor"][i],
+                        log_sink="null", clock=clock)
+        fires = 0
+        for value in stimulus:
+            if value is not None:
+                neuron.receive_input(value)
+                fires += neuron.history.last_fired
+            clock.advance()
+        assert result.fire_counts[i] == fires
+        assert result.final_thresholds[i] == pytest.approx(neuron.threshold)
+        assert result.final_potentials[i] == pytest.approx(neuron.potential)
+
+
+def test_firing_rates_cover_the_ticks_in_the_window_so_far():
+    result = sweep({"threshold": [0.5]}, [100.0] * 3 + [0.0] * 5, rate_window=4)  # fires on the first three ticks only
+    assert result.firing_rates[0] == pytest.approx([1, 1, 1, 3 / 4, 2 / 4, 1 / 4, 0, 0])
+    with pytest.raises(ValueError):
+        sweep({"threshold": [0.5]}, [1.0], rate_window=0)
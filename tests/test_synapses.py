@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from population import NeuronPopulation
+from synapses import Synapses
+
+
+def test_synaptic_input_is_scaled_by_the_synapse_weight_only():
+    population = NeuronPopulation(3, threshold=10.0, decay_factor=1.0, weight=0.5)
+    synapses = Synapses.from_edges(3, pre=[0, 0], post=[1, 2], weights=[0.3, 0.6], delays=[1, 2])
+    population.potential[0] = 10.0
+    synapses.step(population)  # neuron 0 fires
+    synapses.step(population, inputs=np.array([0.0, 1.0, 0.0]))
+    assert population.potential[1] == pytest.approx(0.3 + 0.5)
+    assert population.potential[2] == 0.0
+    synapses.step(population)
+    assert population.potential[2] == pytest.approx(0.6)
+
+
+def test_spikes_reach_every_target_after_its_own_delay():
+    synapses = Synapses.random(50, fan_out=4, max_delay=3, seed=0)
+    population = NeuronPopulation(50, threshold=100.0, decay_factor=1.0)
+    synapses.propagate(np.arange(50) < 5)
+    for _ in range(3):
+        synapses.step(population)
+    expected = np.zeros(50)
+    for pre in range(5):
+        targets, weights, _ = synapses.outgoing(pre)
+        np.add.at(expected, targets, weights)
+    assert np.allclose(population.potential, expected)